@@ -0,0 +1,4 @@
+#!/bin/bash
+
+python3 ../../../../../scripts/adsorbate_depositor/main.py
+python3 ../../../../../scripts/adsorbate_depositor/materialize.py generated_models/generated_models.extxyz --select "*_rotation_0" "*_rotation_3" --output-dir ./materialized_models
@@ -0,0 +1,5 @@
+#!/bin/bash
+
+# First run generates all structures, second run finds them in the manifest and skips them
+python3 ../../../../../scripts/adsorbate_depositor/main.py
+python3 ../../../../../scripts/adsorbate_depositor/main.py
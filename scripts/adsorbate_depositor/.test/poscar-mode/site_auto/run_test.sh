@@ -0,0 +1,3 @@
+#!/bin/bash
+
+python3 ../../../../../scripts/adsorbate_depositor/main.py
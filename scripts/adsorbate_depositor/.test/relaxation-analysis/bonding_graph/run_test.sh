@@ -0,0 +1,5 @@
+#!/bin/bash
+
+# Generated structures (with bonding graphs) paired with relaxed CONTCARs: intact, migrated, dissociated,
+# missing CONTCAR, and a structure without bonding graph nor substrate atom count
+python3 ../../../../../scripts/adsorbate_depositor/analyze_relaxation.py --workers 1
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+import argparse
+import os
+
+root_dir = str(Path(__file__).resolve().parents[1])
+sys.path.append(root_dir)
+
+from src.relaxation_analysis import analyze_relaxations, write_summary
+
+def main():
+    """
+    Pair each relaxed structure (CONTCAR) with the structure generated by main.py and summarize what happened to the adsorbate.
+
+    Writes one row per structure (site before/after, bonded surface atoms, lateral shift, fragments and status)
+    to a CSV file and prints the number of intact, migrated, rearranged, desorbed and dissociated adsorbates.
+    """
+    parser = argparse.ArgumentParser(description="Detect adsorbate migration and decomposition after relaxation.")
+    parser.add_argument("generated_dir", nargs="?", default="./generated_models", help="Output directory of main.py ('vasp' format). Defaults to './generated_models'.")
+    parser.add_argument("--relaxed-dir", default=None, help="Root of the relaxed structure directories, named as the generated ones. Defaults to the generated directory.")
+    parser.add_argument("--relaxed-name", default="CONTCAR", help="Filename of the relaxed structures. Defaults to 'CONTCAR'.")
+    parser.add_argument("--generated-name", default="POSCAR_generated", help="Filename of the generated structures. Defaults to 'POSCAR_generated'.")
+    parser.add_argument("--substrate-atoms", type=int, default=None, help="Number of substrate atoms, needed when structures were written without bonding graph.")
+    parser.add_argument("--migration-threshold", type=float, default=0.5, help="Lateral shift in Å of the adsorbate counted as migration. Defaults to 0.5.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes. Defaults to the CPU count.")
+    parser.add_argument("--output", default=None, help="Summary CSV file. Defaults to 'relaxation_summary.csv' in the generated directory.")
+    args = parser.parse_args()
+
+    generated_dir = Path(args.generated_dir)
+    rows = analyze_relaxations(
+        generated_dir,
+        relaxed_dir=Path(args.relaxed_dir) if args.relaxed_dir else None,
+        generated_name=args.generated_name,
+        relaxed_name=args.relaxed_name,
+        n_substrate=args.substrate_atoms,
+        migration_threshold=args.migration_threshold,
+        workers=args.workers
+    )
+
+    output = Path(args.output) if args.output else generated_dir / "relaxation_summary.csv"
+    counts = write_summary(rows, output)
+
+    print(f"{len(rows)} structures analyzed, summary written to {output}.")
+    for status, count in counts.items():
+        if count:
+            print(f"  {status:<12} {count}")
+
+if __name__ == "__main__":
+    main()
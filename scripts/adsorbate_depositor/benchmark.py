@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+import argparse
+import json
+
+root_dir = str(Path(__file__).resolve().parents[1])
+sys.path.append(root_dir)
+
+from src.pipeline_benchmark import BENCHMARK_STAGES, run_benchmark, environment_info, compare_to_baseline
+
+def main():
+    """
+    Benchmark the deposition pipeline on synthetic slabs and compare with a stored baseline.
+
+    Prints the time, throughput and peak memory of each stage. With --save-baseline the results are
+    stored as the new baseline, otherwise they are compared with the existing one and the script exits
+    with status 1 if any stage is slower or uses more memory than the baseline beyond the tolerance.
+    Results deposited on a different number of sites than the baseline are not compared (status 2).
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the adsorbate deposition pipeline.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[300, 1000, 2000], help="Approximate slab sizes in atoms. Defaults to 300 1000 2000.")
+    parser.add_argument("--sites", type=int, default=4, help="Number of sites used for deposition. Defaults to 4.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per stage, the best one kept. Defaults to 5.")
+    parser.add_argument("--baseline", default=str(Path(__file__).parent / ".benchmark" / "baseline.json"), help="Baseline file. Defaults to '.benchmark/baseline.json'.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline instead of comparing.")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Relative slowdown or memory increase reported as a regression. Defaults to 0.5.")
+    args = parser.parse_args()
+
+    settings = {"sites": args.sites, "repeats": args.repeats}
+    results = run_benchmark(args.sizes, n_sites=args.sites, repeats=args.repeats)
+
+    for size, stages in results.items():
+        print(f"Slab of {size} atoms:")
+        for stage in BENCHMARK_STAGES:
+            metrics = stages[stage]
+            throughput = f"{metrics['structures_per_s']:10.1f} structures/s" if "structures_per_s" in metrics else " " * 23
+            print(f"  {stage:<20} {metrics['time_s'] * 1e3:10.2f} ms {throughput} {metrics['peak_memory_bytes'] / 2 ** 20:8.2f} MiB peak")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with baseline_path.open("w", encoding="utf-8") as f:
+            json.dump({"environment": environment_info(), "settings": settings, "results": results}, f, indent=2)
+        print(f"Baseline saved to {baseline_path}.")
+        return
+
+    if not baseline_path.is_file():
+        print(f"No baseline found at {baseline_path}, run with --save-baseline to create one.")
+        return
+
+    with baseline_path.open("r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    # The number of sites sets the deposition workload, the number of repeats only the timing noise
+    baseline_settings = baseline.get("settings", {})
+    if baseline_settings.get("sites") != args.sites:
+        print(f"Cannot compare: the baseline was recorded with {baseline_settings.get('sites')} sites, but {args.sites} were used. "
+              f"Rerun with --sites {baseline_settings.get('sites')}, or save a new baseline.")
+        sys.exit(2)
+    if baseline_settings.get("repeats") != args.repeats:
+        print(f"Warning: the baseline kept the best of {baseline_settings.get('repeats')} runs per stage, but {args.repeats} were used, timings may not be comparable.")
+
+    if baseline.get("environment") != environment_info():
+        print("Warning: the baseline was recorded on a different machine or library versions, timings may not be comparable.")
+
+    print("Comparison with the baseline:")
+    regressions = compare_to_baseline(results, baseline["results"], tolerance=args.tolerance)
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+    print("No regression.")
+
+if __name__ == "__main__":
+    main()
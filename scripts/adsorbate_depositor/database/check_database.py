@@ -1,71 +1,59 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import argparse
+import sys
 from pathlib import Path
-import yaml
+import argparse
+import json
+import os
 
-def read_yaml_file(file_path: Path) -> dict:
-    """Reads a YAML file and returns the parsed data."""
-    try:
-        with file_path.open("r", encoding="utf-8") as file:
-            return yaml.safe_load(file)
-    except yaml.YAMLError as exc:
-        print(f"Failed to read {file_path}.")
-        if hasattr(exc, 'problem_mark'):
-            mark = exc.problem_mark
-            print(f"Error position: (Line:{mark.line+1}, Column:{mark.column+1})")
-        return None
+root_dir = str(Path(__file__).resolve().parents[1])
+sys.path.append(root_dir)
 
-def check_database(header_filename: str = "pathway_database_header.yaml") -> None:
-    """Checks the integrity and structure of the adsorbate database."""
-    passed = []
-    failed = []
-    warnings = []
+from src.database_validation import check_database
 
-    working_dir = Path(".")
-    for folder in working_dir.iterdir():
-        if folder.is_dir():
-            header_file = folder / header_filename
-            if header_file.exists():
-                data = read_yaml_file(header_file)
-                if data:
-                    # Validation logic starts here
-                    for pathway, pathway_data in data.get("pathways", {}).items():
-                        # Check if the indices are continuous integers starting from 1
-                        steps = list(pathway_data.keys())[2:]  # Skip 'reference_DOI' and 'comment'
-                        indices = [int(s.split('_')[-1]) for s in steps]
-                        if indices != list(range(1, len(steps) + 1)):
-                            failed.append(f"{pathway} in {header_file} has non-continuous step indexing.")
-                            continue
+def main():
+    """
+    Check the integrity of every adsorbate database folder and optionally write a JSON report.
 
-                        # More validation logic here.
-                        if "*" in pathway_data["name"]:  # make sure no * in name
-                            failed.append(f"Name of {pathway} in {header_file} has asterisk *.")
+    Exits with status 1 if any folder fails a check.
+    """
+    parser = argparse.ArgumentParser(description="Check the integrity of the adsorbate database.")
+    parser.add_argument("--header", default="pathway_database_header.yaml", help="Name of the header file to check.")
+    parser.add_argument("--database-dir", default=".", help="Directory holding one folder per reaction. Defaults to the current directory.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes, one folder each. Defaults to the CPU count.")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="Interatomic distance tolerance in Å of duplicate geometries. Defaults to 0.01.")
+    parser.add_argument("--report", default=None, help="Write the machine-readable report to this JSON file ('-' for stdout).")
+    args = parser.parse_args()
 
-                        else:
-                            passed.append(str(header_file))
-                    # Validation logic ends here
-                else:
-                    failed.append(f"Failed to read {header_file}.")
-            else:
-                failed.append(f"{folder} does not contain a {header_filename}.")
+    report = check_database(Path(args.database_dir), header=args.header, workers=args.workers, tolerance=args.tolerance)
 
-    print("=== Check Passed ===")
-    for p in passed:
-        print(f"{p} has passed all checks.")
+    if args.report == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print("=== Check Passed ===")
+        for folder in report["folders"]:
+            if folder["passed"]:
+                print(f"{folder['folder']} has passed all checks ({folder['pathways']} pathways, {folder['steps']} steps, {folder['poscars']} POSCARs).")
 
-    print("\n=== Check Failed ===")
-    for f in failed:
-        print(f)
+        print("\n=== Check Failed ===")
+        for folder in report["folders"]:
+            for error in folder["errors"]:
+                print(f"{folder['folder']}: {error}")
 
-    print("\n=== Warnings ===")
-    for w in warnings:
-        print(w)
+        print("\n=== Warnings ===")
+        for folder in report["folders"]:
+            for warning in folder["warnings"]:
+                print(f"{folder['folder']}: {warning}")
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Check the integrity of the adsorbate database.")
-    parser.add_argument("--header", default="pathway_database_header.yaml", help="Name of the header file to check.")
-    args = parser.parse_args()
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nReport written to {args.report}.")
 
-    check_database(header_filename=args.header)
+    if not report["passed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@
 import sys
 from pathlib import Path
 import argparse
+from typing import Optional
+from ase.io import read
 
 root_dir = str(Path(__file__).resolve().parents[1])
 sys.path.append(root_dir)
@@ -12,6 +14,11 @@ from src.configHandler import ConfigHandler
 from src.adsorbateGenerator import AdsorbateGenerator
 from src.siteGenerator import SiteGenerator
 from src.adsorbateDepositor import AdsorbateDepositor
+from src.structureDeduplicator import StructureDeduplicator
+from src.coverage_combinations import enumerate_site_combinations
+from src.outputManifest import OutputManifest, hash_file
+from src.deposition_estimate import estimate_deposition, summarize_estimates
+from src.parameter_sweep import expand_parameter, sweep_points
 
 def main():
     """
@@ -22,7 +29,8 @@ def main():
     1. Checks for the existence of a configuration file and loads it if found. If not found, a template is copied.
     2. Generates adsorption sites on the substrate surface using the SiteGenerator class.
     3. Generates various adsorbate structures using the AdsorbateGenerator class.
-    4. Deposits the adsorbates onto the substrate surface at the generated sites using the AdsorbateDepositor class.
+    4. Deposits the adsorbates onto the substrate surface at the generated sites using the AdsorbateDepositor class,
+       once per point of a distance/vacuum layer sweep.
     5. Writes the generated structures to output files.
 
     Configuration file:
@@ -36,6 +44,8 @@ def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Deposit adsorbates on substrates.")
     parser.add_argument("--config", default="config.yaml", help="Name of the configuration file. Defaults to 'config.yaml'.")
+    parser.add_argument("--estimate", nargs="?", const=20, type=int, metavar="SAMPLES",
+                        help="Dry run: estimate structure count, disk footprint, peak memory and wall time from SAMPLES deposited pairs (default 20), without writing output.")
     args = parser.parse_args()
 
     # Load or generate the configuration
@@ -47,11 +57,24 @@ def main():
         cfg_handler.copy_config_template(template_path)
         return
 
-    # Generate sites
+    # Expand swept deposit parameters, the shared setup below runs once for all sweep points
+    distances = expand_parameter(config["deposit"]["distance"], "distance")
+    vacuum_layers = expand_parameter(config["deposit"]["target_vacuum_layer"], "target_vacuum_layer")
+    points = sweep_points(distances, vacuum_layers)
+    if len(points) > 1:
+        print(f"Sweep: {len(distances)} distances x {len(vacuum_layers)} vacuum layers -> {len(points)} points.")
+
+    # Load substrate once for both site generation and deposition
+    substrate = read(Path(config["substrate"]["path"]), format="vasp")
+
+    # Generate sites (at the first distance, shifted for the other ones)
     sites = SiteGenerator(
-        POSCAR_substrate=Path(config["substrate"]["path"]),
-        distance=config["deposit"]["distance"],
-        sites=config["substrate"]["sites"]
+        POSCAR_substrate=substrate,
+        distance=distances[0],
+        sites=config["substrate"]["sites"],
+        surface_tolerance=config["substrate"].get("surface_tolerance", 0.5),
+        symmetry_reduce=config["substrate"].get("symmetry_reduce", False),
+        symprec=config["substrate"].get("symprec", 0.1)
     ).generate()
 
     # Generate adsorbates and adsorbate reference points
@@ -59,7 +82,11 @@ def main():
         work_mode=config["adsorbate"]["source"],
         path=Path(config["adsorbate"]["path"]),
         pathway_name=config["adsorbate"]["pathway_name"],
-        generate_rotations=config["adsorbate"]["rotation"]
+        generate_rotations=config["adsorbate"]["rotation"],
+        rotation_method=config["adsorbate"].get("rotation_method", "fixed"),
+        rotation_count=config["adsorbate"].get("rotation_count", 6),
+        rotation_seed=config["adsorbate"].get("rotation_seed", None),
+        rmsd_threshold=config["adsorbate"].get("rmsd_threshold", None)
     )
 
     adsorbates = adsorbate_generator.generate_adsorbates(atom_indexes=config["adsorbate"]["atom_indexes"])
@@ -72,21 +99,126 @@ def main():
 
     # Generate adsorbate-on-site structure files
     structure_generator = AdsorbateDepositor(
-        distance=config["deposit"]["distance"],
-        POSCAR_substrate=Path(config["substrate"]["path"]),
+        distance=distances[0],
+        POSCAR_substrate=substrate,
         sites=sites,
         adsorbates=adsorbates,
         adsorbate_refs=adsorbate_refs
     )
 
-    structures = structure_generator.deposit(
+    # (Optionally) combine sites for multi-adsorbate coverage structures
+    site_combinations = None
+    if config.get("coverage") is not None:
+        n_adsorbates = config["coverage"]["adsorbates"]
+        site_combinations = []
+        for n in (n_adsorbates if isinstance(n_adsorbates, list) else [n_adsorbates]):
+            site_combinations += enumerate_site_combinations(
+                substrate=substrate,
+                sites=sites,
+                n_adsorbates=n,
+                min_separation=config["coverage"]["min_separation"],
+                symmetry_reduce=config["coverage"].get("symmetry_reduce", True),
+                symprec=config["substrate"].get("symprec", 0.1)
+            )
+        print(f"Coverage: {len(site_combinations)} site combinations.")
+
+    # Only the per-point work (deposition and writing) is repeated over the sweep
+    estimates = []
+    for distance, vacuum_layer, subdirectory in points:
+        if len(points) > 1:
+            print(f"Sweep point: distance {distance:g} Å, vacuum layer {vacuum_layer:g} Å.")
+
+        estimate = run_point(
+            depositor=structure_generator.at_distance(distance),
+            config=config,
+            target_vacuum_layer=vacuum_layer,
+            output_dir=Path(config["deposit"]["output_dir"]) / subdirectory,
+            site_combinations=site_combinations,
+            config_path=Path.cwd() / args.config,
+            estimate=args.estimate
+        )
+        if estimate is not None:
+            estimates.append(estimate)
+
+    if len(estimates) > 1:
+        summarize_estimates(estimates)
+
+def run_point(depositor: AdsorbateDepositor, config: dict, target_vacuum_layer: float, output_dir: Path, site_combinations: list, config_path: Path, estimate: int = None) -> Optional[dict]:
+    """
+    Deposit and write the structures of one (distance, vacuum layer) point, or estimate their cost.
+
+    Args:
+        depositor (AdsorbateDepositor): The depositor at the distance of this point.
+        config (dict): The loaded configuration.
+        target_vacuum_layer (float): The vacuum layer thickness of this point in Å.
+        output_dir (Path): The output directory of this point.
+        site_combinations (list): Sets of sites occupied at once (coverage mode), None for one adsorbate on each site.
+        config_path (Path): The configuration file, hashed in the resume manifest.
+        estimate (int, optional): Sample size of a dry-run cost estimate, None to run the deposition. Defaults to None.
+
+    Returns:
+        Optional[dict]: The estimate (see `estimate_deposition`), None if the deposition was run.
+    """
+    # (Optionally) project the cost of the run from a small sample instead of running it
+    if estimate is not None:
+        return estimate_deposition(
+            depositor,
+            rotation_generated=config["adsorbate"]["rotation"],
+            fix_substrate=config["deposit"]["fix_substrate"],
+            target_vacuum_layer=target_vacuum_layer,
+            workers=config["deposit"].get("workers", 1),
+            clash_distance=config["deposit"].get("clash_distance", None),
+            site_combinations=site_combinations,
+            output_format=config["deposit"].get("output_format", "vasp"),
+            deduplicate=config["deposit"].get("deduplicate", False),
+            deduplicate_tolerance=config["deposit"].get("deduplicate_tolerance", 0.1),
+            bonding_graph=config["deposit"].get("bonding_graph", False),
+            sample_size=estimate
+        )
+
+    # (Optionally) resume from the manifest of an earlier run, only generating missing or changed structures
+    manifest = None
+    if config["deposit"].get("resume", False):
+        adsorbate_path = Path(config["adsorbate"]["path"])
+        input_files = [Path(config["substrate"]["path"]), adsorbate_path if adsorbate_path.is_file() else adsorbate_path / "pathway_database_header.yaml"]
+
+        manifest = OutputManifest(output_dir)
+        manifest.start(config_hash=hash_file(config_path), inputs={path.name: hash_file(path) for path in input_files})
+
+    # Structures are generated lazily and written as soon as each one is finished
+    structures = depositor.iter_deposit(
         rotation_generated=config["adsorbate"]["rotation"],
         fix_substrate=config["deposit"]["fix_substrate"],
-        target_vacuum_layer=config["deposit"]["target_vacuum_layer"]
+        target_vacuum_layer=target_vacuum_layer,
+        workers=config["deposit"].get("workers", 1),
+        clash_distance=config["deposit"].get("clash_distance", None),
+        site_combinations=site_combinations,
+        completed=dict(manifest.entries) if manifest is not None else None,
+        bonding_graph=config["deposit"].get("bonding_graph", False)
     )
 
-    # Write generated models to file
-    structure_generator.write(structures, output_dir=Path(config["deposit"]["output_dir"]))
+    # (Optionally) drop duplicated structures on the fly, recording them in the manifest so that a resumed run skips them too
+    if config["deposit"].get("deduplicate", False):
+        deduplicator = StructureDeduplicator(tolerance=config["deposit"].get("deduplicate_tolerance", 0.1))
+        structures = deduplicator.filter(
+            structures,
+            on_duplicate=(lambda name, atoms, duplicate_of: manifest.record(name, atoms.info["task_key"], duplicate_of=duplicate_of)) if manifest is not None else None
+        )
+
+    # Write generated models to file, recording each finished structure in the manifest
+    try:
+        depositor.write(
+            structures,
+            output_dir=output_dir,
+            output_format=config["deposit"].get("output_format", "vasp"),
+            on_written=(lambda name, atoms: manifest.record(name, atoms.info["task_key"])) if manifest is not None else None
+        )
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+    if config["deposit"].get("deduplicate", False):
+        deduplicator.report()
 
 if __name__ == "__main__":
     main()
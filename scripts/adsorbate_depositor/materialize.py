@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+import argparse
+
+root_dir = str(Path(__file__).resolve().parents[1])
+sys.path.append(root_dir)
+
+from src.structure_io import materialize
+
+def main():
+    """
+    Expand structures stored in a single extxyz/ASE database output into VASP directories.
+
+    Each selected structure is written to "<output-dir>/<structure name>/POSCAR_generated",
+    the same layout as the default "vasp" output format of main.py.
+    """
+    parser = argparse.ArgumentParser(description="Expand structures from a single-file output into VASP directories.")
+    parser.add_argument("structure_file", help="Path to the generated .extxyz or .db file.")
+    parser.add_argument("--select", nargs="+", default=None, help="Shell-style structure name patterns, e.g. 'site-1_*'. Defaults to all structures.")
+    parser.add_argument("--output-dir", default="./generated_models", help="Output directory. Defaults to './generated_models'.")
+    parser.add_argument("--filename", default="POSCAR_generated", help="Filename of each structure. Defaults to 'POSCAR_generated'.")
+    args = parser.parse_args()
+
+    count = materialize(Path(args.structure_file), Path(args.output_dir), patterns=args.select, filename=args.filename)
+    print(f"{count} structures written to {args.output_dir}.")
+
+if __name__ == "__main__":
+    main()
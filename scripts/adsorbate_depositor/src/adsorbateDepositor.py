@@ -1,46 +1,61 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from typing import List, Dict, Union
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple, Union
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+import copy
+import hashlib
+import json
 import warnings
 from tqdm import tqdm
 import numpy as np
 import re
 from ase import Atoms
-from ase.io import read, write
+from ase.io import read
 from ase.constraints import FixAtoms
 
 # Import external vacuum layer manager
 from vasp.poscar.vacuumLayerManager import VacuumLayerManager
 
+from .minimum_image_distance import calculate_min_distance, minimum_image_vectors
+from .substrateIndex import SubstrateIndex
+from .structure_graph import build_bonding_graph, dumps_graph
+from .structure_io import OUTPUT_FORMATS, write_vasp_directories, write_extxyz, write_database
+
 TAG_DESCRIPTIONS = {
     "substrate": 0,
     "adsorbate": 1
 }
 
+# Periodicity mask for distance checks (vacuum along z-axis is not periodic)
+IN_PLANE_PBC = np.array([True, True, False])
+
 class AdsorbateDepositor:
     """
     A class for depositing adsorbates onto substrate sites.
 
     Attributes:
-        poscar_substrate (Path): Path to the POSCAR file representing the substrate.
+        poscar_substrate (Atoms): The substrate structure.
         sites (dict): Dictionary of available adsorption sites on the substrate.
         adsorbates (dict): Dictionary of adsorbates to be deposited.
         adsorbate_refs (dict): Dictionary of adsorbate reference points.
+        substrate_index (SubstrateIndex): Spatial index of the substrate, built once for all distance checks.
 
     Notes:
         - The `_deposit_adsorbate_on_site` method handles atom tagging, where atoms are tagged as 'substrate' or 'adsorbate'.
         - For detailed information on atom tagging and how to control it, refer to the docstring of `_deposit_adsorbate_on_site`.
     """
 
-    def __init__(self, distance: Union[float, int], POSCAR_substrate: Path, sites: dict, adsorbates: dict, adsorbate_refs: dict) -> None:
+    def __init__(self, distance: Union[float, int], POSCAR_substrate: Union[Path, Atoms], sites: dict, adsorbates: dict, adsorbate_refs: dict) -> None:
         """
         Initializes an instance of AdsorbateDepositor.
 
         Args:
             distance (Union[float, int]): Vertical distance from the substrate for the generated site.
-            POSCAR_substrate (Path): Path to the POSCAR file of the substrate.
+            POSCAR_substrate (Union[Path, Atoms]): Path to the POSCAR file of the substrate, or an already loaded Atoms object.
             sites (dict): Dictionary containing information about the adsorption sites.
             adsorbates (dict): Dictionary containing information about the adsorbates.
             adsorbate_refs (dict): Dictionary containing information about the adsorbate reference points.
@@ -58,9 +73,13 @@ class AdsorbateDepositor:
         elif distance <= 1:
             warnings.warn(f"Small distance of {distance} Å found.")
 
-        # Check if the POSCAR file exists
-        if not POSCAR_substrate.is_file():
-            raise FileNotFoundError(f"POSCAR file at {POSCAR_substrate} not found.")
+        # Check if the POSCAR file exists, or take the already loaded substrate
+        if isinstance(POSCAR_substrate, Path):
+            if not POSCAR_substrate.is_file():
+                raise FileNotFoundError(f"POSCAR file at {POSCAR_substrate} not found.")
+            POSCAR_substrate = read(POSCAR_substrate)
+        elif not isinstance(POSCAR_substrate, Atoms):
+            raise TypeError(f"Expected substrate of type Path or Atoms, but got {type(POSCAR_substrate)}.")
 
         # Check the type and content of sites and adsorbates
         if not isinstance(sites, dict):
@@ -75,11 +94,60 @@ class AdsorbateDepositor:
 
         # Parse args
         self.distance = distance
-        self.poscar_substrate = read(POSCAR_substrate)
+        self.poscar_substrate = POSCAR_substrate
         self.sites = sites
         self.adsorbates = adsorbates
         self.adsorbate_refs = adsorbate_refs
 
+        # Index the substrate once, distance checks then only cost a tree lookup per adsorbate atom
+        self.substrate_index = SubstrateIndex(
+            POSCAR_substrate.get_positions(),
+            cell=POSCAR_substrate.get_cell().array,
+            pbc=POSCAR_substrate.get_pbc() & IN_PLANE_PBC,
+            cutoff=distance
+        )
+
+    def at_distance(self, distance: Union[float, int]) -> "AdsorbateDepositor":
+        """
+        Get a depositor for another deposit distance, sharing the substrate, its index and the adsorbates.
+
+        Sites lie at the deposit distance above the surface (see `SiteGenerator`), so they are
+        shifted along the z-axis by the change of distance instead of being generated again.
+        The substrate index is only rebuilt if the new distance exceeds its cutoff.
+
+        Args:
+            distance (Union[float, int]): The new vertical distance from the substrate.
+
+        Returns:
+            AdsorbateDepositor: The depositor for the new distance (self if the distance is unchanged).
+
+        Raises:
+            TypeError: If the distance is not a float or int.
+            ValueError: If the distance is not positive.
+        """
+        if not isinstance(distance, (float, int)):
+            raise TypeError("Expect distance in float or int type.")
+        if distance <= 0:
+            raise ValueError("Distance should be greater than zero.")
+
+        if distance == self.distance:
+            return self
+
+        shift = distance - self.distance
+        depositor = copy.copy(self)
+        depositor.distance = distance
+        depositor.sites = {site_name: [position[0], position[1], position[2] + shift] for site_name, position in self.sites.items()}
+
+        if distance > self.substrate_index.cutoff:
+            depositor.substrate_index = SubstrateIndex(
+                self.poscar_substrate.get_positions(),
+                cell=self.poscar_substrate.get_cell().array,
+                pbc=self.poscar_substrate.get_pbc() & IN_PLANE_PBC,
+                cutoff=distance
+            )
+
+        return depositor
+
     @staticmethod
     def _calculate_centroid(adsorbate: Atoms, ads_reference: List[int]) -> np.ndarray:
         """
@@ -92,8 +160,7 @@ class AdsorbateDepositor:
         Returns:
             np.ndarray: The centroid coordinates as a NumPy array [x, y, z].
         """
-        positions = [adsorbate[index].position for index in ads_reference]
-        return np.mean(positions, axis=0)
+        return adsorbate.positions[ads_reference].mean(axis=0)
 
     def _fix_substrate(self, poscar: Atoms) -> Atoms:
         """
@@ -145,6 +212,7 @@ class AdsorbateDepositor:
         Notes:
             - Atoms with tag 0 are considered 'substrate' and atoms with tag 1 are considered 'adsorbate'.
             - If 'override_tags' is True, the tags for substrate and adsorbate atoms will be set to 0 and 1 respectively, overriding any existing tags.
+            - The substrate and adsorbate passed in are not modified, so they can be reused for the next site.
         """
         # Check args
         if not isinstance(poscar_substrate, Atoms):
@@ -158,32 +226,48 @@ class AdsorbateDepositor:
         if not isinstance(override_tags, bool):
             raise TypeError("Expected 'override_tags' to be of type bool.")
 
+        # Combine into a new Atoms object, leaving the caller's substrate and adsorbate untouched
+        combined = poscar_substrate + adsorbate
+        n_substrate = len(poscar_substrate)
+
         # Override tags if requested
         if override_tags:
-            for atom in poscar_substrate:
-                atom.tag = TAG_DESCRIPTIONS["substrate"]
-            for atom in adsorbate:
-                atom.tag = TAG_DESCRIPTIONS["adsorbate"]
+            tags = np.full(len(combined), TAG_DESCRIPTIONS["substrate"])
+            tags[n_substrate:] = TAG_DESCRIPTIONS["adsorbate"]
+            combined.set_tags(tags)
 
-        # Calculate centroid of adsorbate reference atoms
-        centroid = AdsorbateDepositor._calculate_centroid(adsorbate, ads_reference)
+        # Translate the adsorbate reference centroid to the target site, then move it up along the z-axis
+        translation_vec = np.array(site) - AdsorbateDepositor._calculate_centroid(adsorbate, ads_reference)
+        translation_vec[2] += self.distance
+        combined.positions[n_substrate:] += translation_vec
 
-        # Calculate vector to translate centroid to target site
-        translation_vec = np.array(site) - centroid
+        return combined
 
-        # Translate all atoms in the adsorbate to the target site
-        for atom in adsorbate:
-            atom.position += translation_vec
+    def _split_substrate(self, combined: Atoms) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        Split the atoms of a combined structure for distance checks against the substrate index.
 
-        # Move adsorbate up along the z-axis
-        for atom in adsorbate:
-            atom.position[2] += self.distance
+        Args:
+            combined (Atoms): The combined Atoms object for the substrate and adsorbate.
 
-        # Combine substrate and adsorbate
-        return poscar_substrate + adsorbate
+        Returns:
+            Tuple[np.ndarray, np.ndarray, bool]: The adsorbate atom indexes, the substrate-tagged atom indexes
+                not covered by the index (e.g. adsorbates placed before in coverage mode),
+                and whether the indexed substrate atoms are present.
+        """
+        tags = combined.get_tags()
+        adsorbate_indices = np.flatnonzero(tags == TAG_DESCRIPTIONS["adsorbate"])
+        substrate_indices = np.flatnonzero(tags == TAG_DESCRIPTIONS["substrate"])
 
-    @staticmethod
-    def _calculate_min_distance(combined: Atoms) -> float:
+        # The substrate comes first and is not moved before the vacuum reset, so its atoms are those of the index
+        n_indexed = self.substrate_index.n_atoms
+        indexed = len(combined) >= n_indexed and np.array_equal(substrate_indices[:n_indexed], np.arange(n_indexed))
+        if indexed:
+            substrate_indices = substrate_indices[n_indexed:]
+
+        return adsorbate_indices, substrate_indices, indexed
+
+    def _calculate_min_distance(self, combined: Atoms) -> Tuple[float, Tuple[int, int]]:
         """
         Check the minimum distance between adsorbate and substrate atoms.
 
@@ -191,51 +275,85 @@ class AdsorbateDepositor:
             combined (Atoms): The combined Atoms object for the substrate and adsorbate.
 
         Returns:
-            float: The minimum distance between adsorbate and substrate atoms.
-        """
-        substrate_atoms = [atom for atom in combined if atom.tag == TAG_DESCRIPTIONS["substrate"]]
-        adsorbate_atoms = [atom for atom in combined if atom.tag == TAG_DESCRIPTIONS["adsorbate"]]
+            Tuple[float, Tuple[int, int]]: The minimum distance between adsorbate and substrate atoms,
+                and the (adsorbate, substrate) indexes of the closest pair in the combined Atoms object.
 
-        return min(np.linalg.norm(a.position - s.position) for a in adsorbate_atoms for s in substrate_atoms)
-
-    def _auto_offset(self, combined: Atoms, move_threshold: float = 0.05, step: float = 0.01, max_move_attempts: int = 10000) -> Atoms:
+        Notes:
+            - Distances follow the minimum-image convention along the periodic in-plane cell vectors.
+              The z-axis is treated as non-periodic as the vacuum layer would be reset afterwards.
+            - The substrate atoms, first in `combined` and unmoved, are looked up in `self.substrate_index`;
+              any other substrate-tagged atom is checked pairwise.
+        """
+        adsorbate_indices, other_indices, indexed = self._split_substrate(combined)
+        adsorbate_positions = combined.positions[adsorbate_indices]
+
+        min_distance, pair = np.inf, None
+        if indexed:
+            min_distance, (ads_index, sub_index) = self.substrate_index.min_distance(adsorbate_positions)
+            pair = (int(adsorbate_indices[ads_index]), sub_index)
+
+        if len(other_indices):
+            other_distance, (ads_index, sub_index) = calculate_min_distance(
+                adsorbate_positions,
+                combined.positions[other_indices],
+                cell=combined.get_cell(),
+                pbc=combined.get_pbc() & IN_PLANE_PBC
+            )
+            if other_distance < min_distance:
+                min_distance, pair = other_distance, (int(adsorbate_indices[ads_index]), int(other_indices[sub_index]))
+
+        return min_distance, pair
+
+    def _auto_offset(self, combined: Atoms, move_threshold: float = 0.05) -> Atoms:
         """
         Adjust the distance between adsorbate and substrate atoms.
 
+        The required shift along the z-axis is solved directly from the pair geometry: for every
+        adsorbate-substrate pair closer than the target distance in-plane, the adsorbate atom must sit
+        sqrt(distance^2 - lateral^2) above the substrate atom, and the largest of these shifts brings the
+        closest pair exactly to the target distance while keeping all other pairs further apart.
+        Only these pairs are gathered, from the substrate index.
+
         Parameters:
             combined (Atoms): The combined Atoms object for the substrate and adsorbate.
-            move_threshold (float, optional): The distance threshold in Å to stop offset. Defaults to 0.05.
-            step (float, optional): The distance in Å to move the adsorbate up along the z-axis in each step. Defaults to 0.01.
-            max_move_attempts (int, optional): The maximum attempts the adsorbate can be moved to avoid potential infinite loop. Defaults to 2000.
+            move_threshold (float, optional): The distance threshold in Å to accept the offset. Defaults to 0.05.
 
         Returns:
             Atoms: The adjusted combined Atoms object.
-        """
-        adsorbate_atoms = [atom for atom in combined if atom.tag == TAG_DESCRIPTIONS["adsorbate"]]
-
-        move_attempts = 0
 
-        while move_attempts < max_move_attempts:
-            current_min_distance = AdsorbateDepositor._calculate_min_distance(combined)
-
-            # Break offset when distance within rational range
-            if (self.distance - move_threshold) <= current_min_distance <= (self.distance + move_threshold):
-                break
-
-            # Move adsorbate along z-axis by step
-            for atom in adsorbate_atoms:
-                # Current distance greater than expected
-                if current_min_distance >= (self.distance + move_threshold):
-                    atom.position[2] -= step
-
-                # Current distance smaller than expected
-                elif current_min_distance <= (self.distance - move_threshold):
-                    atom.position[2] += step
-
-            move_attempts += 1
-
-            if move_attempts >= max_move_attempts:
-                raise RuntimeError(f"Maximum moving distance of {max_move_attempts * step} Å reached but still cannot find a valid location. Please check your structure.")
+        Raises:
+            RuntimeError: If no shift along the z-axis could bring the adsorbate to the target distance.
+        """
+        adsorbate_indices, other_indices, indexed = self._split_substrate(combined)
+        adsorbate_positions = combined.positions[adsorbate_indices]
+
+        # Displacements of the adsorbate-substrate pairs closer than the target distance in-plane
+        displacements = np.zeros((0, 3))
+        if indexed:
+            _, _, displacements = self.substrate_index.pairs_within(adsorbate_positions, radius=self.distance, lateral=True)
+
+        if len(other_indices):
+            other_displacements = minimum_image_vectors(
+                adsorbate_positions[:, None, :] - combined.positions[other_indices][None, :, :],
+                cell=combined.get_cell(),
+                pbc=combined.get_pbc() & IN_PLANE_PBC
+            ).reshape(-1, 3)
+            displacements = np.concatenate((displacements, other_displacements))
+
+        # Only pairs closer than the target distance in-plane can be brought to the target by moving along z
+        lateral_squared = np.einsum("ij,ij->i", displacements[:, :2], displacements[:, :2])
+        reachable = lateral_squared < self.distance ** 2
+        if not reachable.any():
+            raise RuntimeError(f"Adsorbate is at least {self.distance} Å away from substrate in-plane, cannot reach distance {self.distance} Å along z-axis. Please check your structure.")
+
+        vertical_separation = np.sqrt(self.distance ** 2 - lateral_squared[reachable])
+        shift = np.max(vertical_separation - displacements[reachable, 2])
+        combined.positions[adsorbate_indices, 2] += shift
+
+        # Verify the offset structure
+        min_distance, _ = self._calculate_min_distance(combined)
+        if abs(min_distance - self.distance) > move_threshold:
+            raise RuntimeError(f"Min distance of {min_distance} Å after offset still out of range. Please check your structure.")
 
         return combined
 
@@ -274,9 +392,35 @@ class AdsorbateDepositor:
 
         return poscar
 
-    def deposit(self, rotation_generated: bool, auto_offset_along_z: bool = True, fix_substrate: bool = False,  target_vacuum_layer: float = 10.0, vacuum_layer_warn_threshold: float = 5.0, offset_threshold: float = 0.05, offset_step: float = 0.01) -> dict:
+    def deposit(self, rotation_generated: bool, auto_offset_along_z: bool = True, fix_substrate: bool = False,  target_vacuum_layer: float = 10.0, vacuum_layer_warn_threshold: float = 5.0, offset_threshold: float = 0.05, workers: int = 1, clash_distance: float = None, site_combinations: List[Tuple[str, ...]] = None, completed: Dict[str, str] = None, bonding_graph: bool = False) -> dict:
         """
-        Deposit adsorbates onto specified sites on the substrate.
+        Deposit adsorbates onto specified sites on the substrate, keeping all structures in memory.
+
+        Takes the same arguments as `iter_deposit`.
+
+        Returns:
+            dict: A dictionary containing the resulting structures, indexed by a composite species name.
+        """
+        return dict(self.iter_deposit(
+            rotation_generated=rotation_generated,
+            auto_offset_along_z=auto_offset_along_z,
+            fix_substrate=fix_substrate,
+            target_vacuum_layer=target_vacuum_layer,
+            vacuum_layer_warn_threshold=vacuum_layer_warn_threshold,
+            offset_threshold=offset_threshold,
+            workers=workers,
+            clash_distance=clash_distance,
+            site_combinations=site_combinations,
+            completed=completed,
+            bonding_graph=bonding_graph
+        ))
+
+    def iter_deposit(self, rotation_generated: bool, auto_offset_along_z: bool = True, fix_substrate: bool = False,  target_vacuum_layer: float = 10.0, vacuum_layer_warn_threshold: float = 5.0, offset_threshold: float = 0.05, workers: int = 1, clash_distance: float = None, site_combinations: List[Tuple[str, ...]] = None, completed: Dict[str, str] = None, bonding_graph: bool = False) -> Iterator[Tuple[str, Atoms]]:
+        """
+        Deposit adsorbates onto specified sites on the substrate, yielding each structure as soon as it is finished.
+
+        Arguments are validated immediately, structures are generated lazily as the returned iterator is consumed,
+        so that a writer can persist and release each structure right away.
 
         Args:
             rotation_generated (bool), Whether rotated adsorbates are generated
@@ -285,13 +429,23 @@ class AdsorbateDepositor:
             target_vacuum_layer (float, optional): Final vacuum layer thickness in Å.
             vacuum_layer_warn_threshold (float, optional): Vacuum layer thickness to generate warning.
             offset_threshold (float, optional): The distance delta in Å to activate adsorbate offset. Defaults to 0.05.
-            offset_step (float, optional): The distance in Å to move the adsorbate up along the z-axis in each step. Defaults to 0.01.
+            workers (int, optional): Number of worker processes to deposit (site, adsorbate) pairs in parallel. Defaults to 1 (serial).
+            clash_distance (float, optional): Skip (site, adsorbate) pairs where any adsorbate atom, with the adsorbate reference on the site,
+                is closer than this distance in Å to the substrate. Defaults to None (no clash pruning).
+            site_combinations (List[Tuple[str, ...]], optional): Sets of site names, each set occupied at once by copies of the same
+                adsorbate (coverage mode, see `enumerate_site_combinations`). Defaults to None (one adsorbate on each site).
+            completed (Dict[str, str], optional): Task keys of structures already generated by an earlier run, keyed by name
+                (see `OutputManifest`). Tasks whose name and key both match are skipped. Defaults to None (nothing skipped).
+            bonding_graph (bool, optional): Whether to store the adsorbate bonding graph of each structure (see `build_bonding_graph`)
+                as a JSON string in `info["bonding_graph"]`, saved with the outputs. Defaults to False.
 
         Returns:
-            dict: A dictionary containing the resulting structures, indexed by a composite species name.
+            Iterator[Tuple[str, Atoms]]: Iterator of (composite species name, structure) pairs, in deterministic order.
+                The task key of each structure, a hash of everything it is generated from, is stored in `info["task_key"]`.
 
         Raises:
             TypeError: If the provided arguments are not of the expected types.
+            ValueError: If the vacuum layer thickness, the worker count or the clash distance is not positive.
         """
 
         # Check the type of boolean flags
@@ -304,6 +458,9 @@ class AdsorbateDepositor:
         if not isinstance(fix_substrate, bool):
             raise TypeError(f"Expected 'fix_substrate' to be of type bool, but got {type(fix_substrate)}.")
 
+        if not isinstance(bonding_graph, bool):
+            raise TypeError(f"Expected 'bonding_graph' to be of type bool, but got {type(bonding_graph)}.")
+
         # Check target vacuum layer datatype and thickness
         if not isinstance(target_vacuum_layer, (float, int)):
             raise TypeError(f"Expected 'target_vacuum_layer' to be of type float/int, but got {type(target_vacuum_layer)}.")
@@ -313,69 +470,374 @@ class AdsorbateDepositor:
         elif target_vacuum_layer <= vacuum_layer_warn_threshold:
             warnings.warn(f"Small vacuum layer thickness of {target_vacuum_layer} Å found.")
 
-        # Deposit adsorbates onto sites
-        results = {}
-        for site_name, site_info in tqdm(self.sites.items(), desc="Depositing adsorbates"):
-            for ads_name, ads_info in self.adsorbates.items():
+        # Check worker count
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError(f"Expected 'workers' to be a positive integer, but got {workers}.")
+
+        # Check clash distance
+        if clash_distance is not None and (not isinstance(clash_distance, (float, int)) or clash_distance <= 0):
+            raise ValueError(f"Expected 'clash_distance' to be a positive float/int, but got {clash_distance}.")
+
+        # Deposit adsorbates onto sites, one task per (site, adsorbate) pair
+        tasks = self.plan_tasks(rotation_generated, clash_distance, site_combinations)
+        options = {
+            "auto_offset_along_z": auto_offset_along_z,
+            "fix_substrate": fix_substrate,
+            "target_vacuum_layer": target_vacuum_layer,
+            "offset_threshold": offset_threshold,
+        }
+        if bonding_graph:
+            options["bonding_graph"] = True  # only set when enabled, so that task keys of earlier runs stay valid
+        keys = self._task_keys(tasks, options)
+
+        # (Optionally) skip structures left unchanged since an earlier run
+        if completed is not None:
+            remaining = [(task, key) for task, key in zip(tasks, keys) if completed.get(f"{'+'.join(task[0])}_{task[1]}") != key]
+            print(f"Resume: {len(tasks) - len(remaining)} of {len(tasks)} structures already generated, skipped.")
+            tasks, keys = [task for task, _ in remaining], [key for _, key in remaining]
+
+        if workers == 1:
+            structures = self._iterate_serial(tasks, options)
+        else:
+            structures = self._iterate_parallel(tasks, options, workers)
+
+        return AdsorbateDepositor._attach_task_keys(structures, keys)
+
+    def plan_tasks(self, rotation_generated: bool, clash_distance: float = None, site_combinations: List[Tuple[str, ...]] = None) -> List[Tuple[Tuple[str, ...], str, str]]:
+        """
+        List the (site, adsorbate) pairs a deposition would run, without building any structure.
+
+        Args:
+            rotation_generated (bool): Whether rotated adsorbates are generated.
+            clash_distance (float, optional): Drop pairs clashing with the substrate at this distance in Å (see `iter_deposit`). Defaults to None.
+            site_combinations (List[Tuple[str, ...]], optional): Sets of sites occupied at once. Defaults to None (each site on its own).
+
+        Returns:
+            List[Tuple[Tuple[str, ...], str, str]]: List of (site names, adsorbate name, adsorbate reference name) tuples, in deposition order.
+        """
+        tasks = self._generate_tasks(rotation_generated, site_combinations)
+        if clash_distance is not None:
+            tasks = self._prune_clashing_tasks(tasks, clash_distance)
+
+        return tasks
+
+    @staticmethod
+    def _attach_task_keys(structures: Iterator[Tuple[str, Atoms]], keys: List[str]) -> Iterator[Tuple[str, Atoms]]:
+        """
+        Store the task key of each structure in its info.
+
+        Args:
+            structures (Iterator[Tuple[str, Atoms]]): The (name, structure) pairs, in task order.
+            keys (List[str]): The task keys, in task order.
+
+        Yields:
+            Tuple[str, Atoms]: The same pairs.
+        """
+        for (name, atoms), key in zip(structures, keys):
+            atoms.info["task_key"] = key
+            yield name, atoms
+
+    def _task_keys(self, tasks: List[Tuple[Tuple[str, ...], str, str]], options: dict) -> List[str]:
+        """
+        Hash everything a structure is generated from, so that unchanged structures can be recognized across runs.
+
+        The key covers the substrate, the deposit distance and options, the site positions,
+        the adsorbate atoms and its reference indexes.
+
+        Args:
+            tasks (List[Tuple[Tuple[str, ...], str, str]]): The (site names, adsorbate name, adsorbate reference name) tuples.
+            options (dict): Keyword arguments for `_deposit_task`.
+
+        Returns:
+            List[str]: The hexadecimal task keys, in task order.
+        """
+        base = hashlib.sha256()
+        for array in (self.poscar_substrate.get_atomic_numbers(), self.poscar_substrate.get_positions(),
+                      self.poscar_substrate.get_cell().array, self.poscar_substrate.get_pbc()):
+            base.update(np.ascontiguousarray(array).tobytes())
+        base.update(json.dumps({"distance": self.distance, **options}, sort_keys=True).encode())
+
+        adsorbate_digests = {}
+        keys = []
+        for site_names, ads_name, ads_ref_tag in tasks:
+            if (ads_name, ads_ref_tag) not in adsorbate_digests:
+                adsorbate = self.adsorbates[ads_name]
+                digest = hashlib.sha256(adsorbate.get_atomic_numbers().tobytes() + adsorbate.get_positions().tobytes())
+                digest.update(json.dumps([int(index) for index in self.adsorbate_refs[ads_ref_tag]]).encode())
+                adsorbate_digests[(ads_name, ads_ref_tag)] = digest.digest()
+
+            key = base.copy()
+            key.update(np.array([self.sites[site_name] for site_name in site_names], dtype=float).tobytes())
+            key.update(adsorbate_digests[(ads_name, ads_ref_tag)])
+            keys.append(key.hexdigest())
+
+        return keys
+
+    def _iterate_serial(self, tasks: List[Tuple[Tuple[str, ...], str, str]], options: dict) -> Iterator[Tuple[str, Atoms]]:
+        """
+        Run deposition tasks one by one in the current process.
+
+        Args:
+            tasks (List[Tuple[Tuple[str, ...], str, str]]): The (site names, adsorbate name, adsorbate reference name) tuples.
+            options (dict): Keyword arguments for `_deposit_task`.
+
+        Yields:
+            Tuple[str, Atoms]: The composite species name and the post-processed structure.
+        """
+        for site_names, ads_name, ads_ref_tag in tqdm(tasks, desc="Depositing adsorbates"):
+            yield f"{'+'.join(site_names)}_{ads_name}", self._deposit_task(site_names, ads_name, ads_ref_tag, **options)
+
+    def _iterate_parallel(self, tasks: List[Tuple[Tuple[str, ...], str, str]], options: dict, workers: int, tasks_in_flight_per_worker: int = 4) -> Iterator[Tuple[str, Atoms]]:
+        """
+        Run deposition tasks over a process pool, yielding results in task order.
+
+        The depositor (substrate, sites and adsorbates) is shipped once per worker, tasks only carry names.
+        At most `workers * tasks_in_flight_per_worker` tasks are pending at a time, so finished structures
+        do not pile up in memory when the consumer is slower than the pool.
+
+        Args:
+            tasks (List[Tuple[Tuple[str, ...], str, str]]): The (site names, adsorbate name, adsorbate reference name) tuples.
+            options (dict): Keyword arguments for `_deposit_task`.
+            workers (int): Number of worker processes.
+            tasks_in_flight_per_worker (int, optional): Number of pending tasks per worker. Defaults to 4.
+
+        Yields:
+            Tuple[str, Atoms]: The composite species name and the post-processed structure.
+        """
+        pending = deque()
+        task_iter = iter(tasks)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker, initargs=(self, )) as executor:
+            for task in islice(task_iter, workers * tasks_in_flight_per_worker):
+                pending.append((task, executor.submit(_run_worker_task, task, options)))
+
+            with tqdm(total=len(tasks), desc=f"Depositing adsorbates ({workers} workers)") as progress:
+                while pending:
+                    (site_names, ads_name, _), future = pending.popleft()
+                    structure = future.result()
+
+                    # Keep the pool busy before handing the structure over
+                    for task in islice(task_iter, 1):
+                        pending.append((task, executor.submit(_run_worker_task, task, options)))
+
+                    progress.update()
+                    yield f"{'+'.join(site_names)}_{ads_name}", structure
+
+    def _generate_tasks(self, rotation_generated: bool, site_combinations: List[Tuple[str, ...]] = None) -> List[Tuple[Tuple[str, ...], str, str]]:
+        """
+        Generate the list of (site, adsorbate) pairs to deposit.
+
+        Args:
+            rotation_generated (bool): Whether rotated adsorbates are generated.
+            site_combinations (List[Tuple[str, ...]], optional): Sets of sites occupied at once. Defaults to None (each site on its own).
+
+        Returns:
+            List[Tuple[Tuple[str, ...], str, str]]: List of (site names, adsorbate name, adsorbate reference name) tuples, sites varying slowest.
+        """
+        if site_combinations is None:
+            site_combinations = [(site_name, ) for site_name in self.sites]
+
+        for site_names in site_combinations:
+            for site_name in site_names:
+                if site_name not in self.sites:
+                    raise ValueError(f"Site {site_name} of combination {site_names} not found.")
+
+        tasks = []
+        for site_names in site_combinations:
+            for ads_name in self.adsorbates:
                 # Recompile adsorbate name when auto_rotation activated
                 if rotation_generated:
                     # Extract "adsorbate_name" from "adsorbate_name_rotation_N" if rotation activated
                     ads_ref_tag = re.search(r"(.+)_rotation_\d+", ads_name).group(1)
+                else:
+                    ads_ref_tag = ads_name
 
-                    # Get adsorbate reference
-                    ads_reference = self.adsorbate_refs[ads_ref_tag]
+                tasks.append((tuple(site_names), ads_name, ads_ref_tag))
 
-                else:
-                    ads_reference = self.adsorbate_refs[ads_name]
+        return tasks
+
+    def _prune_clashing_tasks(self, tasks: List[Tuple[str, str, str]], clash_distance: float) -> List[Tuple[str, str, str]]:
+        """
+        Drop (site, adsorbate) pairs where the adsorbate, with its reference on the site, clashes with the substrate.
+
+        Only positions are checked, no structure is built: orientations pointing into the surface
+        would otherwise be lifted by the auto-offset and bind through another atom than the reference.
+        Sites already lie at the requested distance above the surface, as generated by `SiteGenerator`.
+
+        Args:
+            tasks (List[Tuple[Tuple[str, ...], str, str]]): The (site names, adsorbate name, adsorbate reference name) tuples.
+            clash_distance (float): Minimum allowed adsorbate-substrate distance in Å.
+
+        Returns:
+            List[Tuple[Tuple[str, ...], str, str]]: The tasks without clash, in the same order.
+        """
+        kept = []
+        for site_names, ads_name, ads_ref_tag in tasks:
+            positions = self.adsorbates[ads_name].get_positions()
+            relative = positions - positions[self.adsorbate_refs[ads_ref_tag]].mean(axis=0)
+            placed = (relative[None, :, :] + np.array([self.sites[site_name] for site_name in site_names])[:, None, :]).reshape(-1, 3)
+
+            if not self.substrate_index.any_within(placed, clash_distance):
+                kept.append((site_names, ads_name, ads_ref_tag))
+
+        print(f"Clash pruning: {len(tasks) - len(kept)} of {len(tasks)} (site, adsorbate) pairs removed.")
+        if not kept:
+            warnings.warn(f"All (site, adsorbate) pairs clash with the substrate at {clash_distance} Å, no structure would be generated.")
+
+        return kept
+
+    def _place_adsorbate(self, substrate: Atoms, site_name: str, ads_name: str, ads_ref_tag: str, auto_offset_along_z: bool, offset_threshold: float) -> Atoms:
+        """
+        Deposit one adsorbate on one site and bring it to the target distance from the substrate.
+
+        Args:
+            substrate (Atoms): The substrate, every atom of which is tagged as substrate for the distance check.
+            site_name (str): Name of the site in `self.sites`.
+            ads_name (str): Name of the adsorbate in `self.adsorbates`.
+            ads_ref_tag (str): Name of the adsorbate reference in `self.adsorbate_refs`.
+            auto_offset_along_z (bool): Whether to automatically offset the adsorbate along the z-axis.
+            offset_threshold (float): The distance delta in Å to activate adsorbate offset.
+
+        Returns:
+            Atoms: The combined structure, the new adsorbate atoms appended last.
+        """
+        # Perform the actual deposition
+        result = self._deposit_adsorbate_on_site(substrate, self.sites[site_name], self.adsorbates[ads_name], self.adsorbate_refs[ads_ref_tag])
+
+        # Check and adjust adsorbate-substrate distance
+        min_distance, _ = self._calculate_min_distance(result)
+        if min_distance < (self.distance - offset_threshold) or min_distance > (self.distance + offset_threshold):
+            if auto_offset_along_z:
+                warnings.warn(f"Min distance between adsorbate and substrate is  {min_distance} Å, auto-offset is activated.")
+                result = self._auto_offset(result, move_threshold=offset_threshold)
+
+            else:
+                warnings.warn(f"Min distance between adsorbate and substrate is  {min_distance} Å, however auto-offset is disabled.")
+
+        return result
+
+    def _deposit_task(self, site_names: Tuple[str, ...], ads_name: str, ads_ref_tag: str, auto_offset_along_z: bool, fix_substrate: bool, target_vacuum_layer: float, offset_threshold: float, bonding_graph: bool = False) -> Atoms:
+        """
+        Deposit one adsorbate on each of the given sites and post-process the resulting structure.
+
+        Adsorbates are placed one after the other. While placing one, the adsorbates already placed
+        count as substrate for the distance check, so that copies cannot overlap after auto-offset.
+
+        Args:
+            site_names (Tuple[str, ...]): Names of the sites in `self.sites`, one for a single adsorbate.
+            ads_name (str): Name of the adsorbate in `self.adsorbates`.
+            ads_ref_tag (str): Name of the adsorbate reference in `self.adsorbate_refs`.
+            auto_offset_along_z (bool): Whether to automatically offset the adsorbate along the z-axis.
+            fix_substrate (bool): Whether to fix the substrate atoms.
+            target_vacuum_layer (float): Final vacuum layer thickness in Å.
+            offset_threshold (float): The distance delta in Å to activate adsorbate offset.
+            bonding_graph (bool, optional): Whether to store the adsorbate bonding graph in `info["bonding_graph"]`. Defaults to False.
 
-                # Perform the actual deposition
-                result = self._deposit_adsorbate_on_site(self.poscar_substrate, site_info, ads_info, ads_reference)
+        Returns:
+            Atoms: The post-processed structure.
+        """
+        result = self._place_adsorbate(self.poscar_substrate, site_names[0], ads_name, ads_ref_tag, auto_offset_along_z, offset_threshold)
 
-                # Check and adjust adsorbate-substrate distance
-                min_distance = AdsorbateDepositor._calculate_min_distance(result)
-                if min_distance < (self.distance - offset_threshold) or min_distance > (self.distance + offset_threshold):
-                    if auto_offset_along_z:
-                        warnings.warn(f"Min distance between adsorbate and substrate is  {min_distance} Å, auto-offset is activated.")
-                        result = self._auto_offset(result, move_threshold=offset_threshold, step=offset_step)
+        for site_name in site_names[1:]:
+            placed_tags = result.get_tags()
+            result = self._place_adsorbate(result, site_name, ads_name, ads_ref_tag, auto_offset_along_z, offset_threshold)
+            result.set_tags(np.concatenate((placed_tags, result.get_tags()[len(placed_tags):])))
 
-                    else:
-                        warnings.warn(f"Min distance between adsorbate and substrate is  {min_distance} Å, however auto-offset is disabled.")
+        # Reset vacuum layer thickness (would recenter atoms along z-axis)
+        result = self._reset_vacuum_layer_thickness(result, target_vacuum_layer)
 
-                # Reset vacuum layer thickness (would recenter atoms along z-axis)
-                result = self._reset_vacuum_layer_thickness(result, target_vacuum_layer)
+        # (Optionally) freeze substrate atoms for selective dynamics
+        if fix_substrate:
+            result = self._fix_substrate(result)
 
-                # (Optionally) freeze substrate atoms for selective dynamics
-                if fix_substrate:
-                    result = self._fix_substrate(result)
+        # Record where the structure comes from, kept by the single-file output formats
+        result.info["site"] = "+".join(site_names)
+        result.info["adsorbate"] = ads_ref_tag
+        rotation = re.search(r"_rotation_(\d+)$", ads_name)
+        if rotation:
+            result.info["rotation"] = int(rotation.group(1))
 
-                # Save the post-processed result
-                results[f"{site_name}_{ads_name}"] = result
+        # (Optionally) record adsorbate-adsorbate and adsorbate-substrate bonds, in-plane periodic as the distance checks
+        if bonding_graph:
+            adsorbate_atoms = np.flatnonzero(result.get_tags() == TAG_DESCRIPTIONS["adsorbate"])
+            result.info["bonding_graph"] = dumps_graph(build_bonding_graph(result, adsorbate_atoms, pbc=result.get_pbc() & IN_PLANE_PBC))
 
-        return results
+        return result
 
-    def write(self, atoms_dict: Dict[str, Atoms], output_dir: Path, filename: str = "POSCAR_generated") -> None:
+    def write(self, atoms_dict: Union[Dict[str, Atoms], Iterable[Tuple[str, Atoms]]], output_dir: Path, filename: str = "POSCAR_generated", output_format: str = "vasp", on_written: Optional[Callable[[str, Atoms], None]] = None) -> int:
         """
-        Write generated Atoms objects to file, each in a separate directory based on its adsorbate name.
+        Write generated Atoms objects to file.
 
         Args:
-            atoms_dict (Dict[str, Atoms]): Dictionary of adsorbate names and their corresponding Atoms objects.
+            atoms_dict (Union[Dict[str, Atoms], Iterable[Tuple[str, Atoms]]]): Dictionary of adsorbate names and their corresponding Atoms objects,
+                or an iterable of (name, Atoms) pairs such as `iter_deposit`, in which case each structure is written and released as it arrives.
             output_dir (Path): Directory where the Atoms objects will be saved.
-            filename (str, optional): Filename for the output. Defaults to "POSCAR_generated".
+            filename (str, optional): Filename for the "vasp" output. Defaults to "POSCAR_generated".
+            output_format (str, optional): "vasp" for one directory per structure, or "extxyz"/"db" to append all
+                structures with their site/adsorbate/rotation metadata to a single file in `output_dir`. Defaults to "vasp".
+                Bonding graphs are written next to each POSCAR ("vasp") or kept in the metadata ("extxyz"/"db").
+            on_written (Callable[[str, Atoms], None], optional): Called with each (name, Atoms) pair once its file is written,
+                e.g. to record it in an `OutputManifest` ("vasp" output only). Defaults to None.
+
+        Returns:
+            int: The number of structures written.
+
+        Raises:
+            TypeError: If the output directory or a structure is not of the expected type.
+            ValueError: If the output format is not supported, or `on_written` is given for a single-file output.
         """
         # Check and create the output directory
         if not isinstance(output_dir, Path):
             raise TypeError(f"Expected 'output_dir' to be of type Path, but got {type(output_dir)}.")
 
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format {output_format}, expected one of {list(OUTPUT_FORMATS)}.")
+
+        if on_written is not None and output_format != "vasp":
+            raise ValueError("Per-structure write callbacks are only supported for the \"vasp\" output format.")
+
         if not output_dir.is_dir():
             output_dir.mkdir(parents=True)
 
-        # Iterate through the dictionary and write each Atoms object to its corresponding directory
-        for adsorbate_name, atoms in atoms_dict.items():
-            if not isinstance(atoms, Atoms):
-                raise TypeError(f"Wrong datatype for {adsorbate_name}. Expected Atoms, but got {type(atoms)}.")
+        if isinstance(atoms_dict, dict):
+            atoms_dict = atoms_dict.items()
+
+        def checked(structures: Iterable[Tuple[str, Atoms]]) -> Iterator[Tuple[str, Atoms]]:
+            for adsorbate_name, atoms in structures:
+                if not isinstance(atoms, Atoms):
+                    raise TypeError(f"Wrong datatype for {adsorbate_name}. Expected Atoms, but got {type(atoms)}.")
+                yield adsorbate_name, atoms
 
-            adsorbate_dir = output_dir / adsorbate_name
-            if not adsorbate_dir.is_dir():
-                adsorbate_dir.mkdir()
+        # Write each structure as it arrives
+        if output_format == "vasp":
+            return write_vasp_directories(checked(atoms_dict), output_dir, filename, on_written)
+        elif output_format == "extxyz":
+            return write_extxyz(checked(atoms_dict), output_dir / OUTPUT_FORMATS[output_format])
+        else:
+            return write_database(checked(atoms_dict), output_dir / OUTPUT_FORMATS[output_format])
 
-            write(adsorbate_dir / filename, atoms, format="vasp")
+# Depositor shared by all tasks of a worker process, set once by the pool initializer
+_WORKER_DEPOSITOR = None
+
+def _initialize_worker(depositor: AdsorbateDepositor) -> None:
+    """
+    Store the depositor in a worker process of the parallel deposition pool.
+
+    Args:
+        depositor (AdsorbateDepositor): The depositor holding the substrate, sites and adsorbates.
+    """
+    global _WORKER_DEPOSITOR
+    _WORKER_DEPOSITOR = depositor
+
+def _run_worker_task(task: Tuple[Tuple[str, ...], str, str], options: dict) -> Atoms:
+    """
+    Run one deposition task in a worker process.
+
+    Args:
+        task (Tuple[Tuple[str, ...], str, str]): The (site names, adsorbate name, adsorbate reference name) tuple.
+        options (dict): Keyword arguments for `AdsorbateDepositor._deposit_task`.
+
+    Returns:
+        Atoms: The post-processed structure.
+    """
+    return _WORKER_DEPOSITOR._deposit_task(*task, **options)
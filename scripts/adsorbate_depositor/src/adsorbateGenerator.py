@@ -2,13 +2,13 @@
 # -*- coding: utf-8 -*-
 
 from pathlib import Path
-from copy import deepcopy
 import warnings
 from ase import Atoms
 from ase.io import read
 from typing import List, Dict
 
-from .parse_adsorbate_database import parse_adsorbate_database
+from .database_index import load_database_index, get_pathway, get_adsorbate
+from .rotation_sampling import ROTATION_METHODS, sample_rotations, rotate_positions, prune_duplicate_rotations
 
 class AdsorbateGenerator:
     """
@@ -18,7 +18,12 @@ class AdsorbateGenerator:
         work_mode (str): Working mode ("POSCAR" or "DATABASE").
         path (Path): The path to the adsorbate POSCAR ("POSCAR" mode) or database directory ("DATABASE" mode).
         generate_rotations (bool): Whether to generate rotated versions.
+        rotation_method (str): How orientations are generated ("fixed", "uniform", "quasi_random" or "azimuthal").
+        rotation_count (int): Number of sampled orientations, the original one included.
+        rotation_seed (int): Seed of the orientation sampling.
+        rmsd_threshold (float): RMSD in Å below which two orientations are considered duplicates (None to keep all).
         adsorbate_header_dict (Dict): The loaded adsorbate database dictionary for selected pathway.
+        database_index (Dict): The compiled database index ("DATABASE" mode), with pre-extracted adsorbates.
 
     Methods:
         __init__ : Initialize the class.
@@ -30,7 +35,7 @@ class AdsorbateGenerator:
         generate_adsorbates : Generate adsorbates based on the working mode.
     """
 
-    def __init__(self, work_mode: str, path: Path, pathway_name: str = None, generate_rotations: bool = False) -> None:
+    def __init__(self, work_mode: str, path: Path, pathway_name: str = None, generate_rotations: bool = False, rotation_method: str = "fixed", rotation_count: int = 6, rotation_seed: int = None, rmsd_threshold: float = None) -> None:
         """
         Initialize the AdsorbateGenerator object.
 
@@ -39,11 +44,17 @@ class AdsorbateGenerator:
             path (Path): Path to POSCAR file or database directory.
             pathway_name (str): Requested pathway name from database (only for "DATABASE" mode).
             generate_rotations (bool): Flag to generate rotated versions of adsorbate. Default is False.
+            rotation_method (str): "fixed" for the six fixed orientations, "uniform"/"quasi_random" to sample
+                orientations over SO(3), or "azimuthal" to sample about the z-axis only. Default is "fixed".
+            rotation_count (int): Number of sampled orientations, the original one included (ignored by "fixed"). Default is 6.
+            rotation_seed (int): Seed of the orientation sampling. Default is None.
+            rmsd_threshold (float): RMSD in Å below which an orientation duplicates an earlier one and is dropped. Default is None (keep all).
 
         Raises:
             RuntimeError: If an illegal working mode is passed.
             FileNotFoundError: If the database directory does not exist.
             TypeError: If generate_rotations is not a boolean.
+            ValueError: If the rotation sampling settings are illegal.
         """
         # Check work mode and corresponding path
         if work_mode == "POSCAR":
@@ -59,15 +70,31 @@ class AdsorbateGenerator:
         if not isinstance(generate_rotations, bool):
             raise TypeError("Illegal datatype for \"generate_rotations\".")
 
+        # Check rotation sampling settings
+        if rotation_method not in ROTATION_METHODS:
+            raise ValueError(f"Illegal rotation method {rotation_method}, expected one of {ROTATION_METHODS}.")
+
+        if not isinstance(rotation_count, int) or rotation_count < 1:
+            raise ValueError(f"Illegal rotation count {rotation_count}, expected a positive integer.")
+
+        if rmsd_threshold is not None and rmsd_threshold < 0:
+            raise ValueError(f"Illegal RMSD threshold {rmsd_threshold}, expected a non-negative value.")
+
         # Parse attributes
         self.work_mode = work_mode
         self.path = path
         self.generate_rotations = generate_rotations
+        self.rotation_method = rotation_method
+        self.rotation_count = rotation_count
+        self.rotation_seed = rotation_seed
+        self.rmsd_threshold = rmsd_threshold
 
-        # Parse adsorbate database
+        # Parse adsorbate database (from its compiled index, rebuilt when a source file changed)
         if work_mode == "DATABASE":
-            self.adsorbate_header_dict = parse_adsorbate_database(path, pathway_name)
+            self.database_index = load_database_index(path)
+            self.adsorbate_header_dict = get_pathway(self.database_index, pathway_name)
         else:
+            self.database_index = None
             self.adsorbate_header_dict = None
 
     def _extract_atoms(self, POSCAR_adsorbate: Path, atom_indexes: List[int]) -> Atoms:
@@ -107,15 +134,18 @@ class AdsorbateGenerator:
             warnings.warn("Large adsorbate requested (more than 10 atoms). Make sure this is intended.")
         return adsorbate_poscar
 
-    def _generate_rotations(self, adsorbate_atoms: Atoms) -> List[Atoms]:
+    def _generate_rotations(self, adsorbate_atoms: Atoms) -> Dict[int, Atoms]:
         """
         Generate rotated versions of the given adsorbate.
 
+        All orientations are applied at once as a batched rotation-matrix product on the position array,
+        and near-duplicate orientations (by RMSD) are dropped before any Atoms object is built.
+
         Args:
             adsorbate_atoms (Atoms): The Atoms object to rotate.
 
         Returns:
-            List[Atoms]: A list of rotated Atoms objects.
+            Dict[int, Atoms]: Rotated Atoms objects, keyed by their orientation index (the original orientation being 0).
         """
         if not isinstance(adsorbate_atoms, Atoms):
             raise TypeError(f"Adsorbate fed into rotation generator should be ASE.Atoms, got {type(adsorbate_atoms)}.")
@@ -125,22 +155,22 @@ class AdsorbateGenerator:
 
         elif len(adsorbate_atoms) == 1:
             warnings.warn("Adsorbate containing only one atom; rotation skipped.")
-            return [adsorbate_atoms, ]
+            return {0: adsorbate_atoms}
 
         else:
-            rotations = [
-                ("x", 90),  # Rotate 90 degrees about x
-                ("x", -90), # Rotate -90 degrees about x
-                ("y", 90),  # Rotate 90 degrees about y
-                ("y", -90), # Rotate -90 degrees about y
-                ("z", 180), # Rotate 180 degrees about z
-            ]
-
-            rotated_adsorbates = [deepcopy(adsorbate_atoms), ]  # original image
-            for axis, angle in rotations:
-                rotated_adsorbate = deepcopy(adsorbate_atoms)
-                rotated_adsorbate.rotate(axis, angle)
-                rotated_adsorbates.append(rotated_adsorbate)
+            rotations = sample_rotations(self.rotation_count, method=self.rotation_method, seed=self.rotation_seed)
+            rotated_positions = rotate_positions(adsorbate_atoms.get_positions(), rotations)
+
+            if self.rmsd_threshold is not None:
+                kept = prune_duplicate_rotations(rotated_positions, self.rmsd_threshold)
+            else:
+                kept = list(range(len(rotations)))
+
+            rotated_adsorbates = {}
+            for index in kept:
+                rotated_adsorbate = adsorbate_atoms.copy()
+                rotated_adsorbate.set_positions(rotated_positions[index])
+                rotated_adsorbates[index] = rotated_adsorbate
 
             return rotated_adsorbates
 
@@ -159,10 +189,10 @@ class AdsorbateGenerator:
 
         for name, atoms in adsorbate_dict.items():
             # Generate rotated Atoms
-            rotated_atoms_list = self._generate_rotations(atoms)
+            rotated_atoms_dict = self._generate_rotations(atoms)
 
-            # Generate name names (for easy POSCAR output)
-            for i, rotated_atoms in enumerate(rotated_atoms_list):
+            # Generate name names (for easy POSCAR output), keeping the orientation index of pruned rotations
+            for i, rotated_atoms in rotated_atoms_dict.items():
                 new_name = f"{name}_rotation_{i}"
                 rotated_adsorbate_dict[new_name] = rotated_atoms
 
@@ -170,7 +200,7 @@ class AdsorbateGenerator:
 
     def _load_adsorbate_from_database_header(self) -> Dict[str, Atoms]:
         """
-        Load adsorbate from POSCARs based on database pathway header dict.
+        Load adsorbates based on database pathway header dict, from the pre-extracted coordinates of the database index.
 
         Returns:
             Dict: A dictionary of loaded adsorbate POSCARs.
@@ -192,11 +222,14 @@ class AdsorbateGenerator:
                 raise ValueError(f"Discontinuous reaction step {i} detected in adsorbate header.")
             else:
                 name = self.adsorbate_header_dict[step_key]["name"]
-                # Load POSCAR
-                adsorbate_POSCARs[name] = self._extract_atoms(
-                    POSCAR_adsorbate=self.path / self.adsorbate_header_dict[step_key]["POSCAR_path"],
+                # Load pre-extracted adsorbate
+                adsorbate_POSCARs[name] = get_adsorbate(
+                    self.database_index,
+                    poscar_path=self.adsorbate_header_dict[step_key]["POSCAR_path"],
                     atom_indexes=self.adsorbate_header_dict[step_key]["adsorbate_atoms"]
                     )
+                if len(adsorbate_POSCARs[name]) >= 10:
+                    warnings.warn("Large adsorbate requested (more than 10 atoms). Make sure this is intended.")
 
         return adsorbate_POSCARs
 
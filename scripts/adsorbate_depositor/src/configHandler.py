@@ -5,6 +5,8 @@ from pathlib import Path
 import yaml
 import shutil
 
+from .parameter_sweep import expand_parameter
+
 class ConfigHandler:
     """
     Class to handle operations related to the config.yaml file.
@@ -67,10 +69,25 @@ class ConfigHandler:
         # Check "substrate" tags
         substrate = config_data.get('substrate', {})
         sites = substrate.get('sites', [])
-        for site in sites:
-            site_keys = [int(k) for k in site.split('_') if k.isdigit()]
-            if len(site_keys) < 1:
-                raise ValueError(f"Invalid value for site key {site}. Should contain at least one integer.")
+        if isinstance(sites, str):
+            if sites != "auto":
+                raise ValueError(f"Invalid value for sites {sites}. Should be a list of site keys or \"auto\".")
+        else:
+            for site in sites:
+                site_keys = [int(k) for k in site.split('_') if k.isdigit()]
+                if len(site_keys) < 1:
+                    raise ValueError(f"Invalid value for site key {site}. Should contain at least one integer.")
+
+        surface_tolerance = substrate.get('surface_tolerance', 0.5)
+        if not isinstance(surface_tolerance, (int, float)) or surface_tolerance <= 0:
+            raise ValueError("Invalid surface_tolerance value. It should be a positive float/int.")
+
+        if not isinstance(substrate.get('symmetry_reduce', False), bool):
+            raise ValueError("Invalid symmetry_reduce value. It should be a boolean.")
+
+        symprec = substrate.get('symprec', 0.1)
+        if not isinstance(symprec, (int, float)) or symprec <= 0:
+            raise ValueError("Invalid symprec value. It should be a positive float/int.")
 
         # Check "adsorbate" tags
         adsorbate = config_data.get('adsorbate', {})
@@ -91,6 +108,21 @@ class ConfigHandler:
         if not isinstance(rotation, bool):
             raise ValueError("Invalid rotation value. It should be a boolean.")
 
+        if adsorbate.get('rotation_method', "fixed") not in ["fixed", "uniform", "quasi_random", "azimuthal"]:
+            raise ValueError("Invalid rotation_method value. It should be 'fixed', 'uniform', 'quasi_random' or 'azimuthal'.")
+
+        rotation_count = adsorbate.get('rotation_count', 6)
+        if not isinstance(rotation_count, int) or isinstance(rotation_count, bool) or rotation_count < 1:
+            raise ValueError("Invalid rotation_count value. It should be a positive integer.")
+
+        rotation_seed = adsorbate.get('rotation_seed', None)
+        if rotation_seed is not None and (not isinstance(rotation_seed, int) or isinstance(rotation_seed, bool) or rotation_seed < 0):
+            raise ValueError("Invalid rotation_seed value. It should be a non-negative integer.")
+
+        rmsd_threshold = adsorbate.get('rmsd_threshold', None)
+        if rmsd_threshold is not None and (not isinstance(rmsd_threshold, (int, float)) or rmsd_threshold < 0):
+            raise ValueError("Invalid rmsd_threshold value. It should be a non-negative float/int.")
+
         # Check POSCAR mode tags
         if source == "POSCAR":
             if not all(isinstance(index, int) and index >= 1 for index in atom_indexes):
@@ -107,10 +139,55 @@ class ConfigHandler:
 
         # Check "deposit" tags
         deposit = config_data.get('deposit', {})
-        distance = deposit.get('distance', None)
 
-        if not isinstance(distance, (int, float)) or distance < 0:
-            raise ValueError("Invalid distance value. It should be a non-negative float/int.")
+        # Distance and vacuum layer can be swept (number, list or range)
+        expand_parameter(deposit.get('distance', None), "distance")
+        expand_parameter(deposit.get('target_vacuum_layer', None), "target_vacuum_layer")
+
+        workers = deposit.get('workers', 1)
+        if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+            raise ValueError("Invalid workers value. It should be a positive integer.")
+
+        clash_distance = deposit.get('clash_distance', None)
+        if clash_distance is not None and (not isinstance(clash_distance, (int, float)) or clash_distance <= 0):
+            raise ValueError("Invalid clash_distance value. It should be a positive float/int.")
+
+        if not isinstance(deposit.get('deduplicate', False), bool):
+            raise ValueError("Invalid deduplicate value. It should be a boolean.")
+
+        deduplicate_tolerance = deposit.get('deduplicate_tolerance', 0.1)
+        if not isinstance(deduplicate_tolerance, (int, float)) or deduplicate_tolerance <= 0:
+            raise ValueError("Invalid deduplicate_tolerance value. It should be a positive float/int.")
+
+        if deposit.get('output_format', "vasp") not in ["vasp", "extxyz", "db"]:
+            raise ValueError("Invalid output_format value. It should be 'vasp', 'extxyz' or 'db'.")
+
+        if not isinstance(deposit.get('resume', False), bool):
+            raise ValueError("Invalid resume value. It should be a boolean.")
+
+        if deposit.get('resume', False) and deposit.get('output_format', "vasp") != "vasp":
+            raise ValueError("Resume is only supported for the 'vasp' output_format.")
+
+        if not isinstance(deposit.get('bonding_graph', False), bool):
+            raise ValueError("Invalid bonding_graph value. It should be a boolean.")
+
+        # Check optional "coverage" tags
+        coverage = config_data.get('coverage', None)
+        if coverage is not None:
+            n_adsorbates = coverage.get('adsorbates', None)
+            n_adsorbates = n_adsorbates if isinstance(n_adsorbates, list) else [n_adsorbates]
+            if not all(isinstance(n, int) and not isinstance(n, bool) and n >= 1 for n in n_adsorbates):
+                raise ValueError("Invalid coverage adsorbates value. It should be a positive integer or a list of positive integers.")
+
+            min_separation = coverage.get('min_separation', None)
+            if not isinstance(min_separation, (int, float)) or min_separation < 0:
+                raise ValueError("Invalid coverage min_separation value. It should be a non-negative float/int.")
+
+            if not isinstance(coverage.get('symmetry_reduce', True), bool):
+                raise ValueError("Invalid coverage symmetry_reduce value. It should be a boolean.")
+
+            if substrate.get('symmetry_reduce', False):
+                raise ValueError("Site symmetry_reduce cannot be combined with coverage, all sites are needed to build combinations. Use coverage symmetry_reduce instead.")
 
     def load_config(self) -> dict:
         """
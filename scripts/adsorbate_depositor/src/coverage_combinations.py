@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, List, Tuple
+import numpy as np
+from ase import Atoms
+
+from .minimum_image_distance import minimum_image_vectors
+from .site_symmetry import map_sites
+
+def _site_separations(substrate: Atoms, positions: np.ndarray) -> np.ndarray:
+    """
+    Compute the minimum-image distances between all pairs of sites.
+
+    Args:
+        substrate (Atoms): The substrate slab.
+        positions (np.ndarray): (S, 3) Cartesian site positions.
+
+    Returns:
+        np.ndarray: (S, S) site-site distances in Å, along the periodic in-plane cell vectors.
+    """
+    pbc = substrate.get_pbc() & np.array([True, True, False])
+    vectors = minimum_image_vectors(positions[:, None, :] - positions[None, :, :], cell=substrate.get_cell().array, pbc=pbc)
+    return np.linalg.norm(vectors, axis=2)
+
+def enumerate_site_combinations(substrate: Atoms, sites: Dict[str, List[float]], n_adsorbates: int, min_separation: float, symmetry_reduce: bool = True, symprec: float = 0.1) -> List[Tuple[str, ...]]:
+    """
+    Enumerate the sets of sites that can be occupied at once by several identical adsorbates.
+
+    Combinations are built depth-first in site order. The candidates for the next site are narrowed down
+    at every step to the sites far enough from all sites already chosen, so incompatible branches are
+    never expanded. With symmetry reduction, a combination is only kept if it is the lexicographically
+    smallest among its images under the surface symmetry operations.
+
+    Args:
+        substrate (Atoms): The substrate slab.
+        sites (Dict[str, List[float]]): Site positions keyed by site name, e.g. from `SiteGenerator.generate`.
+        n_adsorbates (int): Number of adsorbates per cell (sites per combination).
+        min_separation (float): Minimum distance in Å between two occupied sites, periodic images included.
+        symmetry_reduce (bool, optional): Whether to skip arrangements equivalent under the surface symmetry. Defaults to True.
+        symprec (float, optional): Symmetry search and site matching tolerance in Å. Defaults to 0.1.
+
+    Returns:
+        List[Tuple[str, ...]]: Combinations of site names, each in site order.
+
+    Raises:
+        ValueError: If the number of adsorbates is not a positive integer or the separation is negative.
+
+    Notes:
+        - Symmetry operations mapping a site outside the given site list are ignored,
+          so all sites (not only symmetry-unique ones) should be given.
+    """
+    if not isinstance(n_adsorbates, int) or n_adsorbates < 1:
+        raise ValueError(f"Expected a positive number of adsorbates, but got {n_adsorbates}.")
+    if min_separation < 0:
+        raise ValueError(f"Expected a non-negative separation, but got {min_separation}.")
+
+    names = list(sites)
+    positions = np.array([sites[name] for name in names], dtype=float)
+    compatible = _site_separations(substrate, positions) >= min_separation
+    np.fill_diagonal(compatible, False)
+
+    # Site permutations of the operations mapping all sites onto listed sites
+    if symmetry_reduce:
+        mapping = map_sites(substrate, positions, symprec)
+        mapping = mapping[np.all(mapping >= 0, axis=1)]
+
+    combinations = []
+
+    def is_canonical(combination: Tuple[int, ...]) -> bool:
+        images = np.sort(mapping[:, combination], axis=1)
+        smallest = images[np.lexsort(images.T[::-1])[0]]
+        return tuple(smallest) == combination
+
+    def extend(combination: Tuple[int, ...], candidates: np.ndarray) -> None:
+        if len(combination) == n_adsorbates:
+            if not symmetry_reduce or is_canonical(combination):
+                combinations.append(tuple(names[index] for index in combination))
+            return
+
+        for position, site in enumerate(candidates):
+            remaining = candidates[position + 1:]
+            if len(remaining) < n_adsorbates - len(combination) - 1:
+                break
+            extend(combination + (int(site), ), remaining[compatible[site, remaining]])
+
+    extend((), np.arange(len(names)))
+
+    return combinations
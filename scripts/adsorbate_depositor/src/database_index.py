@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, List
+from pathlib import Path
+import json
+import os
+import warnings
+import yaml
+from ase import Atoms
+from ase.io import read
+
+from .parse_adsorbate_database import validate_pathways
+
+# Compiled index stored next to the database header, rebuilt whenever a source file changes
+INDEX_FILENAME = ".pathway_database_index.json"
+INDEX_VERSION = 2
+
+# Errors kept in the index for adsorbates that cannot be extracted, raised when the adsorbate is requested
+INDEX_ERRORS = {"FileNotFoundError": FileNotFoundError, "ValueError": ValueError}
+
+def _stat_sources(path: Path, sources: List[str]) -> Dict[str, List[int]]:
+    """
+    Record modification time and size of database source files.
+
+    Args:
+        path (Path): The database directory.
+        sources (List[str]): Source file paths, relative to the database directory.
+
+    Returns:
+        Dict[str, List[int]]: [mtime in ns, size in bytes] of each source file, None for missing files.
+    """
+    stats = {}
+    for source in sources:
+        try:
+            stat = (path / source).stat()
+            stats[source] = [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            stats[source] = None
+    return stats
+
+def _adsorbate_key(poscar_path: str, atom_indexes: List[int]) -> str:
+    """
+    Build the index key of an extracted adsorbate.
+
+    Args:
+        poscar_path (str): The POSCAR path as written in the header.
+        atom_indexes (List[int]): Adsorbate atom indexes (1-based indexing).
+
+    Returns:
+        str: The key, e.g. "./POSCAR_CO:96,101".
+    """
+    return f"{poscar_path}:{','.join(str(index) for index in atom_indexes)}"
+
+def build_database_index(path: Path, header: str = "pathway_database_header.yaml") -> dict:
+    """
+    Parse and validate a database header and extract every adsorbate it refers to.
+
+    A missing or unreadable POSCAR, or an out-of-range adsorbate index, does not stop the compilation:
+    the error is kept in the entry of the adsorbate and only raised by `get_adsorbate`, so that a broken
+    pathway does not prevent running the other pathways of the database.
+
+    Args:
+        path (Path): The database directory.
+        header (str, optional): The name of the YAML header file. Defaults to "pathway_database_header.yaml".
+
+    Returns:
+        dict: The index, holding the validated pathways, the extracted adsorbates (symbols, positions, cell, pbc,
+            or error type and message) keyed by POSCAR path and atom indexes, and the modification time and size of every source file.
+
+    Raises:
+        FileNotFoundError: If the header does not exist.
+        ValueError: If the header is invalid.
+    """
+    header_path = path / header
+    if not header_path.is_file():
+        raise FileNotFoundError(f"The header YAML file {header_path} does not exist.")
+
+    with header_path.open("r", encoding="utf-8") as f:
+        pathways = validate_pathways(yaml.safe_load(f))
+
+    # Extract adsorbates, reading each POSCAR once
+    adsorbates = {}
+    poscars = {}
+    for steps in pathways.values():
+        for step_key, step_data in steps.items():
+            if not step_key.startswith("step_"):
+                continue
+
+            poscar_path = step_data["POSCAR_path"]
+            atom_indexes = step_data["adsorbate_atoms"]
+            key = _adsorbate_key(poscar_path, atom_indexes)
+            if key in adsorbates:
+                continue
+
+            if poscar_path not in poscars:
+                if not (path / poscar_path).is_file():
+                    poscars[poscar_path] = FileNotFoundError(f"Adsorbate POSCAR file {path / poscar_path} not found.")
+                else:
+                    try:
+                        poscars[poscar_path] = read(path / poscar_path, format="vasp")
+                    except Exception as exc:
+                        poscars[poscar_path] = ValueError(f"Cannot read adsorbate POSCAR file {path / poscar_path}: {exc}")
+            poscar = poscars[poscar_path]
+
+            if isinstance(poscar, Exception):
+                adsorbates[key] = {"error": type(poscar).__name__, "message": str(poscar)}
+                continue
+
+            illegal = [index for index in atom_indexes if index not in range(1, len(poscar) + 1)]
+            if illegal:
+                adsorbates[key] = {"error": "ValueError", "message": f"Illegal adsorbate index \"{illegal[0]}\" (indexing starts from 1) for {poscar_path}."}
+                continue
+
+            adsorbate = poscar[[index - 1 for index in atom_indexes]]
+            adsorbates[key] = {
+                "symbols": adsorbate.get_chemical_symbols(),
+                "positions": adsorbate.get_positions().tolist(),
+                "cell": adsorbate.get_cell().array.tolist(),
+                "pbc": adsorbate.get_pbc().tolist(),
+            }
+
+    return {
+        "version": INDEX_VERSION,
+        "header": header,
+        "sources": _stat_sources(path, [header] + sorted(poscars)),
+        "pathways": pathways,
+        "adsorbates": adsorbates,
+    }
+
+def _is_up_to_date(path: Path, index: dict, header: str) -> bool:
+    """
+    Check if a compiled index still matches its source files.
+
+    Args:
+        path (Path): The database directory.
+        index (dict): The loaded index.
+        header (str): The name of the YAML header file.
+
+    Returns:
+        bool: True if the index format, header name and every source file are unchanged.
+    """
+    if index.get("version") != INDEX_VERSION or index.get("header") != header:
+        return False
+
+    sources = index.get("sources", {})
+    return _stat_sources(path, list(sources)) == sources
+
+def load_database_index(path: Path, header: str = "pathway_database_header.yaml") -> dict:
+    """
+    Load the compiled index of a database directory, rebuilding it if any source file changed.
+
+    Args:
+        path (Path): The database directory.
+        header (str, optional): The name of the YAML header file. Defaults to "pathway_database_header.yaml".
+
+    Returns:
+        dict: The index, see `build_database_index`.
+    """
+    index_path = path / INDEX_FILENAME
+
+    if index_path.is_file():
+        try:
+            with index_path.open("r", encoding="utf-8") as f:
+                index = json.load(f)
+            if _is_up_to_date(path, index, header):
+                return index
+        except (json.JSONDecodeError, OSError):
+            pass  # unreadable index, rebuild
+
+    index = build_database_index(path, header)
+
+    # Write atomically, so that concurrent runs never read a partial index
+    temp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    try:
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(temp_path, index_path)
+    except OSError as exc:
+        warnings.warn(f"Cannot write database index {index_path} ({exc}), it would be rebuilt on every run.")
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return index
+
+def get_pathway(index: dict, pathway_name: str) -> dict:
+    """
+    Get the steps of a pathway from a database index.
+
+    Args:
+        index (dict): The database index.
+        pathway_name (str): The name of the pathway.
+
+    Returns:
+        dict: The pathway, as in the database header.
+
+    Raises:
+        ValueError: If the pathway does not exist.
+    """
+    pathway_dict = index["pathways"].get(pathway_name, None)
+    if pathway_dict is None:
+        raise ValueError(f"Pathway {pathway_name} does not exist in the database.")
+
+    return pathway_dict
+
+def get_adsorbate(index: dict, poscar_path: str, atom_indexes: List[int]) -> Atoms:
+    """
+    Build the pre-extracted adsorbate of a pathway step from a database index.
+
+    Args:
+        index (dict): The database index.
+        poscar_path (str): The POSCAR path as written in the header.
+        atom_indexes (List[int]): Adsorbate atom indexes (1-based indexing).
+
+    Returns:
+        Atoms: A new Atoms object of the adsorbate atoms, in the order of `atom_indexes`.
+
+    Raises:
+        KeyError: If the adsorbate is not in the index.
+        FileNotFoundError: If the POSCAR file of the adsorbate does not exist.
+        ValueError: If the POSCAR file cannot be read or an adsorbate index is out of range.
+    """
+    entry = index["adsorbates"][_adsorbate_key(poscar_path, atom_indexes)]
+    if "error" in entry:
+        raise INDEX_ERRORS.get(entry["error"], ValueError)(entry["message"])
+    return Atoms(entry["symbols"], positions=entry["positions"], cell=entry["cell"], pbc=entry["pbc"])
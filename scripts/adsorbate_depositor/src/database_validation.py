@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from pathlib import Path
+import re
+import numpy as np
+import yaml
+from ase import Atoms
+from ase.io import read
+
+from .parse_adsorbate_database import validate_pathways
+
+def _adsorbate_fingerprint(adsorbate: Atoms) -> Tuple[tuple, np.ndarray]:
+    """
+    Describe an adsorbate geometry independently of its position and atom ordering.
+
+    Args:
+        adsorbate (Atoms): The extracted adsorbate atoms.
+
+    Returns:
+        Tuple[tuple, np.ndarray]: The sorted chemical symbols and the sorted minimum-image interatomic distances.
+    """
+    symbols = tuple(sorted(adsorbate.get_chemical_symbols()))
+    if len(adsorbate) < 2:
+        return symbols, np.zeros(0)
+
+    distances = adsorbate.get_all_distances(mic=bool(adsorbate.pbc.any()))
+    return symbols, np.sort(distances[np.triu_indices(len(adsorbate), k=1)])
+
+def _check_step(folder: Path, label: str, step_data: dict, poscars: Dict[str, Atoms], errors: List[str]) -> Atoms:
+    """
+    Check a pathway step against its POSCAR and extract the adsorbate.
+
+    Args:
+        folder (Path): The database folder.
+        label (str): Step label for messages, e.g. "pathway_1/step_2".
+        step_data (dict): The step, as in the header.
+        poscars (Dict[str, Atoms]): Parsed POSCARs keyed by header path, filled on first use.
+        errors (List[str]): Error messages, appended to.
+
+    Returns:
+        Atoms: The adsorbate atoms, None if the step cannot be extracted.
+    """
+    if not isinstance(step_data, dict):
+        errors.append(f"{label} is not a mapping.")
+        return None
+
+    name = step_data.get("name")
+    if not name:
+        errors.append(f"{label} has no name.")
+    elif "*" in str(name):
+        errors.append(f"Name {name} of {label} has asterisk *.")
+
+    poscar_path = step_data.get("POSCAR_path")
+    adsorbate_atoms = step_data.get("adsorbate_atoms") or []
+    reference_atoms = step_data.get("reference_atoms") or []
+
+    if not poscar_path:
+        errors.append(f"{label} has no POSCAR_path.")
+        return None
+
+    if poscar_path not in poscars:
+        try:
+            poscars[poscar_path] = read(folder / poscar_path, format="vasp")
+        except FileNotFoundError:
+            poscars[poscar_path] = None
+            errors.append(f"POSCAR {poscar_path} of {label} not found.")
+        except Exception as exc:
+            poscars[poscar_path] = None
+            errors.append(f"Failed to read POSCAR {poscar_path} of {label} ({exc}).")
+    poscar = poscars[poscar_path]
+    if poscar is None:
+        return None
+
+    valid = True
+    for field, indexes in (("adsorbate_atoms", adsorbate_atoms), ("reference_atoms", reference_atoms)):
+        illegal = [index for index in indexes if isinstance(index, bool) or not isinstance(index, int) or index not in range(1, len(poscar) + 1)]
+        if illegal:
+            errors.append(f"Illegal {field} {illegal} in {label} (indexing starts from 1, {poscar_path} has {len(poscar)} atoms).")
+            valid = False
+
+    missing = sorted(set(reference_atoms) - set(adsorbate_atoms), key=str)
+    if missing:
+        errors.append(f"reference_atoms {missing} of {label} are not in adsorbate_atoms.")
+        valid = False
+
+    if not valid or not adsorbate_atoms:
+        return None
+
+    return poscar[[index - 1 for index in adsorbate_atoms]]
+
+def check_database_folder(folder: Path, header: str = "pathway_database_header.yaml", tolerance: float = 0.01) -> dict:
+    """
+    Check every pathway of a database folder, parsing each referenced POSCAR once.
+
+    The checks are:
+        - header rules of `validate_pathways` (continuous pathway/step indexing, unique names, index lists).
+        - no asterisk in step names.
+        - each POSCAR exists and can be read, and the adsorbate/reference atom indexes are within it.
+        - element consistency: steps sharing a name have the same composition.
+        - duplicate geometries: steps with a different name but the same adsorbate geometry (within `tolerance`) are reported as warnings.
+
+    Args:
+        folder (Path): The database folder.
+        header (str, optional): The name of the YAML header file. Defaults to "pathway_database_header.yaml".
+        tolerance (float, optional): Largest interatomic distance difference in Å of duplicate geometries. Defaults to 0.01.
+
+    Returns:
+        dict: The folder report, with "folder", "passed", "pathways", "steps", "poscars", "errors" and "warnings".
+    """
+    report = {"folder": str(folder), "passed": False, "pathways": 0, "steps": 0, "poscars": 0, "errors": [], "warnings": []}
+    errors, warnings = report["errors"], report["warnings"]
+
+    header_path = folder / header
+    if not header_path.is_file():
+        errors.append(f"{folder} does not contain a {header}.")
+        return report
+
+    try:
+        with header_path.open("r", encoding="utf-8") as f:
+            database_dict = yaml.safe_load(f)
+    except yaml.YAMLError as exc:
+        mark = getattr(exc, "problem_mark", None)
+        position = f" (Line:{mark.line + 1}, Column:{mark.column + 1})" if mark else ""
+        errors.append(f"Failed to read {header_path}{position}.")
+        return report
+
+    if not isinstance(database_dict, dict) or not isinstance(database_dict.get("pathways"), dict):
+        errors.append(f"{header_path} has no pathways mapping.")
+        return report
+
+    try:
+        validate_pathways(database_dict)
+    except (ValueError, TypeError, AttributeError) as exc:
+        errors.append(f"{header}: {exc}")
+
+    # Per-step checks, all steps even after a header error so that every problem is reported at once
+    poscars = {}
+    compositions = {}
+    geometries = []
+    for pathway_key, steps in database_dict["pathways"].items():
+        report["pathways"] += 1
+        if not isinstance(steps, dict):
+            errors.append(f"{pathway_key} is not a mapping.")
+            continue
+
+        for step_key, step_data in steps.items():
+            if not re.match(r"step_\d+", str(step_key)):
+                continue
+            report["steps"] += 1
+
+            label = f"{pathway_key}/{step_key}"
+            adsorbate = _check_step(folder, label, step_data, poscars, errors)
+            if adsorbate is None:
+                continue
+
+            name = step_data.get("name")
+            formula = adsorbate.get_chemical_formula()
+            if name in compositions and compositions[name][0] != formula:
+                errors.append(f"Step name {name} is {formula} in {label} but {compositions[name][0]} in {compositions[name][1]}.")
+            compositions.setdefault(name, (formula, label))
+
+            symbols, distances = _adsorbate_fingerprint(adsorbate)
+            for other_name, other_label, other_symbols, other_distances in geometries:
+                if other_name != name and other_symbols == symbols and np.allclose(distances, other_distances, rtol=0, atol=tolerance):
+                    warnings.append(f"{label} ({name}) duplicates the geometry of {other_label} ({other_name}).")
+                    break
+            geometries.append((name, label, symbols, distances))
+
+    report["poscars"] = sum(1 for poscar in poscars.values() if poscar is not None)
+    report["passed"] = not errors
+    return report
+
+def check_database(database_dir: Path, header: str = "pathway_database_header.yaml", workers: int = 1, tolerance: float = 0.01) -> dict:
+    """
+    Check every database folder of a database directory, one folder per worker process.
+
+    Args:
+        database_dir (Path): The directory holding one folder per reaction.
+        header (str, optional): The name of the YAML header file. Defaults to "pathway_database_header.yaml".
+        workers (int, optional): Number of worker processes. Defaults to 1 (serial).
+        tolerance (float, optional): Duplicate geometry tolerance in Å. Defaults to 0.01.
+
+    Returns:
+        dict: The report, with "database_dir", "header", "passed" (True if every folder passed) and "folders" (per-folder reports, sorted by folder).
+
+    Raises:
+        FileNotFoundError: If the database directory does not exist.
+        ValueError: If the worker count is not positive.
+    """
+    if not database_dir.is_dir():
+        raise FileNotFoundError(f"Database directory {database_dir} does not exist.")
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"Expected a positive number of workers, but got {workers}.")
+
+    folders = sorted(folder for folder in database_dir.iterdir() if folder.is_dir() and not folder.name.startswith((".", "__")))
+
+    if workers == 1 or len(folders) < 2:
+        reports = [check_database_folder(folder, header, tolerance) for folder in folders]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(folders))) as executor:
+            reports = list(executor.map(check_database_folder, folders, [header] * len(folders), [tolerance] * len(folders)))
+
+    return {
+        "database_dir": str(database_dir),
+        "header": header,
+        "passed": all(report["passed"] for report in reports),
+        "folders": reports,
+    }
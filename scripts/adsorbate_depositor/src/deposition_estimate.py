@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, List, Tuple
+from pathlib import Path
+import inspect
+import pickle
+import tempfile
+import time
+import tracemalloc
+import warnings
+import numpy as np
+
+from .adsorbateDepositor import AdsorbateDepositor
+from .structureDeduplicator import StructureDeduplicator
+
+# Deposit options of an actual run that are not set by the configuration (defaults of `AdsorbateDepositor.iter_deposit`)
+DEPOSIT_DEFAULTS = {name: parameter.default for name, parameter in inspect.signature(AdsorbateDepositor.iter_deposit).parameters.items()
+                    if name in ("auto_offset_along_z", "offset_threshold")}
+
+def _format_bytes(size: float) -> str:
+    """
+    Format a size in bytes with a binary unit.
+
+    Args:
+        size (float): The size in bytes.
+
+    Returns:
+        str: The formatted size, e.g. "12.3 MiB".
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+def _format_duration(seconds: float) -> str:
+    """
+    Format a duration in seconds.
+
+    Args:
+        seconds (float): The duration in seconds.
+
+    Returns:
+        str: The formatted duration, e.g. "2.5 min".
+    """
+    if seconds < 120:
+        return f"{seconds:.1f} s"
+    elif seconds < 7200:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
+
+def _select_sample(tasks: List[Tuple[Tuple[str, ...], str, str]], sample_size: int) -> List[Tuple[Tuple[str, ...], str, str]]:
+    """
+    Pick tasks evenly spread over the planned ones, so that the sample covers all sites and adsorbates.
+
+    Args:
+        tasks (List[Tuple[Tuple[str, ...], str, str]]): The planned (site names, adsorbate name, adsorbate reference name) tuples.
+        sample_size (int): Maximum number of tasks in the sample.
+
+    Returns:
+        List[Tuple[Tuple[str, ...], str, str]]: The sampled tasks.
+    """
+    if len(tasks) <= sample_size:
+        return tasks
+    return [tasks[index] for index in np.unique(np.linspace(0, len(tasks) - 1, sample_size).round().astype(int))]
+
+def estimate_deposition(depositor: AdsorbateDepositor, rotation_generated: bool, fix_substrate: bool = False, target_vacuum_layer: float = 10.0,
+                        workers: int = 1, clash_distance: float = None, site_combinations: List[Tuple[str, ...]] = None,
+                        output_format: str = "vasp", deduplicate: bool = False, deduplicate_tolerance: float = 0.1,
+                        bonding_graph: bool = False, sample_size: int = 20, tasks_in_flight_per_worker: int = 4) -> dict:
+    """
+    Estimate the output of a deposition run from a small sample, without writing to the output directory.
+
+    All (site, adsorbate) pairs are planned (with clash pruning), a sample of them is deposited and written
+    to a temporary directory, and the measurements are projected to the full run:
+        - structures: planned pairs, scaled when deduplicating by the unique fraction of all the pairs of the first adsorbate
+          (orientation), deposited for this purpose since duplicates are rarely caught in a sparse sample.
+        - disk: size of the written sample, per structure.
+        - peak memory: traced allocations of one deposition, plus the structures waiting to be written
+          and, in parallel runs, one copy of the depositor per worker (excluding interpreter overhead).
+        - wall time: mean deposition time per pair divided by the worker count (ideal scaling),
+          plus the mean writing time per structure kept after deduplication.
+
+    Args:
+        depositor (AdsorbateDepositor): The depositor, as for the actual run.
+        rotation_generated (bool): Whether rotated adsorbates are generated.
+        fix_substrate (bool, optional): Whether to fix the substrate atoms. Defaults to False.
+        target_vacuum_layer (float, optional): Final vacuum layer thickness in Å. Defaults to 10.0.
+        workers (int, optional): Number of worker processes of the actual run. Defaults to 1.
+        clash_distance (float, optional): Clash pruning distance in Å. Defaults to None.
+        site_combinations (List[Tuple[str, ...]], optional): Sets of sites occupied at once. Defaults to None.
+        output_format (str, optional): Output format of the actual run. Defaults to "vasp".
+        deduplicate (bool, optional): Whether duplicated structures are dropped. Defaults to False.
+        deduplicate_tolerance (float, optional): Deduplication tolerance in Å. Defaults to 0.1.
+        bonding_graph (bool, optional): Whether bonding graphs are built and saved. Defaults to False.
+        sample_size (int, optional): Maximum number of sampled pairs. Defaults to 20.
+        tasks_in_flight_per_worker (int, optional): Pending tasks per worker in parallel runs. Defaults to 4.
+
+    Returns:
+        dict: The estimates: "pairs", "structures", "disk_bytes", "peak_memory_bytes", "wall_time_s", and "sample_size".
+
+    Raises:
+        ValueError: If the sample size is not positive.
+    """
+    if not isinstance(sample_size, int) or sample_size < 1:
+        raise ValueError(f"Expected a positive sample size, but got {sample_size}.")
+
+    tasks = depositor.plan_tasks(rotation_generated, clash_distance, site_combinations)
+    n_sites = len({task[0] for task in tasks})
+    n_adsorbates = len({task[2] for task in tasks})
+    n_orientations = len({task[1] for task in tasks})
+    print(f"Estimate: {n_sites} site sets x {n_orientations} adsorbate orientations ({n_adsorbates} adsorbates) -> {len(tasks)} (site, adsorbate) pairs.")
+
+    if not tasks:
+        return {"pairs": 0, "structures": 0, "disk_bytes": 0, "peak_memory_bytes": 0, "wall_time_s": 0.0, "sample_size": 0}
+
+    sample = _select_sample(tasks, sample_size)
+    options = {
+        **DEPOSIT_DEFAULTS,
+        "fix_substrate": fix_substrate,
+        "target_vacuum_layer": target_vacuum_layer,
+    }
+    if bonding_graph:
+        options["bonding_graph"] = True
+
+    # Time the sampled depositions (auto-offset warnings are expected and muted)
+    structures = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        for site_names, ads_name, ads_ref_tag in sample:
+            structures.append((f"{'+'.join(site_names)}_{ads_name}", depositor._deposit_task(site_names, ads_name, ads_ref_tag, **options)))
+        deposit_time = (time.perf_counter() - start) / len(sample)
+
+        # Trace the allocations of a single deposition
+        tracemalloc.start()
+        depositor._deposit_task(*sample[0], **options)
+        _, task_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    # Write the sample in the requested format to measure its size and cost
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        depositor.write(structures, output_dir=Path(temp_dir), output_format=output_format)
+        write_time = (time.perf_counter() - start) / len(sample)
+        disk_per_structure = sum(path.stat().st_size for path in Path(temp_dir).rglob("*") if path.is_file()) / len(sample)
+
+    # Unique fraction of all the structures of the first adsorbate, duplicates only occurring within an adsorbate
+    unique_fraction = 1.0
+    dedup_memory = 0
+    if deduplicate:
+        first_tasks = [task for task in tasks if task[1] == tasks[0][1]]
+        deduplicator = StructureDeduplicator(tolerance=deduplicate_tolerance)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            first_structures = ((f"{'+'.join(site_names)}_{ads_name}", depositor._deposit_task(site_names, ads_name, ads_ref_tag, **options)) for site_names, ads_name, ads_ref_tag in first_tasks)
+            unique = sum(1 for _ in deduplicator.filter(first_structures))
+        unique_fraction = unique / len(first_tasks)
+        dedup_memory = deduplicator.description_bytes() / unique
+
+    n_structures = int(round(len(tasks) * unique_fraction))
+    structure_size = sum(array.nbytes for array in structures[0][1].arrays.values())
+
+    # Memory held at once: one deposition per process, the pending structures and the kept dedup descriptions
+    if workers == 1:
+        peak_memory = task_peak + structure_size
+    else:
+        peak_memory = workers * (task_peak + len(pickle.dumps(depositor))) + workers * tasks_in_flight_per_worker * structure_size
+    peak_memory += n_structures * dedup_memory
+
+    disk = n_structures * disk_per_structure
+    wall_time = len(tasks) * deposit_time / workers + n_structures * write_time
+
+    print(f"Estimate: sampled {len(sample)} pairs, {deposit_time * 1e3:.1f} ms per deposition, {write_time * 1e3:.1f} ms per write.")
+    if deduplicate:
+        print(f"Estimate: {unique} of the {len(first_tasks)} structures of {tasks[0][1]} are unique ({unique_fraction:.0%}), assumed for all adsorbates.")
+    print(f"Estimate: {n_structures} structures, {_format_bytes(disk)} on disk ({output_format}), "
+          f"~{_format_bytes(peak_memory)} peak memory, ~{_format_duration(wall_time)} wall time with {workers} worker(s).")
+
+    return {
+        "pairs": len(tasks),
+        "structures": n_structures,
+        "disk_bytes": disk,
+        "peak_memory_bytes": peak_memory,
+        "wall_time_s": wall_time,
+        "sample_size": len(sample),
+    }
+
+def summarize_estimates(estimates: List[dict]) -> Dict[str, float]:
+    """
+    Sum the estimates of the points of a parameter sweep, which are run one after the other, and print the total.
+
+    Args:
+        estimates (List[dict]): The estimates of each point, from `estimate_deposition`.
+
+    Returns:
+        Dict[str, float]: The total "pairs", "structures", "disk_bytes" and "wall_time_s", and the largest "peak_memory_bytes".
+    """
+    total = {key: sum(estimate[key] for estimate in estimates) for key in ("pairs", "structures", "disk_bytes", "wall_time_s")}
+    total["peak_memory_bytes"] = max((estimate["peak_memory_bytes"] for estimate in estimates), default=0)
+
+    print(f"Estimate total over {len(estimates)} sweep points: {total['structures']} structures, {_format_bytes(total['disk_bytes'])} on disk, "
+          f"~{_format_bytes(total['peak_memory_bytes'])} peak memory (largest point), ~{_format_duration(total['wall_time_s'])} wall time.")
+
+    return total
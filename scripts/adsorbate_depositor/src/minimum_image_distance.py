@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from itertools import product
+from typing import Sequence, Tuple
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Above this number of atom pairs the KD-tree search is used instead of the dense all-pairs kernel
+BRUTE_FORCE_PAIR_LIMIT = 100000
+
+def _image_shifts(pbc: np.ndarray) -> np.ndarray:
+    """
+    Generate the lattice shifts of the first neighbouring images along periodic axes.
+
+    Args:
+        pbc (np.ndarray): Boolean periodicity flags of the three cell vectors.
+
+    Returns:
+        np.ndarray: (K, 3) array of integer lattice shifts, the zero shift included.
+    """
+    ranges = [(-1, 0, 1) if periodic else (0, ) for periodic in pbc]
+    return np.array(list(product(*ranges)), dtype=float)
+
+def _is_orthogonal(cell: np.ndarray, pbc: np.ndarray, tolerance: float = 1e-8) -> bool:
+    """
+    Check if the periodic cell vectors are orthogonal to each other and to the remaining vectors.
+
+    Args:
+        cell (np.ndarray): The (3, 3) cell matrix, one lattice vector per row.
+        pbc (np.ndarray): Boolean periodicity flags of the three cell vectors.
+        tolerance (float, optional): Tolerance on the cosine between two vectors. Defaults to 1e-8.
+
+    Returns:
+        bool: True if rounding fractional displacements alone gives the minimum image.
+    """
+    lengths = np.linalg.norm(cell, axis=1)
+    cosines = (cell @ cell.T) / np.outer(lengths, lengths)
+    periodic_rows = cosines[pbc]
+    off_diagonal = periodic_rows[~np.eye(3, dtype=bool)[pbc]]
+    return bool(np.all(np.abs(off_diagonal) < tolerance))
+
+def _minimum_image_squared_norms(frac: np.ndarray, cell: np.ndarray, pbc: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wrap flattened fractional displacements and find the squared norm of their shortest periodic image.
+
+    Args:
+        frac (np.ndarray): (P, 3) array of fractional displacement vectors, modified in place.
+        cell (np.ndarray): The (3, 3) cell matrix, one lattice vector per row.
+        pbc (np.ndarray): Boolean periodicity flags of the three cell vectors.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The (P, 3) rounded displacement vectors, the (P, ) squared norms
+            of their shortest image and the (P, 3) Cartesian correction from the rounded vector to that image.
+    """
+    frac[:, pbc] -= np.round(frac[:, pbc])
+    wrapped = frac @ cell
+    squared = np.einsum("ij,ij->i", wrapped, wrapped)
+
+    if _is_orthogonal(cell, pbc):
+        return wrapped, squared, np.zeros_like(wrapped)
+
+    # For skewed cells rounding is not sufficient, compare the neighbouring images as |d + s|^2 = |d|^2 + 2 d.s + |s|^2
+    shifts = _image_shifts(pbc) @ cell
+    candidates = squared[:, None] + 2 * (wrapped @ shifts.T) + np.einsum("ij,ij->i", shifts, shifts)[None, :]
+    shortest = np.argmin(candidates, axis=1)
+    return wrapped, candidates[np.arange(len(candidates)), shortest], shifts[shortest]
+
+def minimum_image_vectors(vectors: np.ndarray, cell: np.ndarray, pbc: Sequence[bool]) -> np.ndarray:
+    """
+    Wrap Cartesian displacement vectors to their minimum image.
+
+    Args:
+        vectors (np.ndarray): (..., 3) array of Cartesian displacement vectors.
+        cell (np.ndarray): The (3, 3) cell matrix, one lattice vector per row.
+        pbc (Sequence[bool]): Periodicity flags of the three cell vectors.
+
+    Returns:
+        np.ndarray: Displacement vectors of the same shape, each replaced by its shortest periodic image.
+
+    Notes:
+        - For non-orthogonal cells rounding the fractional displacement is not sufficient,
+          so the neighbouring images of the rounded vector are compared as well.
+    """
+    pbc = np.asarray(pbc, dtype=bool)
+    vectors = np.asarray(vectors, dtype=float)
+    if not pbc.any():
+        return vectors
+
+    cell = np.asarray(cell, dtype=float)
+    frac = np.linalg.solve(cell.T, vectors.reshape(-1, 3).T).T
+    wrapped, _, correction = _minimum_image_squared_norms(frac, cell, pbc)
+    return (wrapped + correction).reshape(vectors.shape)
+
+def _brute_force_min_distance(positions_a: np.ndarray, positions_b: np.ndarray, cell: np.ndarray, pbc: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+    """
+    Dense all-pairs minimum-image distance search.
+
+    Args:
+        positions_a (np.ndarray): (M, 3) Cartesian positions of the first group.
+        positions_b (np.ndarray): (N, 3) Cartesian positions of the second group.
+        cell (np.ndarray): The (3, 3) cell matrix.
+        pbc (np.ndarray): Boolean periodicity flags of the three cell vectors.
+
+    Returns:
+        Tuple[float, Tuple[int, int]]: The minimum distance and the (i, j) indices of the closest pair.
+    """
+    if pbc.any():
+        inverse = np.linalg.inv(cell)
+        frac = ((positions_a @ inverse)[:, None, :] - (positions_b @ inverse)[None, :, :]).reshape(-1, 3)
+        _, squared, _ = _minimum_image_squared_norms(frac, cell, pbc)
+    else:
+        displacements = (positions_a[:, None, :] - positions_b[None, :, :]).reshape(-1, 3)
+        squared = np.einsum("ij,ij->i", displacements, displacements)
+
+    i, j = divmod(int(np.argmin(squared)), len(positions_b))
+    return float(np.sqrt(squared[i * len(positions_b) + j])), (i, j)
+
+def _kdtree_min_distance(positions_a: np.ndarray, positions_b: np.ndarray, cell: np.ndarray, pbc: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+    """
+    Minimum-image distance search with a KD-tree built over the periodic images of the second group.
+
+    Args:
+        positions_a (np.ndarray): (M, 3) Cartesian positions of the first group (queries).
+        positions_b (np.ndarray): (N, 3) Cartesian positions of the second group (tree).
+        cell (np.ndarray): The (3, 3) cell matrix.
+        pbc (np.ndarray): Boolean periodicity flags of the three cell vectors.
+
+    Returns:
+        Tuple[float, Tuple[int, int]]: The minimum distance and the (i, j) indices of the closest pair.
+    """
+    if pbc.any():
+        # Wrap both groups into the home cell along periodic axes, then surround the tree with its first images
+        inverse = np.linalg.inv(cell)
+        frac_a = positions_a @ inverse
+        frac_b = positions_b @ inverse
+        frac_a[:, pbc] -= np.floor(frac_a[:, pbc])
+        frac_b[:, pbc] -= np.floor(frac_b[:, pbc])
+        queries = frac_a @ cell
+        images = ((frac_b[None, :, :] + _image_shifts(pbc)[:, None, :]) @ cell).reshape(-1, 3)
+    else:
+        queries = positions_a
+        images = positions_b
+
+    distances, image_indices = cKDTree(images).query(queries, k=1)
+    i = int(np.argmin(distances))
+    return float(distances[i]), (i, int(image_indices[i] % len(positions_b)))
+
+def calculate_min_distance(positions_a: np.ndarray, positions_b: np.ndarray, cell: np.ndarray, pbc: Sequence[bool] = (True, True, False), brute_force_limit: int = BRUTE_FORCE_PAIR_LIMIT) -> Tuple[float, Tuple[int, int]]:
+    """
+    Find the minimum-image distance between two groups of atoms and the pair realising it.
+
+    Args:
+        positions_a (np.ndarray): (M, 3) Cartesian positions of the first group (e.g. adsorbate).
+        positions_b (np.ndarray): (N, 3) Cartesian positions of the second group (e.g. substrate).
+        cell (np.ndarray): The (3, 3) cell matrix, one lattice vector per row.
+        pbc (Sequence[bool], optional): Periodicity flags of the three cell vectors. Defaults to in-plane periodicity only.
+        brute_force_limit (int, optional): Maximum number of pairs for the dense kernel, above which a KD-tree is used.
+
+    Returns:
+        Tuple[float, Tuple[int, int]]: The minimum distance in Å and the (i, j) indices of the closest pair,
+            i indexing positions_a and j indexing positions_b.
+
+    Raises:
+        ValueError: If either group is empty.
+    """
+    positions_a = np.asarray(positions_a, dtype=float).reshape(-1, 3)
+    positions_b = np.asarray(positions_b, dtype=float).reshape(-1, 3)
+    if not len(positions_a) or not len(positions_b):
+        raise ValueError("Cannot calculate minimum distance with an empty group of atoms.")
+
+    pbc = np.asarray(pbc, dtype=bool)
+    cell = np.asarray(cell, dtype=float)
+
+    if len(positions_a) * len(positions_b) <= brute_force_limit:
+        return _brute_force_min_distance(positions_a, positions_b, cell, pbc)
+    else:
+        return _kdtree_min_distance(positions_a, positions_b, cell, pbc)
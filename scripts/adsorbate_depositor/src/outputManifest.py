@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Optional
+from pathlib import Path
+import hashlib
+import json
+import warnings
+
+# Manifest format version, older manifests are discarded
+MANIFEST_VERSION = 1
+
+def hash_file(path: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file.
+
+    Args:
+        path (Path): The file path.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class OutputManifest:
+    """
+    Record which structures of an output directory are complete, so that an interrupted or extended run
+    only regenerates what is missing or changed.
+
+    The manifest is a JSON Lines file in the output directory: a header line with the configuration hash
+    and input file hashes, then one line per written structure with its name and task key
+    (see `AdsorbateDepositor.iter_deposit`). Lines are appended and flushed as soon as each structure is written,
+    so a killed run keeps everything finished before it died. A truncated last line is ignored on load.
+    Structures dropped as duplicates are recorded too, with the name of the structure they duplicate,
+    so that a later run does not generate them again while skipping the structure they were compared with.
+
+    Attributes:
+        path (Path): The manifest file.
+        output_dir (Path): The output directory.
+        filename (str): Filename of each structure in its directory.
+        entries (Dict[str, str]): Task keys of the recorded structures, keyed by structure name.
+        duplicates (Dict[str, str]): Names of the kept structures, keyed by the name of the recorded duplicates.
+        previous_header (dict): The header of the loaded manifest (None if there was none).
+
+    Notes:
+        - Only the one-directory-per-structure ("vasp") output can be extended in place.
+    """
+
+    def __init__(self, output_dir: Path, filename: str = "POSCAR_generated", manifest_name: str = "manifest.jsonl") -> None:
+        """
+        Initialize the OutputManifest, loading the existing manifest of the output directory if any.
+
+        Args:
+            output_dir (Path): The output directory.
+            filename (str, optional): Filename of each structure in its directory. Defaults to "POSCAR_generated".
+            manifest_name (str, optional): The manifest filename. Defaults to "manifest.jsonl".
+        """
+        self.output_dir = output_dir
+        self.filename = filename
+        self.path = output_dir / manifest_name
+        self.entries = {}
+        self.duplicates = {}
+        self.previous_header = None
+        self._file = None
+
+        if self.path.is_file():
+            self._load()
+
+    def _load(self) -> None:
+        """
+        Load the recorded structures, skipping unreadable lines.
+        """
+        with self.path.open("r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        for line_number, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                warnings.warn(f"Skipped unreadable line {line_number + 1} of manifest {self.path}.")
+                continue
+
+            if line_number == 0:
+                if record.get("version") != MANIFEST_VERSION:
+                    warnings.warn(f"Manifest {self.path} has an unsupported format, all structures will be regenerated.")
+                    return
+                self.previous_header = record
+            elif "name" in record and "key" in record:
+                # Later lines override earlier ones
+                self.entries[record["name"]] = record["key"]
+                if record.get("duplicate_of") is not None:
+                    self.duplicates[record["name"]] = record["duplicate_of"]
+                else:
+                    self.duplicates.pop(record["name"], None)
+
+    def completed(self) -> Dict[str, str]:
+        """
+        Get the recorded structures whose output file still exists, and the duplicates of these structures.
+
+        Returns:
+            Dict[str, str]: Task keys keyed by structure name.
+        """
+        written = {name: key for name, key in self.entries.items()
+                   if name not in self.duplicates and (self.output_dir / name / self.filename).is_file()}
+        duplicates = {name: self.entries[name] for name, kept in self.duplicates.items() if kept in written}
+        return {**written, **duplicates}
+
+    def start(self, config_hash: str, inputs: Dict[str, str]) -> None:
+        """
+        Rewrite the manifest with a new header and the completed structures, then keep it open for recording.
+
+        Args:
+            config_hash (str): Hash of the configuration file of this run.
+            inputs (Dict[str, str]): Hashes of the input files, keyed by file name.
+        """
+        if self.previous_header is not None:
+            if self.previous_header.get("config_hash") != config_hash:
+                print("Manifest: configuration changed since the last run, only unchanged structures are reused.")
+            changed = [path for path, digest in inputs.items() if self.previous_header.get("inputs", {}).get(path) != digest]
+            if changed:
+                print(f"Manifest: input files changed since the last run: {', '.join(changed)}.")
+
+        self.entries = self.completed()
+        self.duplicates = {name: kept for name, kept in self.duplicates.items() if name in self.entries}
+        if not self.output_dir.is_dir():
+            self.output_dir.mkdir(parents=True)
+
+        self._file = self.path.open("w", encoding="utf-8")
+        self._append({"version": MANIFEST_VERSION, "config_hash": config_hash, "inputs": inputs})
+        for name, key in self.entries.items():
+            self._append(self._entry(name, key, self.duplicates.get(name)))
+
+    def record(self, name: str, key: str, duplicate_of: Optional[str] = None) -> None:
+        """
+        Record a structure as complete, once its file is written or once it is dropped as a duplicate.
+
+        Args:
+            name (str): The structure name.
+            key (str): The task key of the structure.
+            duplicate_of (str, optional): Name of the kept structure, for a structure dropped as its duplicate. Defaults to None.
+
+        Raises:
+            RuntimeError: If the manifest was not started.
+        """
+        if self._file is None:
+            raise RuntimeError("Manifest not started, call start() first.")
+
+        self.entries[name] = key
+        if duplicate_of is not None:
+            self.duplicates[name] = duplicate_of
+        else:
+            self.duplicates.pop(name, None)
+        self._append(self._entry(name, key, duplicate_of))
+
+    @staticmethod
+    def _entry(name: str, key: str, duplicate_of: Optional[str]) -> dict:
+        """
+        Build the record line of a structure.
+
+        Args:
+            name (str): The structure name.
+            key (str): The task key of the structure.
+            duplicate_of (str, optional): Name of the kept structure for a duplicate, None otherwise.
+
+        Returns:
+            dict: The record.
+        """
+        record = {"name": name, "key": key}
+        if duplicate_of is not None:
+            record["duplicate_of"] = duplicate_of
+        return record
+
+    def close(self) -> None:
+        """
+        Close the manifest file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, record: dict) -> None:
+        """
+        Append a record line and flush it to disk.
+
+        Args:
+            record (dict): The record.
+        """
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Tuple, Union
+import numpy as np
+
+def expand_parameter(value: Union[float, int, list, dict], name: str) -> List[Union[float, int]]:
+    """
+    Expand a swept deposit parameter into its values.
+
+    Accepted forms:
+        - a single number, e.g. `2.0`.
+        - a list of numbers, e.g. `[1.5, 2.0, 3.0]`.
+        - an inclusive range, e.g. `{start: 1.5, stop: 3.0, step: 0.5}`.
+
+    Args:
+        value (Union[float, int, list, dict]): The parameter as written in the configuration.
+        name (str): The parameter name, for error messages.
+
+    Returns:
+        List[Union[float, int]]: The values, in the given order (ascending for ranges). Numbers keep their type
+            (e.g. `5` stays an int), as they enter the task keys of resumable runs.
+
+    Raises:
+        ValueError: If the value is not one of the accepted forms, or any value is not positive.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid {name} value {value}. It should be a number, a list of numbers or a range.")
+
+    if isinstance(value, (int, float)):
+        values = [value]
+
+    elif isinstance(value, list):
+        if not value or any(isinstance(item, bool) or not isinstance(item, (int, float)) for item in value):
+            raise ValueError(f"Invalid {name} list {value}. It should be a non-empty list of numbers.")
+        if len(set(value)) != len(value):
+            raise ValueError(f"Duplicate values found in {name} list {value}.")
+        values = value
+
+    elif isinstance(value, dict):
+        if set(value) != {"start", "stop", "step"} or any(isinstance(item, bool) or not isinstance(item, (int, float)) for item in value.values()):
+            raise ValueError(f"Invalid {name} range {value}. It should have numeric start, stop and step.")
+        if value["step"] <= 0 or value["stop"] < value["start"]:
+            raise ValueError(f"Invalid {name} range {value}. It should have a positive step and stop >= start.")
+
+        # Inclusive stop, rounded so that accumulated float steps give clean values
+        count = int(np.floor((value["stop"] - value["start"]) / value["step"] + 1e-9)) + 1
+        values = [round(value["start"] + index * value["step"], 10) for index in range(count)]
+
+    else:
+        raise ValueError(f"Invalid {name} value {value}. It should be a number, a list of numbers or a range.")
+
+    if any(item <= 0 for item in values):
+        raise ValueError(f"Invalid {name} value {value}. All values should be greater than zero.")
+
+    return list(values)
+
+def sweep_points(distances: List[float], vacuum_layers: List[float]) -> List[Tuple[float, float, str]]:
+    """
+    Build the grid of (distance, vacuum layer) points of a sweep, distances varying slowest.
+
+    Args:
+        distances (List[float]): The deposit distances in Å.
+        vacuum_layers (List[float]): The target vacuum layer thicknesses in Å.
+
+    Returns:
+        List[Tuple[float, float, str]]: (distance, vacuum layer, output subdirectory) of each point.
+            The subdirectory names the swept parameters only, e.g. "distance_2.5", and is empty without sweep.
+    """
+    points = []
+    for distance in distances:
+        for vacuum_layer in vacuum_layers:
+            parts = []
+            if len(distances) > 1:
+                parts.append(f"distance_{distance:g}")
+            if len(vacuum_layers) > 1:
+                parts.append(f"vacuum_{vacuum_layer:g}")
+            points.append((distance, vacuum_layer, "_".join(parts)))
+
+    return points
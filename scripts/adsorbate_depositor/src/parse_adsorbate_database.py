@@ -26,7 +26,27 @@ def parse_adsorbate_database(path: Path, pathway_name: str, header: str = "pathw
     with header_path.open("r", encoding="utf-8") as f:
         database_dict = yaml.safe_load(f)
 
-    # Validate the loaded dictionary
+    pathways = validate_pathways(database_dict)
+
+    pathway_dict = pathways.get(pathway_name, None)
+    if pathway_dict is None:
+        raise ValueError(f"Pathway {pathway_name} does not exist in the database.")
+
+    return pathway_dict
+
+def validate_pathways(database_dict: dict) -> dict:
+    """
+    Validates the pathways of a loaded database header.
+
+    Args:
+        database_dict (dict): The loaded YAML header.
+
+    Returns:
+        dict: The validated pathways, keyed by pathway name.
+
+    Raises:
+        ValueError: If pathways or steps are missing, discontinuously indexed or inconsistent.
+    """
     pathways = database_dict.get('pathways', {})
 
     if not pathways:
@@ -68,8 +88,4 @@ def parse_adsorbate_database(path: Path, pathway_name: str, header: str = "pathw
                 if any(isinstance(x, int) and x < 0 for x in adsorbate_atoms) or any(isinstance(x, int) and x < 0 for x in reference_atoms):
                     raise ValueError(f"Negative integers found in 'adsorbate_atoms' or 'reference_atoms' in {step_key} of {pathway_key}.")
 
-    pathway_dict = pathways.get(pathway_name, None)
-    if pathway_dict is None:
-        raise ValueError(f"Pathway {pathway_name} does not exist in the database.")
-
-    return pathway_dict
+    return pathways
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Callable, Dict, List, Tuple
+from pathlib import Path
+import platform
+import tempfile
+import time
+import tracemalloc
+import warnings
+import numpy as np
+import yaml
+import ase
+from ase import Atoms
+from ase.build import fcc111, molecule
+from ase.io import write
+
+from .siteGenerator import SiteGenerator
+from .adsorbateGenerator import AdsorbateGenerator
+from .adsorbateDepositor import AdsorbateDepositor
+
+# Molecules of the synthetic adsorbate database, the first atom is the reference (binding) atom
+BENCHMARK_ADSORBATES = ("CO", "OH", "NH3", "CH3OH")
+
+# Stages timed for each slab size, in pipeline order
+BENCHMARK_STAGES = ("sites", "adsorbates", "deposit_auto_offset", "deposit_no_offset", "write")
+
+def build_slab(n_atoms: int, layers: int = 4, vacuum: float = 10.0) -> Atoms:
+    """
+    Build a synthetic Pt(111) slab of about the requested number of atoms.
+
+    Args:
+        n_atoms (int): Approximate number of atoms.
+        layers (int, optional): Number of atomic layers. Defaults to 4.
+        vacuum (float, optional): Vacuum thickness in Å on each side. Defaults to 10.0.
+
+    Returns:
+        Atoms: The periodic slab, with a square in-plane supercell of `layers * n^2` atoms.
+    """
+    size = max(2, int(round(np.sqrt(n_atoms / layers))))
+    slab = fcc111("Pt", size=(size, size, layers), vacuum=vacuum)
+    slab.pbc = True
+    return slab
+
+def build_adsorbate_database(path: Path, box: float = 12.0) -> str:
+    """
+    Write a synthetic adsorbate database: one POSCAR per molecule of `BENCHMARK_ADSORBATES` and a one-pathway header.
+
+    Args:
+        path (Path): The database directory, created if needed.
+        box (float, optional): Cubic cell length in Å of the molecule POSCARs. Defaults to 12.0.
+
+    Returns:
+        str: The name of the pathway.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+
+    steps = {}
+    for index, name in enumerate(BENCHMARK_ADSORBATES):
+        adsorbate = molecule(name)
+        adsorbate.set_cell([box, box, box])
+        adsorbate.center()
+        write(path / f"POSCAR_{name}", adsorbate, format="vasp")
+
+        steps[f"step_{index + 1}"] = {
+            "name": name,
+            "POSCAR_path": f"./POSCAR_{name}",
+            "adsorbate_atoms": list(range(1, len(adsorbate) + 1)),
+            "reference_atoms": [1, ],
+        }
+
+    with open(path / "pathway_database_header.yaml", "w", encoding="utf-8") as f:
+        yaml.safe_dump({"pathways": {"pathway_1": steps}}, f, sort_keys=False)
+
+    return "pathway_1"
+
+def _measure(function: Callable[[], object], repeats: int) -> Tuple[float, int, object]:
+    """
+    Time a function (best of several runs) and trace its peak memory (one extra run).
+
+    Args:
+        function (Callable[[], object]): The function to measure.
+        repeats (int): Number of timed runs.
+
+    Returns:
+        Tuple[float, int, object]: The best wall time in seconds, the peak traced memory in bytes, and the last result.
+    """
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+
+    # Tracing slows allocations down, so memory is measured apart from timing
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak, result
+
+def run_benchmark(sizes: List[int], n_sites: int = 4, repeats: int = 5) -> Dict[str, Dict[str, dict]]:
+    """
+    Time the stages of the deposition pipeline on synthetic slabs.
+
+    For each slab size: top-layer site enumeration (`SiteGenerator.generate`, auto sites),
+    adsorbate loading with the six fixed rotations (`AdsorbateGenerator.generate_adsorbates`, database mode),
+    deposition of every adsorbate on `n_sites` sites with and without auto-offset (`AdsorbateDepositor.deposit`),
+    and VASP output (`AdsorbateDepositor.write`).
+
+    Args:
+        sizes (List[int]): Approximate slab sizes in atoms.
+        n_sites (int, optional): Number of sites used for deposition. Defaults to 4.
+        repeats (int, optional): Number of timed runs per stage, the best one kept. Defaults to 5.
+
+    Returns:
+        Dict[str, Dict[str, dict]]: Results keyed by slab size (actual atom count, as string) and stage,
+            each with "time_s", "peak_memory_bytes" and, for deposition and writing, "structures" and "structures_per_s".
+
+    Raises:
+        ValueError: If the site count or the repeat count is not positive.
+    """
+    if n_sites < 1 or repeats < 1:
+        raise ValueError("Benchmark site count and repeat count should be positive.")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir, warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # auto-offset and small-distance warnings are expected
+
+        database = Path(temp_dir) / "database"
+        pathway_name = build_adsorbate_database(database)
+
+        for size in sizes:
+            slab = build_slab(size)
+            stages = {}
+
+            def generate_sites() -> dict:
+                return SiteGenerator(POSCAR_substrate=slab, distance=2.0, sites="auto").generate()
+
+            time_s, peak, sites = _measure(generate_sites, repeats)
+            stages["sites"] = {"time_s": time_s, "peak_memory_bytes": peak}
+            sites = dict(list(sites.items())[:n_sites])
+
+            def generate_adsorbates() -> Tuple[dict, dict]:
+                generator = AdsorbateGenerator(work_mode="DATABASE", path=database, pathway_name=pathway_name, generate_rotations=True)
+                adsorbates = generator.generate_adsorbates()
+                return adsorbates, generator.generate_adsorbate_references(adsorbates, poscar_ads=None, poscar_ads_ref=None)
+
+            time_s, peak, (adsorbates, adsorbate_refs) = _measure(generate_adsorbates, repeats)
+            stages["adsorbates"] = {"time_s": time_s, "peak_memory_bytes": peak}
+
+            depositor = AdsorbateDepositor(distance=2.0, POSCAR_substrate=slab, sites=sites, adsorbates=adsorbates, adsorbate_refs=adsorbate_refs)
+            for stage, auto_offset in (("deposit_auto_offset", True), ("deposit_no_offset", False)):
+                time_s, peak, structures = _measure(lambda: depositor.deposit(rotation_generated=True, auto_offset_along_z=auto_offset), repeats)
+                stages[stage] = {"time_s": time_s, "peak_memory_bytes": peak, "structures": len(structures), "structures_per_s": len(structures) / time_s}
+
+            output_dir = Path(temp_dir) / "generated_models"
+            time_s, peak, count = _measure(lambda: depositor.write(structures, output_dir=output_dir), repeats)
+            stages["write"] = {"time_s": time_s, "peak_memory_bytes": peak, "structures": count, "structures_per_s": count / time_s}
+
+            results[str(len(slab))] = stages
+
+    return results
+
+def environment_info() -> dict:
+    """
+    Describe the machine and library versions of a benchmark run.
+
+    Returns:
+        dict: Platform, processor, Python, NumPy and ASE versions.
+    """
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "ase": ase.__version__,
+    }
+
+def compare_to_baseline(results: Dict[str, Dict[str, dict]], baseline: Dict[str, Dict[str, dict]], tolerance: float = 0.5, min_time_s: float = 0.05) -> List[str]:
+    """
+    Compare benchmark results to a stored baseline and print the ratios.
+
+    Args:
+        results (Dict[str, Dict[str, dict]]): The new results, from `run_benchmark`.
+        baseline (Dict[str, Dict[str, dict]]): The baseline results, same layout.
+        tolerance (float, optional): Relative increase of time or peak memory considered a regression. Defaults to 0.5.
+        min_time_s (float, optional): Smallest absolute slowdown in seconds considered a regression,
+            so that timer noise on millisecond stages is not reported. Defaults to 0.05.
+
+    Returns:
+        List[str]: Descriptions of the regressions, empty if none.
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage, metrics in stages.items():
+            reference = baseline.get(size, {}).get(stage)
+            if reference is None:
+                print(f"  {size:>6} atoms  {stage:<20} no baseline")
+                continue
+
+            time_ratio = metrics["time_s"] / reference["time_s"]
+            memory_ratio = metrics["peak_memory_bytes"] / max(reference["peak_memory_bytes"], 1)
+            flag = ""
+            if time_ratio > 1 + tolerance and metrics["time_s"] - reference["time_s"] > min_time_s:
+                regressions.append(f"{stage} ({size} atoms) is {time_ratio:.2f}x slower than the baseline.")
+                flag = "  <- slower"
+            if memory_ratio > 1 + tolerance:
+                regressions.append(f"{stage} ({size} atoms) uses {memory_ratio:.2f}x the baseline peak memory.")
+                flag += "  <- more memory"
+            print(f"  {size:>6} atoms  {stage:<20} time x{time_ratio:.2f}  memory x{memory_ratio:.2f}{flag}")
+
+    return regressions
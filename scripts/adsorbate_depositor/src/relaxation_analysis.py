@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import csv
+import numpy as np
+from ase import Atoms
+from ase.io import read
+
+from .adsorbateDepositor import IN_PLANE_PBC
+from .minimum_image_distance import minimum_image_vectors
+from .structure_graph import BOND_CUTOFF_SCALE, build_bonding_graph, loads_graph, adsorbate_fragments, surface_bonds
+from .structure_io import GRAPH_FILENAME
+
+# Outcome of each relaxed structure, from the most to the least severe
+RELAXATION_STATUSES = ("missing", "mismatch", "dissociated", "desorbed", "rearranged", "migrated", "intact")
+
+# Columns of the summary table
+SUMMARY_COLUMNS = ("name", "status", "site_before", "site_after", "surface_atoms_before", "surface_atoms_after",
+                   "lateral_shift", "fragments_before", "fragments_after", "message")
+
+def _site_type(surface_atoms: List[int]) -> str:
+    """
+    Name an adsorption site from the number of surface atoms bonded to the adsorbate.
+
+    Args:
+        surface_atoms (List[int]): Substrate atoms bonded to any adsorbate atom.
+
+    Returns:
+        str: "none", "top", "bridge", "hollow" or "<n>-fold".
+    """
+    return {0: "none", 1: "top", 2: "bridge", 3: "hollow"}.get(len(surface_atoms), f"{len(surface_atoms)}-fold")
+
+def _find_adsorbate_atoms(structure_dir: Path, generated: Atoms, n_substrate: Optional[int]) -> Tuple[List[int], Optional[dict]]:
+    """
+    Identify the adsorbate atoms of a generated structure.
+
+    The saved bonding graph is used if present, then the substrate atom count (substrate atoms come first
+    in the depositor outputs). Fixed atoms are not used: a substrate POSCAR may keep its own constraints
+    on part of its layers, whose free atoms would then be taken as adsorbate.
+
+    Args:
+        structure_dir (Path): The structure directory.
+        generated (Atoms): The generated structure.
+        n_substrate (int, optional): Number of substrate atoms. Defaults to None.
+
+    Returns:
+        Tuple[List[int], Optional[dict]]: The adsorbate atom indexes (0-based), and the saved graph if any.
+
+    Raises:
+        ValueError: If the adsorbate atoms cannot be identified.
+    """
+    graph_path = structure_dir / GRAPH_FILENAME
+    if graph_path.is_file():
+        graph = loads_graph(graph_path.read_text(encoding="utf-8"))
+        return graph["adsorbate_atoms"], graph
+
+    if n_substrate is not None:
+        if not 0 < n_substrate < len(generated):
+            raise ValueError(f"Substrate atom count {n_substrate} does not fit a structure of {len(generated)} atoms.")
+        return list(range(n_substrate, len(generated))), None
+
+    raise ValueError(f"Cannot identify the adsorbate atoms: no {GRAPH_FILENAME} (deposit with bonding_graph: True) nor substrate atom count (--substrate-atoms).")
+
+def analyze_structure(structure_dir: Path, relaxed_dir: Path, generated_name: str = "POSCAR_generated", relaxed_name: str = "CONTCAR",
+                      n_substrate: Optional[int] = None, cutoff_scale: float = BOND_CUTOFF_SCALE, migration_threshold: float = 0.5) -> dict:
+    """
+    Compare a relaxed structure with the generated one: site before and after, adsorbate integrity and lateral shift.
+
+    The surface atoms bonded to the adsorbate define its site (one for top, two for bridge, three for hollow).
+    The outcome is, by decreasing severity:
+        - "missing": no relaxed structure.
+        - "mismatch": the relaxed structure has different atoms, or the adsorbate cannot be identified.
+        - "dissociated": the adsorbate split into more fragments.
+        - "desorbed": the adsorbate was bonded to the surface and no longer is.
+        - "rearranged": same fragments, but adsorbate-adsorbate bonds were broken or formed.
+        - "migrated": the bonded surface atoms changed, or the adsorbate moved laterally by more than `migration_threshold`.
+        - "intact": none of the above.
+
+    Args:
+        structure_dir (Path): The generated structure directory.
+        relaxed_dir (Path): The directory of the relaxed structure (may be `structure_dir`).
+        generated_name (str, optional): Filename of the generated structure. Defaults to "POSCAR_generated".
+        relaxed_name (str, optional): Filename of the relaxed structure. Defaults to "CONTCAR".
+        n_substrate (int, optional): Number of substrate atoms, used without a saved bonding graph. Defaults to None.
+        cutoff_scale (float, optional): Bond cutoff scale, used without a saved bonding graph. Defaults to `BOND_CUTOFF_SCALE`.
+        migration_threshold (float, optional): Lateral shift in Å of the adsorbate centroid counted as migration. Defaults to 0.5.
+
+    Returns:
+        dict: One row of the summary table, keyed by `SUMMARY_COLUMNS`.
+    """
+    row = {column: "" for column in SUMMARY_COLUMNS}
+    row["name"] = structure_dir.name
+
+    relaxed_path = relaxed_dir / relaxed_name
+    if not relaxed_path.is_file():
+        row.update(status="missing", message=f"{relaxed_path} not found.")
+        return row
+
+    try:
+        generated = read(structure_dir / generated_name, format="vasp")
+        relaxed = read(relaxed_path, format="vasp")
+        if generated.get_chemical_symbols() != relaxed.get_chemical_symbols():
+            raise ValueError("Relaxed and generated structures have different atoms.")
+
+        adsorbate_atoms, graph_before = _find_adsorbate_atoms(structure_dir, generated, n_substrate)
+    except Exception as exc:
+        row.update(status="mismatch", message=str(exc))
+        return row
+
+    pbc = generated.get_pbc() & IN_PLANE_PBC
+    if graph_before is None:
+        graph_before = build_bonding_graph(generated, adsorbate_atoms, cutoff_scale=cutoff_scale, pbc=pbc)
+    graph_after = build_bonding_graph(relaxed, adsorbate_atoms, cutoff_scale=graph_before["cutoff_scale"], pbc=pbc)
+
+    surface_before = sorted({atom for atoms in surface_bonds(graph_before).values() for atom in atoms})
+    surface_after = sorted({atom for atoms in surface_bonds(graph_after).values() for atom in atoms})
+    fragments_before = len(adsorbate_fragments(graph_before))
+    fragments_after = len(adsorbate_fragments(graph_after))
+
+    adsorbate_set = set(adsorbate_atoms)
+    internal_before = {tuple(edge) for edge in graph_before["edges"] if edge[1] in adsorbate_set}
+    internal_after = {tuple(edge) for edge in graph_after["edges"] if edge[1] in adsorbate_set}
+
+    # Lateral shift of the adsorbate centroid, minimum image in-plane
+    displacements = minimum_image_vectors(relaxed.positions[adsorbate_atoms] - generated.positions[adsorbate_atoms], generated.get_cell().array, pbc)
+    lateral_shift = float(np.linalg.norm(displacements.mean(axis=0)[:2]))
+
+    if fragments_after > fragments_before:
+        status = "dissociated"
+    elif surface_before and not surface_after:
+        status = "desorbed"
+    elif internal_before != internal_after:
+        status = "rearranged"
+    elif surface_before != surface_after or lateral_shift > migration_threshold:
+        status = "migrated"
+    else:
+        status = "intact"
+
+    row.update(
+        status=status,
+        site_before=_site_type(surface_before),
+        site_after=_site_type(surface_after),
+        surface_atoms_before=" ".join(str(atom + 1) for atom in surface_before),  # 1-based, as in POSCAR files
+        surface_atoms_after=" ".join(str(atom + 1) for atom in surface_after),
+        lateral_shift=round(lateral_shift, 4),
+        fragments_before=fragments_before,
+        fragments_after=fragments_after,
+    )
+    return row
+
+def _analyze_task(task: Tuple[Path, Path, dict]) -> dict:
+    """
+    Run `analyze_structure` on one (structure directory, relaxed directory, options) task, in a worker process.
+
+    Args:
+        task (Tuple[Path, Path, dict]): The directories and the keyword arguments of `analyze_structure`.
+
+    Returns:
+        dict: The summary row.
+    """
+    structure_dir, relaxed_dir, options = task
+    return analyze_structure(structure_dir, relaxed_dir, **options)
+
+def analyze_relaxations(generated_dir: Path, relaxed_dir: Optional[Path] = None, generated_name: str = "POSCAR_generated", relaxed_name: str = "CONTCAR",
+                        n_substrate: Optional[int] = None, cutoff_scale: float = BOND_CUTOFF_SCALE, migration_threshold: float = 0.5, workers: int = 1) -> List[dict]:
+    """
+    Analyze every generated structure directory against its relaxed structure, in parallel.
+
+    Relaxed structures are found by directory name: in the same directory as the generated structure
+    (VASP run in place), or in a directory of the same name under `relaxed_dir`.
+
+    Args:
+        generated_dir (Path): The output directory of the depositor ("vasp" format).
+        relaxed_dir (Path, optional): Root of the relaxed structure directories. Defaults to None (`generated_dir`).
+        generated_name (str, optional): Filename of the generated structures. Defaults to "POSCAR_generated".
+        relaxed_name (str, optional): Filename of the relaxed structures. Defaults to "CONTCAR".
+        n_substrate (int, optional): Number of substrate atoms, used without saved bonding graphs. Defaults to None.
+        cutoff_scale (float, optional): Bond cutoff scale, used without saved bonding graphs. Defaults to `BOND_CUTOFF_SCALE`.
+        migration_threshold (float, optional): Lateral shift in Å counted as migration. Defaults to 0.5.
+        workers (int, optional): Number of worker processes. Defaults to 1 (serial).
+
+    Returns:
+        List[dict]: The summary rows, sorted by structure name.
+
+    Raises:
+        FileNotFoundError: If the generated directory does not exist.
+        ValueError: If the worker count is not positive.
+    """
+    if not generated_dir.is_dir():
+        raise FileNotFoundError(f"Generated structure directory {generated_dir} does not exist.")
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"Expected a positive number of workers, but got {workers}.")
+
+    relaxed_dir = generated_dir if relaxed_dir is None else relaxed_dir
+    options = {
+        "generated_name": generated_name,
+        "relaxed_name": relaxed_name,
+        "n_substrate": n_substrate,
+        "cutoff_scale": cutoff_scale,
+        "migration_threshold": migration_threshold,
+    }
+    tasks = [(structure_dir, relaxed_dir / structure_dir.name, options)
+             for structure_dir in sorted(generated_dir.iterdir()) if (structure_dir / generated_name).is_file()]
+
+    if workers == 1 or len(tasks) < 2:
+        return [_analyze_task(task) for task in tasks]
+
+    # Several directories per submission, so that inter-process overhead stays small for thousands of structures
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_analyze_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+def write_summary(rows: List[dict], path: Path) -> Dict[str, int]:
+    """
+    Write the summary table to a CSV file and count the outcomes.
+
+    Args:
+        rows (List[dict]): The summary rows.
+        path (Path): The CSV file, overwritten if it exists.
+
+    Returns:
+        Dict[str, int]: Number of structures of each status, in `RELAXATION_STATUSES` order.
+    """
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return {status: sum(1 for row in rows if row["status"] == status) for status in RELAXATION_STATUSES}
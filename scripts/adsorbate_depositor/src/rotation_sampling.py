@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional
+import numpy as np
+from scipy.stats import qmc
+
+ROTATION_METHODS = ("fixed", "uniform", "quasi_random", "azimuthal")
+
+def _axis_rotation(axis: int, angle: float) -> np.ndarray:
+    """
+    Build the matrix of a right-handed rotation about a Cartesian axis.
+
+    Args:
+        axis (int): The rotation axis (0, 1, 2 for x, y, z).
+        angle (float): The rotation angle in degrees.
+
+    Returns:
+        np.ndarray: The (3, 3) rotation matrix acting on column vectors.
+    """
+    c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+    i, j = (axis + 1) % 3, (axis + 2) % 3  # cyclic order keeps the rotation right-handed
+    matrix = np.eye(3)
+    matrix[i, i], matrix[i, j], matrix[j, i], matrix[j, j] = c, -s, s, c
+    return matrix
+
+def fixed_rotations() -> np.ndarray:
+    """
+    The six fixed orientations: original, ±90° about x, ±90° about y and 180° about z.
+
+    Returns:
+        np.ndarray: (6, 3, 3) rotation matrices, the identity first.
+    """
+    return np.stack([np.eye(3)] + [_axis_rotation(axis, angle) for axis, angle in ((0, 90), (0, -90), (1, 90), (1, -90), (2, 180))])
+
+def _quaternions_to_matrices(quaternions: np.ndarray) -> np.ndarray:
+    """
+    Convert unit quaternions to rotation matrices.
+
+    Args:
+        quaternions (np.ndarray): (N, 4) unit quaternions as (w, x, y, z).
+
+    Returns:
+        np.ndarray: (N, 3, 3) rotation matrices.
+    """
+    w, x, y, z = quaternions.T
+    return np.stack((
+        np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)), axis=1),
+        np.stack((2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)), axis=1),
+        np.stack((2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)), axis=1),
+    ), axis=1)
+
+def _uniform_quaternions(samples: np.ndarray) -> np.ndarray:
+    """
+    Map points of the unit cube to unit quaternions uniformly distributed over SO(3) (Shoemake's method).
+
+    Args:
+        samples (np.ndarray): (N, 3) points in [0, 1)^3.
+
+    Returns:
+        np.ndarray: (N, 4) unit quaternions as (w, x, y, z).
+    """
+    u1, u2, u3 = samples.T
+    r1, r2 = np.sqrt(1 - u1), np.sqrt(u1)
+    return np.stack((r2 * np.cos(2 * np.pi * u3), r1 * np.sin(2 * np.pi * u2), r1 * np.cos(2 * np.pi * u2), r2 * np.sin(2 * np.pi * u3)), axis=1)
+
+def sample_rotations(count: int, method: str = "uniform", seed: Optional[int] = None) -> np.ndarray:
+    """
+    Sample orientations over SO(3), or about the z-axis only.
+
+    Methods:
+        - "fixed": the six fixed orientations of `fixed_rotations` (count is ignored).
+        - "uniform": random rotations uniformly distributed over SO(3).
+        - "quasi_random": low-discrepancy (Halton) rotations over SO(3), covering it more evenly than random ones.
+        - "azimuthal": evenly spaced rotations about the z-axis (surface normal) only.
+
+    Args:
+        count (int): Number of orientations, the original orientation included.
+        method (str, optional): The sampling method. Defaults to "uniform".
+        seed (int, optional): Seed of the random ("uniform") or scrambled ("quasi_random") sequence. Defaults to None.
+
+    Returns:
+        np.ndarray: (count, 3, 3) rotation matrices, the identity (original orientation) first.
+
+    Raises:
+        ValueError: If the method is unknown or the count is not positive.
+    """
+    if method not in ROTATION_METHODS:
+        raise ValueError(f"Unknown rotation method {method}, expected one of {ROTATION_METHODS}.")
+
+    if method == "fixed":
+        return fixed_rotations()
+
+    if not isinstance(count, int) or count < 1:
+        raise ValueError(f"Expected a positive rotation count, but got {count}.")
+
+    if method == "azimuthal":
+        return np.stack([_axis_rotation(2, angle) for angle in np.arange(count) * 360 / count])
+
+    if method == "uniform":
+        samples = np.random.default_rng(seed).random((count - 1, 3))
+    else:
+        samples = qmc.Halton(d=3, scramble=seed is not None, seed=seed).random(count)[1:]  # skip the origin
+
+    return np.concatenate((np.eye(3)[None, :, :], _quaternions_to_matrices(_uniform_quaternions(samples))))
+
+def rotate_positions(positions: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+    """
+    Rotate a set of positions by many rotations at once, about the mean position.
+
+    Args:
+        positions (np.ndarray): (N, 3) Cartesian positions.
+        rotations (np.ndarray): (R, 3, 3) rotation matrices.
+
+    Returns:
+        np.ndarray: (R, N, 3) rotated positions.
+    """
+    center = positions.mean(axis=0)
+    return np.einsum("rij,nj->rni", rotations, positions - center) + center
+
+def prune_duplicate_rotations(rotated: np.ndarray, rmsd_threshold: float) -> List[int]:
+    """
+    Drop orientations lying within an RMSD threshold of an earlier kept orientation.
+
+    Args:
+        rotated (np.ndarray): (R, N, 3) rotated positions, sharing the same center and atom order.
+        rmsd_threshold (float): RMSD in Å below which two orientations are considered duplicates.
+
+    Returns:
+        List[int]: Indexes of the kept orientations, in input order.
+
+    Notes:
+        - Atoms are matched by index, so orientations only equivalent after permuting identical atoms are kept.
+    """
+    flat = (rotated - rotated.mean(axis=1, keepdims=True)).reshape(len(rotated), -1)
+    squared_norms = np.einsum("ij,ij->i", flat, flat)
+    squared_rmsd = (squared_norms[:, None] + squared_norms[None, :] - 2 * flat @ flat.T) / rotated.shape[1]
+    duplicate = squared_rmsd < rmsd_threshold ** 2
+
+    kept = []
+    for index in range(len(rotated)):
+        if not duplicate[index, kept].any():
+            kept.append(index)
+
+    return kept
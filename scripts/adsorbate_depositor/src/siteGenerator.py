@@ -4,31 +4,51 @@
 from pathlib import Path
 from typing import Union, List
 import numpy as np
+from ase import Atoms
 from ase.io import read
 import warnings
 
+from .surface_sites import enumerate_surface_sites
+from .site_symmetry import reduce_equivalent_sites
+
 class SiteGenerator:
     """
     Class responsible for generating various site positions on a substrate based on the given POSCAR file.
+
+    Notes:
+        - The substrate is parsed only once, all sites are computed from the cached atom positions.
+        - With sites set to "auto", top/bridge/hollow sites of the top layer are enumerated automatically
+          (see `surface_sites.enumerate_surface_sites`).
+        - With symmetry_reduce enabled, sites equivalent under the surface symmetry operations are collapsed
+          to their first occurrence, and the multiplicity of each unique site is kept in `site_multiplicities`.
     """
 
-    def __init__(self, POSCAR_substrate: Path, distance: Union[float, int], sites: List[str]) -> None:
+    def __init__(self, POSCAR_substrate: Union[Path, Atoms], distance: Union[float, int], sites: Union[List[str], str], surface_tolerance: float = 0.5, symmetry_reduce: bool = False, symprec: float = 0.1) -> None:
         """
-        Initialize the SiteGenerator object with the path to the substrate's POSCAR file, distance, and sites.
+        Initialize the SiteGenerator object with the substrate, distance, and sites.
 
         Args:
-            POSCAR_substrate (Path): File path to the substrate's POSCAR file.
+            POSCAR_substrate (Union[Path, Atoms]): File path to the substrate's POSCAR file, or an already loaded Atoms object.
             distance (Union[float, int]): Vertical distance from the substrate for the generated site.
-            sites (List[str]): List of site identifiers, each a string.
+            sites (Union[List[str], str]): List of site identifiers, each a string, or "auto" to enumerate surface sites.
+            surface_tolerance (float, optional): Height window in Å to detect the top layer in "auto" mode. Defaults to 0.5.
+            symmetry_reduce (bool, optional): Whether to collapse symmetry-equivalent sites. Defaults to False.
+            symprec (float, optional): Symmetry search tolerance in Å. Defaults to 0.1.
 
         Raises:
             FileNotFoundError: If the POSCAR file is not found.
-            TypeError: If distance is not a float or integer.
+            TypeError: If the substrate or distance is not of the expected type.
             ValueError: If the sites list is empty, or distance is non-positive.
         """
         # Validation
-        if not POSCAR_substrate.is_file():
-            raise FileNotFoundError("Substrate POSCAR file not found.")
+        if isinstance(POSCAR_substrate, Path):
+            if not POSCAR_substrate.is_file():
+                raise FileNotFoundError("Substrate POSCAR file not found.")
+            substrate = read(POSCAR_substrate, format="vasp")
+        elif isinstance(POSCAR_substrate, Atoms):
+            substrate = POSCAR_substrate
+        else:
+            raise TypeError(f"Expected substrate of type Path or Atoms, but got {type(POSCAR_substrate)}.")
 
         if not isinstance(distance, (float, int)):
             raise TypeError("Distance should be either a float or an integer.")
@@ -38,12 +58,25 @@ class SiteGenerator:
         elif distance <= 1:
             warnings.warn(f"Small distance of {distance} Å found. Make sure this is what you want.")
 
-        if not isinstance(sites, list) or not sites:
-            raise ValueError("Sites must be a non-empty list.")
+        if sites != "auto" and (not isinstance(sites, list) or not sites):
+            raise ValueError("Sites must be a non-empty list, or \"auto\".")
+
+        if surface_tolerance <= 0:
+            raise ValueError("Surface layer tolerance should be greater than zero.")
 
-        self.poscar_substrate = POSCAR_substrate
+        if not isinstance(symmetry_reduce, bool):
+            raise TypeError("Expected 'symmetry_reduce' to be of type bool.")
+        if symprec <= 0:
+            raise ValueError("Symmetry tolerance should be greater than zero.")
+
+        self.substrate = substrate
+        self.positions = substrate.get_positions()
         self.distance = distance
         self.sites = sites
+        self.surface_tolerance = surface_tolerance
+        self.symmetry_reduce = symmetry_reduce
+        self.symprec = symprec
+        self.site_multiplicities = {}
 
     def _check_site(self, site_str: str) -> List[int]:
         """
@@ -67,42 +100,25 @@ class SiteGenerator:
         if len(site_components) != len(set(site_components)):
             raise ValueError(f"Duplicate integers found in site_str: {site_str}")
 
-        atoms = read(self.poscar_substrate, format="vasp")
         for site in site_components:
-            if site not in range(1, len(atoms) + 1):
+            if site not in range(1, len(self.positions) + 1):
                 raise ValueError(f"Site \"{site}\" not found in POSCAR (indexing starts from 1).")
 
         return site_components
 
-    @staticmethod
-    def _calculate_centroid(atom_positions: List[List[float]]) -> List[float]:
+    def _calculate_sites(self, site_strs: List[str], direction: str = "z_top") -> np.ndarray:
         """
-        Compute the centroid of the given atom positions.
+        Compute the positions for the given site strings in one vectorized pass.
 
-        Args:
-            atom_positions (List[List[float]]): List of Cartesian coordinates of atoms.
-
-        Returns:
-            List[float]: Cartesian coordinates of the centroid.
-
-        Raises:
-            ValueError: If the list of atom positions is empty.
-        """
-        if not atom_positions:
-            raise ValueError("The list of atom positions cannot be empty.")
-
-        return np.mean(np.array(atom_positions), axis=0).tolist()
-
-    def _calculate_site(self, site_str: str, direction: str = "z_top") -> List[float]:
-        """
-        Compute the position for the given site string.
+        Each site is the centroid of its atoms (the atom itself for single-atom sites),
+        gathered from the cached substrate positions.
 
         Args:
-            site_str (str): String identifier for the site.
-            direction (str, optional): Specifies where the site should be generated. Defaults to "z_top".
+            site_strs (List[str]): String identifiers for the sites.
+            direction (str, optional): Specifies where the sites should be generated. Defaults to "z_top".
 
         Returns:
-            List[float]: Cartesian coordinates of the calculated site.
+            np.ndarray: (N, 3) Cartesian coordinates of the calculated sites.
 
         Raises:
             ValueError: If the direction argument is invalid.
@@ -110,18 +126,17 @@ class SiteGenerator:
         if direction not in {"z_top", "z_bottom"}:
             raise ValueError(f"Illegal site direction {direction}.")
 
-        site_components = self._check_site(site_str)
+        site_components = [self._check_site(site_str) for site_str in site_strs]
 
-        atoms = read(self.poscar_substrate, format="vasp")
-        if len(site_components) == 1:
-            position = atoms.positions[site_components[0] - 1].tolist()
-        else:
-            atom_positions = [atoms.positions[i - 1] for i in site_components]
-            position = SiteGenerator._calculate_centroid(atom_positions)
+        # Gather all site atoms at once, then average each site segment
+        counts = np.array([len(components) for components in site_components])
+        offsets = np.concatenate(([0, ], np.cumsum(counts)[:-1]))
+        gathered = self.positions[np.concatenate(site_components) - 1]
+        positions = np.add.reduceat(gathered, offsets, axis=0) / counts[:, None]
 
-        position[2] += self.distance if direction == "z_top" else -self.distance
+        positions[:, 2] += self.distance if direction == "z_top" else -self.distance
 
-        return position
+        return positions
 
     def generate(self) -> dict:
         """
@@ -130,4 +145,31 @@ class SiteGenerator:
         Returns:
             dict: A dictionary mapping each site identifier to its Cartesian coordinates.
         """
-        return {f"site-{site}": self._calculate_site(site) for site in self.sites}
+        if self.sites == "auto":
+            surface_sites = enumerate_surface_sites(self.substrate, layer_tolerance=self.surface_tolerance)
+            site_names = list(surface_sites.keys())
+            positions = np.array(list(surface_sites.values()))
+            positions[:, 2] += self.distance
+
+        else:
+            site_names = self.sites
+            positions = self._calculate_sites(self.sites)
+
+        site_names = [f"site-{site}" for site in site_names]
+
+        # Collapse symmetry-equivalent sites
+        if self.symmetry_reduce:
+            representatives, multiplicities = reduce_equivalent_sites(self.substrate, positions, symprec=self.symprec)
+            print(f"Symmetry reduction: {len(site_names)} sites -> {len(representatives)} unique sites.")
+
+            site_names = [site_names[i] for i in representatives]
+            positions = positions[representatives]
+            self.site_multiplicities = dict(zip(site_names, multiplicities))
+
+            for site_name, multiplicity in self.site_multiplicities.items():
+                print(f"  {site_name}: multiplicity {multiplicity}")
+
+        else:
+            self.site_multiplicities = {site_name: 1 for site_name in site_names}
+
+        return {site_name: position.tolist() for site_name, position in zip(site_names, positions)}
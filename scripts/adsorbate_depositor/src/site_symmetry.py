@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Tuple
+import warnings
+import numpy as np
+import spglib
+from ase import Atoms
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from .surface_sites import IN_PLANE_SHIFTS
+
+def get_surface_symmetry_operations(substrate: Atoms, symprec: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the symmetry operations of a slab that keep its top surface in place.
+
+    The space group operations of the slab are found with spglib, then only those leaving the
+    fractional coordinate along the third cell vector unchanged are kept (no flip to the bottom surface).
+
+    Args:
+        substrate (Atoms): The substrate slab, with the vacuum layer along the third cell vector.
+        symprec (float, optional): Symmetry search tolerance in Å. Defaults to 0.1.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (K, 3, 3) integer rotations and (K, 3) translations acting on fractional coordinates.
+    """
+    cell = (substrate.get_cell().array, substrate.get_scaled_positions(), substrate.get_atomic_numbers())
+    symmetry = spglib.get_symmetry(cell, symprec=symprec)
+
+    if symmetry is None:
+        warnings.warn("Symmetry search failed, only identity operation would be used.")
+        return np.eye(3, dtype=int)[None, :, :], np.zeros((1, 3))
+
+    rotations = symmetry["rotations"]
+    translations = symmetry["translations"]
+
+    # Keep operations that map z to z (no z-flip, no shift along the surface normal)
+    keeps_normal = np.all(rotations[:, 2, :] == (0, 0, 1), axis=1)
+    no_normal_shift = np.abs(translations[:, 2] - np.round(translations[:, 2])) < 1e-5
+    mask = keeps_normal & no_normal_shift
+
+    return rotations[mask], translations[mask]
+
+def map_sites(substrate: Atoms, positions: np.ndarray, symprec: float = 0.1) -> np.ndarray:
+    """
+    Find the site each adsorption site is mapped onto by every surface symmetry operation.
+
+    Args:
+        substrate (Atoms): The substrate slab.
+        positions (np.ndarray): (S, 3) Cartesian site positions.
+        symprec (float, optional): Symmetry search and site matching tolerance in Å. Defaults to 0.1.
+
+    Returns:
+        np.ndarray: (K, S) index of the image of each site under each operation, -1 if the image is not a listed site.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    cell = substrate.get_cell().array
+    rotations, translations = get_surface_symmetry_operations(substrate, symprec)
+
+    # Sites wrapped into the home cell, surrounded by in-plane images for periodic matching
+    frac = np.linalg.solve(cell.T, positions.T).T
+    frac[:, :2] -= np.floor(frac[:, :2])
+    n_sites = len(frac)
+    tree = cKDTree(((frac[None, :, :] + IN_PLANE_SHIFTS[:, None, :]).reshape(-1, 3)) @ cell)
+
+    # Map every site through every operation and look up the site it lands on
+    images = np.einsum("kij,sj->ksi", rotations, frac) + translations[:, None, :]
+    images[..., :2] -= np.floor(images[..., :2])
+    distances, matches = tree.query(images.reshape(-1, 3) @ cell, k=1, distance_upper_bound=symprec)
+
+    return np.where(np.isfinite(distances), matches % n_sites, -1).reshape(len(rotations), n_sites)
+
+def find_equivalent_sites(substrate: Atoms, positions: np.ndarray, symprec: float = 0.1) -> np.ndarray:
+    """
+    Group adsorption sites that are mapped onto each other by the surface symmetry operations.
+
+    Args:
+        substrate (Atoms): The substrate slab.
+        positions (np.ndarray): (S, 3) Cartesian site positions.
+        symprec (float, optional): Symmetry search and site matching tolerance in Å. Defaults to 0.1.
+
+    Returns:
+        np.ndarray: (S, ) group label of each site, labels numbered in order of first appearance.
+
+    Notes:
+        - Only the given sites are compared, so a site whose equivalents are not listed has a multiplicity of one.
+    """
+    mapping = map_sites(substrate, positions, symprec)
+    n_sites = mapping.shape[1]
+
+    found = mapping.ravel() >= 0
+    sources = np.tile(np.arange(n_sites), len(mapping))[found]
+    targets = mapping.ravel()[found]
+    graph = coo_matrix((np.ones(len(sources)), (sources, targets)), shape=(n_sites, n_sites))
+    _, labels = connected_components(graph, directed=False)
+
+    # Renumber groups in order of first appearance
+    _, first_seen, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first_seen))
+    return order[inverse]
+
+def reduce_equivalent_sites(substrate: Atoms, positions: np.ndarray, symprec: float = 0.1) -> Tuple[List[int], List[int]]:
+    """
+    Collapse symmetry-equivalent sites to one representative each.
+
+    Args:
+        substrate (Atoms): The substrate slab.
+        positions (np.ndarray): (S, 3) Cartesian site positions.
+        symprec (float, optional): Symmetry search and site matching tolerance in Å. Defaults to 0.1.
+
+    Returns:
+        Tuple[List[int], List[int]]: Indexes of the representative sites (first of each group, in input order)
+            and the multiplicity of each representative.
+    """
+    labels = find_equivalent_sites(substrate, positions, symprec)
+    _, representatives, multiplicities = np.unique(labels, return_index=True, return_counts=True)
+
+    return representatives.tolist(), multiplicities.tolist()
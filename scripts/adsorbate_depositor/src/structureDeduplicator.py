@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from ase import Atoms
+from scipy.spatial.distance import pdist
+
+from .adsorbateDepositor import TAG_DESCRIPTIONS, IN_PLANE_PBC
+from .minimum_image_distance import minimum_image_vectors
+
+class StructureDeduplicator:
+    """
+    Drop generated structures that duplicate an earlier one, e.g. equivalent sites after auto-offset.
+
+    Each structure is described from its adsorbate: the adsorbate atoms and the substrate atoms within a cutoff,
+    as minimum-image vectors relative to the adsorbate centroid (invariant to in-plane translations and atom ordering).
+    Structures are first hashed on their composition and on a scalar summary of a permutation-invariant fingerprint
+    (nearest substrate distances of each adsorbate atom and internal adsorbate distances), so only structures
+    sharing a bucket are compared. Candidates are then filtered on the whole fingerprint at once and
+    confirmed with a matched RMSD of the adsorbate and its substrate environment.
+
+    Attributes:
+        tolerance (float): Distance tolerance in Å for two structures to be considered duplicates.
+        cutoff (float): Radius in Å around the adsorbate centroid of the substrate environment.
+        neighbors (int): Number of nearest substrate distances per adsorbate atom in the fingerprint.
+        groups (Dict[str, List[str]]): Names of the removed duplicates, keyed by the name of the kept structure.
+
+    Notes:
+        - Atoms are identified with the tags set by AdsorbateDepositor (0 for substrate, 1 for adsorbate).
+        - Structures related by a rotation of the surface (rather than a translation) are kept as distinct.
+    """
+
+    def __init__(self, tolerance: float = 0.1, cutoff: float = 5.0, neighbors: int = 3) -> None:
+        """
+        Initialize the StructureDeduplicator.
+
+        Args:
+            tolerance (float, optional): Distance tolerance in Å. Defaults to 0.1.
+            cutoff (float, optional): Radius in Å of the substrate environment around the adsorbate. Defaults to 5.0.
+            neighbors (int, optional): Number of nearest substrate distances per adsorbate atom. Defaults to 3.
+
+        Raises:
+            ValueError: If any argument is not positive.
+        """
+        if tolerance <= 0 or cutoff <= 0:
+            raise ValueError("Deduplication tolerance and cutoff should be greater than zero.")
+        if not isinstance(neighbors, int) or neighbors < 1:
+            raise ValueError(f"Expected a positive number of neighbors, but got {neighbors}.")
+
+        self.tolerance = tolerance
+        self.cutoff = cutoff
+        self.neighbors = neighbors
+        self.groups = {}
+
+        # Kept structures, and their indexes by (composition key, fingerprint bin)
+        self._entries = []
+        self._buckets = {}
+
+    def _describe(self, atoms: Atoms) -> Tuple[tuple, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the hash key, fingerprint and local environment of a structure.
+
+        Args:
+            atoms (Atoms): The tagged structure.
+
+        Returns:
+            Tuple: The composition key, the fingerprint, the adsorbate vectors and atomic numbers,
+                and the substrate environment vectors and atomic numbers (vectors relative to the adsorbate centroid).
+
+        Raises:
+            ValueError: If the structure has no tagged adsorbate or substrate atoms.
+        """
+        tags = atoms.get_tags()
+        adsorbate = np.flatnonzero(tags == TAG_DESCRIPTIONS["adsorbate"])
+        substrate = np.flatnonzero(tags == TAG_DESCRIPTIONS["substrate"])
+        if not len(adsorbate) or not len(substrate):
+            raise ValueError("Structure deduplication requires tagged adsorbate and substrate atoms.")
+
+        positions = atoms.get_positions()
+        numbers = atoms.get_atomic_numbers()
+        centroid = positions[adsorbate].mean(axis=0)
+
+        # Substrate environment around the adsorbate, as minimum-image vectors along the periodic in-plane axes
+        pbc = atoms.get_pbc() & IN_PLANE_PBC
+        environment = minimum_image_vectors(positions[substrate] - centroid, cell=atoms.get_cell().array, pbc=pbc)
+        close = np.linalg.norm(environment, axis=1) < self.cutoff
+        environment, environment_numbers = environment[close], numbers[substrate][close]
+        adsorbate_vectors = positions[adsorbate] - centroid
+
+        # Nearest substrate distances of each adsorbate atom, rows sorted by element then distances
+        distances = np.full((len(adsorbate), self.neighbors), self.cutoff)
+        if len(environment):
+            nearest = np.sort(np.linalg.norm(adsorbate_vectors[:, None, :] - environment[None, :, :], axis=2), axis=1)[:, :self.neighbors]
+            distances[:, :nearest.shape[1]] = nearest
+        order = np.lexsort(tuple(distances.T[::-1]) + (numbers[adsorbate], ))
+
+        fingerprint = np.concatenate((distances[order].ravel(), np.sort(pdist(adsorbate_vectors))))
+        key = (atoms.get_chemical_formula(), tuple(np.sort(numbers[adsorbate])))
+
+        return key, fingerprint, adsorbate_vectors, numbers[adsorbate], environment, environment_numbers
+
+    def _matched_rmsd(self, vectors_a: np.ndarray, numbers_a: np.ndarray, vectors_b: np.ndarray, numbers_b: np.ndarray, radius: float = np.inf) -> float:
+        """
+        RMSD between two point sets, each point of either set matched to the closest point of the same element of the other.
+
+        Args:
+            vectors_a (np.ndarray): (M, 3) positions of the first set.
+            numbers_a (np.ndarray): (M, ) atomic numbers of the first set.
+            vectors_b (np.ndarray): (N, 3) positions of the second set.
+            numbers_b (np.ndarray): (N, ) atomic numbers of the second set.
+            radius (float, optional): Only points closer than this to the origin are matched, so that points
+                near the edge of an environment are not required to have a partner. Defaults to no limit.
+
+        Returns:
+            float: The larger of the two directional RMSDs in Å (inf if a point has no partner).
+        """
+        rmsd = 0.0
+        for (vectors, numbers), (others, other_numbers) in (((vectors_a, numbers_a), (vectors_b, numbers_b)), ((vectors_b, numbers_b), (vectors_a, numbers_a))):
+            inside = np.linalg.norm(vectors, axis=1) < radius
+            if not inside.any():
+                continue
+            if not len(others):
+                return np.inf
+
+            squared = np.sum((vectors[inside][:, None, :] - others[None, :, :]) ** 2, axis=2)
+            squared[numbers[inside][:, None] != other_numbers[None, :]] = np.inf
+            rmsd = max(rmsd, float(np.sqrt(squared.min(axis=1).mean())))
+
+        return rmsd
+
+    def find_duplicate(self, atoms: Atoms) -> Tuple[Optional[str], tuple]:
+        """
+        Find a kept structure duplicated by the given one.
+
+        Args:
+            atoms (Atoms): The tagged structure.
+
+        Returns:
+            Tuple[Optional[str], tuple]: The name of the duplicated kept structure (None if unique),
+                and the description of the structure for `_register`.
+        """
+        description = self._describe(atoms)
+        key, fingerprint, adsorbate_vectors, adsorbate_numbers, environment, environment_numbers = description
+
+        # Structures within tolerance have fingerprint means within tolerance, so neighbouring bins are enough
+        scalar_bin = int(np.floor(fingerprint.mean() / self.tolerance))
+        buckets = self._buckets.get(key, {})
+        candidates = [index for shift in (-1, 0, 1) for index in buckets.get(scalar_bin + shift, [])]
+        if not candidates:
+            return None, description
+
+        # Filter on the whole fingerprint at once, then confirm the remaining candidates
+        fingerprints = np.stack([self._entries[index][1] for index in candidates])
+        close = np.max(np.abs(fingerprints - fingerprint), axis=1) <= self.tolerance
+
+        for index in np.array(candidates)[close]:
+            name, _, kept_adsorbate, kept_adsorbate_numbers, kept_environment, kept_environment_numbers = self._entries[index]
+            if self._matched_rmsd(adsorbate_vectors, adsorbate_numbers, kept_adsorbate, kept_adsorbate_numbers) > self.tolerance:
+                continue
+            if self._matched_rmsd(environment, environment_numbers, kept_environment, kept_environment_numbers, radius=self.cutoff - self.tolerance) > self.tolerance:
+                continue
+            return name, description
+
+        return None, description
+
+    def _register(self, name: str, description: tuple) -> None:
+        """
+        Keep a unique structure for comparison with the following ones.
+
+        Args:
+            name (str): The structure name.
+            description (tuple): The structure description from `find_duplicate`.
+        """
+        key, fingerprint = description[:2]
+        scalar_bin = int(np.floor(fingerprint.mean() / self.tolerance))
+        self._buckets.setdefault(key, {}).setdefault(scalar_bin, []).append(len(self._entries))
+        self._entries.append((name, ) + description[1:])
+        self.groups[name] = []
+
+    def filter(self, structures: Iterable[Tuple[str, Atoms]], on_duplicate: Optional[Callable[[str, Atoms, str], None]] = None) -> Iterator[Tuple[str, Atoms]]:
+        """
+        Pass unique structures through, dropping duplicates of earlier ones.
+
+        Works on a stream (e.g. `AdsorbateDepositor.iter_deposit`), keeping only the descriptions of unique structures.
+
+        Args:
+            structures (Iterable[Tuple[str, Atoms]]): Iterable of (name, Atoms) pairs.
+            on_duplicate (Callable[[str, Atoms, str], None], optional): Called with each dropped (name, Atoms) pair
+                and the name of the kept structure it duplicates, e.g. to record it in an `OutputManifest`. Defaults to None.
+
+        Yields:
+            Tuple[str, Atoms]: The unique structures, in input order.
+        """
+        for name, atoms in structures:
+            duplicate_of, description = self.find_duplicate(atoms)
+            if duplicate_of is None:
+                self._register(name, description)
+                yield name, atoms
+            else:
+                self.groups[duplicate_of].append(name)
+                if on_duplicate is not None:
+                    on_duplicate(name, atoms, duplicate_of)
+
+    def description_bytes(self) -> int:
+        """
+        Get the memory held by the descriptions of the kept structures, which grows with the number of unique structures.
+
+        Returns:
+            int: The size in bytes of the description arrays.
+        """
+        return sum(array.nbytes for entry in self._entries for array in entry[1:])
+
+    def report(self) -> Dict[str, List[str]]:
+        """
+        Print the collapsed structures.
+
+        Returns:
+            Dict[str, List[str]]: Names of the removed duplicates, keyed by the name of the kept structure (only groups with duplicates).
+        """
+        collapsed = {name: duplicates for name, duplicates in self.groups.items() if duplicates}
+        removed = sum(len(duplicates) for duplicates in collapsed.values())
+
+        print(f"Deduplication: {len(self.groups) + removed} structures -> {len(self.groups)} unique structures.")
+        for name, duplicates in collapsed.items():
+            print(f"  {name} (kept) <- {', '.join(duplicates)}")
+
+        return collapsed
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, List, Sequence
+import json
+import numpy as np
+from ase import Atoms
+from ase.data import covalent_radii
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from .minimum_image_distance import minimum_image_vectors
+
+# Two atoms are bonded if closer than the sum of their covalent radii times this factor
+BOND_CUTOFF_SCALE = 1.25
+
+def build_bonding_graph(atoms: Atoms, adsorbate_atoms: Sequence[int], cutoff_scale: float = BOND_CUTOFF_SCALE, pbc: Sequence[bool] = None) -> dict:
+    """
+    Build the bonding graph of the adsorbate atoms of a structure, within the adsorbate and to the substrate.
+
+    All (adsorbate atom, atom) minimum-image distances are computed at once and compared with the sum of
+    covalent radii, so the cost is O(M * N) vectorized for M adsorbate atoms and N atoms.
+    Substrate-substrate bonds are not included.
+
+    Args:
+        atoms (Atoms): The structure.
+        adsorbate_atoms (Sequence[int]): Indexes (0-based) of the adsorbate atoms in `atoms`.
+        cutoff_scale (float, optional): Factor applied to the sum of covalent radii. Defaults to `BOND_CUTOFF_SCALE`.
+        pbc (Sequence[bool], optional): Periodicity flags used for minimum images. Defaults to None (those of `atoms`).
+
+    Returns:
+        dict: The graph in sparse (edge list) form: "cutoff_scale", "adsorbate_atoms", "edges" as [i, j] pairs
+            with i an adsorbate atom and i < j for adsorbate-adsorbate bonds, and "lengths" in Å of each edge.
+
+    Raises:
+        ValueError: If there are no adsorbate atoms or the cutoff scale is not positive.
+    """
+    adsorbate_atoms = np.asarray(adsorbate_atoms, dtype=int)
+    if not len(adsorbate_atoms):
+        raise ValueError("Cannot build a bonding graph without adsorbate atoms.")
+    if cutoff_scale <= 0:
+        raise ValueError(f"Expected a positive bond cutoff scale, but got {cutoff_scale}.")
+
+    positions = atoms.get_positions()
+    radii = covalent_radii[atoms.get_atomic_numbers()]
+
+    vectors = minimum_image_vectors(positions[None, :, :] - positions[adsorbate_atoms, None, :], atoms.get_cell().array, atoms.get_pbc() if pbc is None else pbc)
+    distances = np.linalg.norm(vectors, axis=-1)
+    bonded = distances < cutoff_scale * (radii[adsorbate_atoms, None] + radii[None, :])
+
+    # Drop self pairs, and keep each adsorbate-adsorbate bond once
+    is_adsorbate = np.zeros(len(atoms), dtype=bool)
+    is_adsorbate[adsorbate_atoms] = True
+    rows, columns = np.nonzero(bonded)
+    first = adsorbate_atoms[rows]
+    keep = (first != columns) & (~is_adsorbate[columns] | (first < columns))
+
+    return {
+        "cutoff_scale": cutoff_scale,
+        "adsorbate_atoms": adsorbate_atoms.tolist(),
+        "edges": np.stack((first[keep], columns[keep]), axis=1).tolist(),
+        "lengths": np.round(distances[rows[keep], columns[keep]], 4).tolist(),
+    }
+
+def dumps_graph(graph: dict) -> str:
+    """
+    Serialize a bonding graph to a compact JSON string, as stored in `Atoms.info["bonding_graph"]`.
+
+    Args:
+        graph (dict): The graph, from `build_bonding_graph`.
+
+    Returns:
+        str: The JSON string.
+    """
+    return json.dumps(graph, separators=(",", ":"))
+
+def loads_graph(text: str) -> dict:
+    """
+    Deserialize a bonding graph from its JSON string.
+
+    Args:
+        text (str): The JSON string, from `dumps_graph`.
+
+    Returns:
+        dict: The graph.
+    """
+    return json.loads(text)
+
+def adsorbate_fragments(graph: dict) -> List[List[int]]:
+    """
+    Split the adsorbate atoms into connected fragments, e.g. to detect dissociation or tell coverage copies apart.
+
+    Args:
+        graph (dict): The bonding graph.
+
+    Returns:
+        List[List[int]]: Atom indexes of each fragment, ordered by their first atom.
+    """
+    adsorbate_atoms = np.asarray(graph["adsorbate_atoms"], dtype=int)
+    local = {int(index): position for position, index in enumerate(adsorbate_atoms)}
+    edges = [(local[i], local[j]) for i, j in graph["edges"] if j in local]
+
+    rows = np.array([edge[0] for edge in edges], dtype=int)
+    columns = np.array([edge[1] for edge in edges], dtype=int)
+    matrix = coo_matrix((np.ones(len(edges)), (rows, columns)), shape=(len(adsorbate_atoms), len(adsorbate_atoms)))
+    _, labels = connected_components(matrix, directed=False)
+
+    fragments = {}
+    for index, label in zip(adsorbate_atoms.tolist(), labels):
+        fragments.setdefault(label, []).append(index)
+    return sorted(fragments.values(), key=lambda fragment: fragment[0])
+
+def surface_bonds(graph: dict) -> Dict[int, List[int]]:
+    """
+    List the substrate atoms bonded to each adsorbate atom.
+
+    Args:
+        graph (dict): The bonding graph.
+
+    Returns:
+        Dict[int, List[int]]: Sorted substrate atom indexes keyed by adsorbate atom index, adsorbate atoms without surface bond omitted.
+    """
+    adsorbate_atoms = set(graph["adsorbate_atoms"])
+    bonds = {}
+    for i, j in graph["edges"]:
+        if j not in adsorbate_atoms:
+            bonds.setdefault(i, []).append(j)
+    return {atom: sorted(substrate) for atom, substrate in sorted(bonds.items())}
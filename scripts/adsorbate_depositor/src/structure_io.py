@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+from fnmatch import fnmatchcase
+import warnings
+import numpy as np
+from ase import Atoms
+from ase.io import iread, write
+from ase.constraints import FixAtoms
+import ase.db
+
+# Output formats and the single-file name used by the bulk ones
+OUTPUT_FORMATS = {
+    "vasp": None,
+    "extxyz": "generated_models.extxyz",
+    "db": "generated_models.db"
+}
+
+# Structure metadata kept in Atoms.info and stored alongside each structure in bulk files
+METADATA_KEYS = ("name", "site", "adsorbate", "rotation", "bonding_graph")
+
+# Bonding graph (JSON) written next to each POSCAR of the "vasp" output when the structure carries one
+GRAPH_FILENAME = "bonding_graph.json"
+
+# Per-atom array replacing FixAtoms in extxyz files (constraints are not kept by the extxyz writer)
+FIXED_ARRAY = "fixed"
+
+def write_vasp_directories(structures: Iterable[Tuple[str, Atoms]], output_dir: Path, filename: str = "POSCAR_generated", on_written: Optional[Callable[[str, Atoms], None]] = None) -> int:
+    """
+    Write structures in VASP format, each in a separate directory named after the structure.
+
+    The bonding graph of a structure, if any in `info["bonding_graph"]`, is written to `GRAPH_FILENAME` in the same directory.
+
+    Args:
+        structures (Iterable[Tuple[str, Atoms]]): Iterable of (name, Atoms) pairs.
+        output_dir (Path): Directory where the structure directories will be created.
+        filename (str, optional): Filename for each structure. Defaults to "POSCAR_generated".
+        on_written (Callable[[str, Atoms], None], optional): Called with each (name, Atoms) pair once its file is written. Defaults to None.
+
+    Returns:
+        int: The number of structures written.
+    """
+    count = 0
+    for name, atoms in structures:
+        structure_dir = output_dir / name
+        if not structure_dir.is_dir():
+            structure_dir.mkdir()
+
+        write(structure_dir / filename, atoms, format="vasp")
+        if "bonding_graph" in atoms.info:
+            (structure_dir / GRAPH_FILENAME).write_text(atoms.info["bonding_graph"], encoding="utf-8")
+        count += 1
+
+        if on_written is not None:
+            on_written(name, atoms)
+
+    return count
+
+def write_extxyz(structures: Iterable[Tuple[str, Atoms]], path: Path) -> int:
+    """
+    Append all structures to a single extended XYZ file, with their metadata in the comment line.
+
+    Args:
+        structures (Iterable[Tuple[str, Atoms]]): Iterable of (name, Atoms) pairs.
+        path (Path): The extxyz file, overwritten if it exists.
+
+    Returns:
+        int: The number of structures written.
+    """
+    count = 0
+    with open(path, "w") as f:
+        for name, atoms in structures:
+            frame = Atoms(atoms.get_chemical_symbols(), positions=atoms.get_positions(), cell=atoms.get_cell(), pbc=atoms.get_pbc())
+            frame.info.update(_get_metadata(name, atoms))
+
+            fixed = np.zeros(len(atoms), dtype=bool)
+            for constraint in atoms.constraints:
+                if isinstance(constraint, FixAtoms):
+                    fixed[constraint.get_indices()] = True
+            frame.new_array(FIXED_ARRAY, fixed)
+
+            write(f, frame, format="extxyz")
+            count += 1
+
+    return count
+
+def write_database(structures: Iterable[Tuple[str, Atoms]], path: Path) -> int:
+    """
+    Write all structures to a single ASE SQLite database, with their metadata as key-value pairs.
+
+    Args:
+        structures (Iterable[Tuple[str, Atoms]]): Iterable of (name, Atoms) pairs.
+        path (Path): The database file, overwritten if it exists.
+
+    Returns:
+        int: The number of structures written.
+    """
+    if path.exists():
+        path.unlink()
+
+    count = 0
+    db = ase.db.connect(path, type="db")
+    with db:  # single transaction for all structures
+        for name, atoms in structures:
+            db.write(atoms, key_value_pairs=_get_metadata(name, atoms))
+            count += 1
+
+    return count
+
+def _get_metadata(name: str, atoms: Atoms) -> dict:
+    """
+    Collect the metadata of a structure to store in bulk files.
+
+    Args:
+        name (str): The structure name.
+        atoms (Atoms): The structure, possibly carrying site/adsorbate/rotation/bonding graph entries in its info.
+
+    Returns:
+        dict: Metadata restricted to `METADATA_KEYS`, the name always included.
+    """
+    metadata = {key: atoms.info[key] for key in METADATA_KEYS if key in atoms.info}
+    metadata["name"] = name
+    return metadata
+
+def read_structures(path: Path, patterns: Optional[List[str]] = None) -> Iterator[Tuple[str, Atoms]]:
+    """
+    Read structures back from a single-file output (extxyz or ASE database), one at a time.
+
+    Args:
+        path (Path): The extxyz or database file.
+        patterns (List[str], optional): Shell-style patterns (e.g. "site-1_*"), a structure is kept
+            if its name matches any of them. Defaults to None (keep all structures).
+
+    Yields:
+        Tuple[str, Atoms]: The structure name and structure, with its metadata in Atoms.info and
+            fixed atoms restored as a FixAtoms constraint.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file extension is not supported.
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"Structure file {path} not found.")
+
+    def selected(name: str) -> bool:
+        return patterns is None or any(fnmatchcase(name, pattern) for pattern in patterns)
+
+    if path.suffix == ".extxyz":
+        for atoms in iread(path, index=":", format="extxyz"):
+            name = atoms.info["name"]
+            if not selected(name):
+                continue
+
+            if FIXED_ARRAY in atoms.arrays:
+                fixed = atoms.arrays[FIXED_ARRAY].astype(bool)
+                atoms.set_array(FIXED_ARRAY, None)
+                if fixed.any():
+                    atoms.set_constraint(FixAtoms(mask=fixed))
+            yield name, atoms
+
+    elif path.suffix == ".db":
+        db = ase.db.connect(path, type="db")
+        for row in db.select():
+            if not selected(row.name):
+                continue
+
+            atoms = row.toatoms()
+            atoms.info.update(row.key_value_pairs)
+            yield row.name, atoms
+
+    else:
+        raise ValueError(f"Unsupported structure file {path}, expected an .extxyz or .db file.")
+
+def materialize(path: Path, output_dir: Path, patterns: Optional[List[str]] = None, filename: str = "POSCAR_generated") -> int:
+    """
+    Expand (a subset of) the structures of a single-file output into VASP directories.
+
+    Args:
+        path (Path): The extxyz or database file.
+        output_dir (Path): Directory where the structure directories will be created.
+        patterns (List[str], optional): Shell-style name patterns selecting structures. Defaults to None (all structures).
+        filename (str, optional): Filename for each structure. Defaults to "POSCAR_generated".
+
+    Returns:
+        int: The number of structures written.
+    """
+    if not output_dir.is_dir():
+        output_dir.mkdir(parents=True)
+
+    count = write_vasp_directories(read_structures(path, patterns), output_dir, filename)
+    if not count:
+        warnings.warn(f"No structure in {path} matches the patterns {patterns}.")
+
+    return count
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from itertools import product
+from typing import Sequence, Tuple
+import numpy as np
+from scipy.spatial import cKDTree
+
+class SubstrateIndex:
+    """
+    Spatial index of a periodic substrate, built once and queried for every structure.
+
+    The substrate atoms are wrapped into the home cell along the periodic axes and surrounded
+    with as many image shells as needed to cover `cutoff`. Queries are wrapped the same way, so each
+    query costs a KD-tree lookup, roughly O(log N) per query atom instead of O(N) for all pairs.
+
+    Attributes:
+        cutoff (float): Largest radius in Å supported by `pairs_within`.
+        n_atoms (int): Number of substrate atoms.
+        images (np.ndarray): (K * N, 3) Cartesian positions of the wrapped substrate atoms and their images.
+        atom_indices (np.ndarray): (K * N, ) substrate atom index of each image.
+
+    Notes:
+        - Nearest-atom queries assume that the nearest image lies within the first shell,
+          as for `calculate_min_distance`, which holds unless the cell is strongly skewed.
+    """
+
+    def __init__(self, positions: np.ndarray, cell: np.ndarray, pbc: Sequence[bool] = (True, True, False), cutoff: float = 5.0) -> None:
+        """
+        Initialize the SubstrateIndex.
+
+        Args:
+            positions (np.ndarray): (N, 3) Cartesian positions of the substrate atoms.
+            cell (np.ndarray): The (3, 3) cell matrix, one lattice vector per row.
+            pbc (Sequence[bool], optional): Periodicity flags of the three cell vectors. Defaults to in-plane periodicity only.
+            cutoff (float, optional): Largest radius in Å of `pairs_within` queries. Defaults to 5.0.
+
+        Raises:
+            ValueError: If there are no substrate atoms or the cutoff is not positive.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if not len(positions):
+            raise ValueError("Cannot index an empty substrate.")
+        if cutoff <= 0:
+            raise ValueError(f"Expected a positive cutoff, but got {cutoff}.")
+
+        self.cutoff = cutoff
+        self.n_atoms = len(positions)
+        self._cell = np.asarray(cell, dtype=float)
+        self._pbc = np.asarray(pbc, dtype=bool)
+
+        # Image shells per periodic axis, from the spacing of the lattice planes of the other two vectors
+        if self._pbc.any():
+            self._inverse = np.linalg.inv(self._cell)
+            plane_spacings = 1 / np.linalg.norm(self._inverse, axis=0)
+            shells = [int(np.ceil(cutoff / spacing)) if periodic else 0 for periodic, spacing in zip(self._pbc, plane_spacings)]
+            shifts = np.array(list(product(*[range(-max(shell, 1), max(shell, 1) + 1) if periodic else (0, ) for periodic, shell in zip(self._pbc, shells)])), dtype=float)
+            self.images = ((self._wrap_fractional(positions)[None, :, :] + shifts[:, None, :]) @ self._cell).reshape(-1, 3)
+        else:
+            self.images = positions
+        self.atom_indices = np.tile(np.arange(self.n_atoms), len(self.images) // self.n_atoms)
+
+        self._tree = cKDTree(self.images)
+        self._lateral_tree = cKDTree(self.images[:, :2])
+
+    def _wrap_fractional(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Wrap positions into the home cell along the periodic axes.
+
+        Args:
+            positions (np.ndarray): (M, 3) Cartesian positions.
+
+        Returns:
+            np.ndarray: (M, 3) fractional positions, in [0, 1) along periodic axes.
+        """
+        frac = positions @ self._inverse
+        frac[:, self._pbc] -= np.floor(frac[:, self._pbc])
+        return frac
+
+    def _wrap(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Wrap Cartesian positions into the home cell along the periodic axes.
+
+        Args:
+            positions (np.ndarray): Cartesian positions.
+
+        Returns:
+            np.ndarray: (M, 3) wrapped Cartesian positions.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if not self._pbc.any():
+            return positions
+        return self._wrap_fractional(positions) @ self._cell
+
+    def nearest(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the closest substrate atom of each query position, minimum image included.
+
+        Args:
+            positions (np.ndarray): (M, 3) Cartesian query positions.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (M, ) distances in Å and (M, ) substrate atom indices.
+        """
+        distances, image_indices = self._tree.query(self._wrap(positions), k=1)
+        return distances, self.atom_indices[image_indices]
+
+    def min_distance(self, positions: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        """
+        Find the minimum-image distance between the query positions and the substrate.
+
+        Args:
+            positions (np.ndarray): (M, 3) Cartesian query positions.
+
+        Returns:
+            Tuple[float, Tuple[int, int]]: The minimum distance in Å and the (query, substrate atom) indices of the closest pair.
+        """
+        distances, atom_indices = self.nearest(positions)
+        i = int(np.argmin(distances))
+        return float(distances[i]), (i, int(atom_indices[i]))
+
+    def pairs_within(self, positions: np.ndarray, radius: float, lateral: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find all (query, substrate image) pairs closer than a radius.
+
+        Args:
+            positions (np.ndarray): (M, 3) Cartesian query positions.
+            radius (float): The search radius in Å.
+            lateral (bool, optional): Measure the distance in the xy-plane only. Defaults to False.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (P, ) query indices, (P, ) substrate atom indices and
+                (P, 3) displacement vectors from the substrate image to the query position.
+                Several images of the same atom are returned if they all lie within the radius.
+
+        Raises:
+            ValueError: If the radius exceeds the cutoff of the index.
+        """
+        if radius > self.cutoff:
+            raise ValueError(f"Search radius {radius} Å exceeds the index cutoff of {self.cutoff} Å.")
+
+        wrapped = self._wrap(positions)
+        if lateral:
+            neighbours = self._lateral_tree.query_ball_point(wrapped[:, :2], r=radius)
+        else:
+            neighbours = self._tree.query_ball_point(wrapped, r=radius)
+
+        counts = np.array([len(images) for images in neighbours], dtype=int)
+        query_indices = np.repeat(np.arange(len(wrapped)), counts)
+        image_indices = np.concatenate(neighbours).astype(int) if counts.sum() else np.zeros(0, dtype=int)
+
+        return query_indices, self.atom_indices[image_indices], wrapped[query_indices] - self.images[image_indices]
+
+    def any_within(self, positions: np.ndarray, radius: float) -> bool:
+        """
+        Check if any query position is closer than a radius to the substrate.
+
+        Args:
+            positions (np.ndarray): (M, 3) Cartesian query positions.
+            radius (float): The search radius in Å.
+
+        Returns:
+            bool: True if at least one query position has a substrate atom (or image) within the radius.
+        """
+        distances, _ = self.nearest(positions)
+        return bool(np.any(distances < radius))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Tuple
+import numpy as np
+from ase import Atoms
+from scipy.spatial import Delaunay
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from .minimum_image_distance import minimum_image_vectors
+
+# In-plane lattice shifts of the 3x3 image block used for the periodic triangulation
+IN_PLANE_SHIFTS = np.array([(i, j, 0) for i in (-1, 0, 1) for j in (-1, 0, 1)], dtype=float)
+
+def find_surface_layers(positions: np.ndarray, layer_tolerance: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the top and subsurface atomic layers along the z-axis.
+
+    Args:
+        positions (np.ndarray): (N, 3) Cartesian positions of the substrate atoms.
+        layer_tolerance (float, optional): Height window in Å below the highest atom of a layer to count as the same layer. Defaults to 0.5.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indexes (0-indexed) of the top layer atoms and of the subsurface layer atoms (may be empty).
+    """
+    z = positions[:, 2]
+    is_top = z >= z.max() - layer_tolerance
+    top = np.flatnonzero(is_top)
+
+    below = np.flatnonzero(~is_top)
+    if not len(below):
+        return top, below
+
+    subsurface = below[z[below] >= z[below].max() - layer_tolerance]
+    return top, subsurface
+
+def _in_home_cell(frac: np.ndarray, tolerance: float = 1e-6) -> np.ndarray:
+    """
+    Check if in-plane fractional coordinates fall in the home cell, counting each periodic image exactly once.
+
+    Args:
+        frac (np.ndarray): (N, 3) fractional coordinates.
+        tolerance (float, optional): Shift of the half-open interval to absorb rounding errors on cell edges.
+
+    Returns:
+        np.ndarray: Boolean mask of points inside the home cell.
+    """
+    in_plane = frac[:, :2]
+    return np.all((in_plane >= -tolerance) & (in_plane < 1 - tolerance), axis=1)
+
+def _circumcenters(points: np.ndarray) -> np.ndarray:
+    """
+    Compute the circumcenters of 2D triangles.
+
+    Args:
+        points (np.ndarray): (S, 3, 2) vertex coordinates of each triangle.
+
+    Returns:
+        np.ndarray: (S, 2) circumcenter coordinates.
+    """
+    b = points[:, 1] - points[:, 0]
+    c = points[:, 2] - points[:, 0]
+    d = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    b2 = np.einsum("ij,ij->i", b, b)
+    c2 = np.einsum("ij,ij->i", c, c)
+    ux = (c[:, 1] * b2 - b[:, 1] * c2) / d
+    uy = (b[:, 0] * c2 - c[:, 0] * b2) / d
+    return points[:, 0] + np.stack((ux, uy), axis=1)
+
+def enumerate_surface_sites(substrate: Atoms, layer_tolerance: float = 0.5, cocircular_tolerance: float = 0.1, stacking_tolerance: float = 0.5) -> Dict[str, np.ndarray]:
+    """
+    Enumerate top, bridge and hollow adsorption sites of the top surface layer.
+
+    The top layer atoms are surrounded by their in-plane periodic images and triangulated (2D Delaunay).
+    Triangles sharing a circumcenter (cocircular vertices, e.g. the two halves of a square) are merged
+    into a single polygon, so that 4-fold (or higher) hollows are not reported as two 3-fold hollows.
+    Each site is kept once, for the periodic image whose center falls inside the home cell.
+
+    Site kinds:
+        - "top": on top of a surface atom.
+        - "bridge": midpoint of a polygon edge between two surface atoms.
+        - "fcc"/"hcp": 3-fold hollow, "hcp" if a subsurface atom lies directly below it.
+          Named "hollow" when the substrate has a single layer.
+        - "Nfold": N-fold hollow (N >= 4) at the center of a cocircular polygon, e.g. "4fold".
+
+    Args:
+        substrate (Atoms): The substrate slab, with the surface normal along the z-axis.
+        layer_tolerance (float, optional): Height window in Å to detect the top and subsurface layers. Defaults to 0.5.
+        cocircular_tolerance (float, optional): Distance in Å between circumcenters to merge two triangles. Defaults to 0.1.
+        stacking_tolerance (float, optional): In-plane distance in Å to a subsurface atom to classify a hollow as "hcp". Defaults to 0.5.
+
+    Returns:
+        Dict[str, np.ndarray]: Site positions on the surface (without height offset), keyed by deterministic names
+            "{kind}-{atom indexes}", with 1-indexed atom indexes sorted ascending, e.g. "fcc-19_26_27".
+            A numeric suffix is appended when the same atoms form more than one site of a kind in small cells.
+
+    Raises:
+        ValueError: If the substrate is not periodic in-plane.
+    """
+    if not all(substrate.get_pbc()[:2]) or substrate.get_cell().rank < 3:
+        raise ValueError("Automatic site enumeration requires a substrate with a full cell periodic along x and y.")
+
+    positions = substrate.get_positions()
+    cell = substrate.get_cell().array
+    top, subsurface = find_surface_layers(positions, layer_tolerance)
+
+    # Wrap top layer into the home cell and surround it with its in-plane images
+    frac = np.linalg.solve(cell.T, positions[top].T).T
+    frac[:, :2] -= np.floor(frac[:, :2])
+    image_frac = (frac[None, :, :] + IN_PLANE_SHIFTS[:, None, :]).reshape(-1, 3)
+    image_positions = image_frac @ cell
+    image_atoms = np.tile(top, len(IN_PLANE_SHIFTS))
+
+    triangulation = Delaunay(image_positions[:, :2])
+    simplices = triangulation.simplices
+    neighbors = triangulation.neighbors
+    n_simplices = len(simplices)
+
+    # Merge neighbouring triangles sharing the same circumcenter into polygons
+    centers = _circumcenters(image_positions[simplices][:, :, :2])
+    simplex_ids = np.repeat(np.arange(n_simplices), 3)
+    neighbor_ids = neighbors.ravel()
+    valid = neighbor_ids >= 0
+    same = np.zeros_like(valid)
+    same[valid] = np.linalg.norm(centers[simplex_ids[valid]] - centers[neighbor_ids[valid]], axis=1) < cocircular_tolerance
+    graph = coo_matrix((np.ones(same.sum()), (simplex_ids[same], neighbor_ids[same])), shape=(n_simplices, n_simplices))
+    _, labels = connected_components(graph, directed=False)
+
+    # Unique (polygon, vertex) pairs, sorted by polygon
+    polygon_vertices = np.unique(np.stack((np.repeat(labels, 3), simplices.ravel()), axis=1), axis=0)
+    polygon_ids, offsets, vertex_counts = np.unique(polygon_vertices[:, 0], return_index=True, return_counts=True)
+    polygon_centers = np.add.reduceat(image_positions[polygon_vertices[:, 1]], offsets, axis=0) / vertex_counts[:, None]
+    polygon_home = _in_home_cell(np.linalg.solve(cell.T, polygon_centers.T).T)
+
+    # Polygon edges, excluding the internal diagonals of merged polygons
+    edge_vertices = np.stack((simplices[:, [1, 2, 0]], simplices[:, [2, 0, 1]]), axis=2).reshape(-1, 2)
+    internal = valid & (labels[simplex_ids] == labels[np.where(valid, neighbor_ids, 0)])
+    edges = np.unique(np.sort(edge_vertices[~internal], axis=1), axis=0)
+    edge_centers = image_positions[edges].mean(axis=1)
+    edges_home = _in_home_cell(np.linalg.solve(cell.T, edge_centers.T).T)
+
+    # Collect sites as (kind, atom indexes, position)
+    sites = [("top", (atom, ), position) for atom, position in zip(top, frac @ cell)]
+    sites += [("bridge", tuple(sorted(image_atoms[edge])), center) for edge, center in zip(edges[edges_home], edge_centers[edges_home])]
+
+    hollow_counts = vertex_counts[polygon_home]
+    hollow_centers = polygon_centers[polygon_home]
+    hollow_kinds = np.array([f"{count}fold" for count in hollow_counts], dtype=object)
+
+    # Classify 3-fold hollows by the presence of a subsurface atom underneath
+    threefold = hollow_counts == 3
+    if len(subsurface):
+        lateral = hollow_centers[threefold][:, None, :] - positions[subsurface][None, :, :]
+        lateral[..., 2] = 0
+        lateral = minimum_image_vectors(lateral, cell=cell, pbc=(True, True, False))
+        occupied = np.linalg.norm(lateral, axis=2).min(axis=1) < stacking_tolerance
+        hollow_kinds[threefold] = np.where(occupied, "hcp", "fcc")
+    else:
+        hollow_kinds[threefold] = "hollow"
+
+    vertex_groups = np.split(image_atoms[polygon_vertices[:, 1]], offsets[1:])
+    sites += [(kind, tuple(sorted(vertex_groups[polygon])), center) for kind, polygon, center in zip(hollow_kinds, np.flatnonzero(polygon_home), hollow_centers)]
+
+    # Deterministic ordering: kind, atoms, then in-plane position
+    kind_order = {"top": 0, "bridge": 1, "fcc": 2, "hcp": 3, "hollow": 4}
+    sites.sort(key=lambda site: (kind_order.get(site[0], 5), len(site[1]), site[1], round(site[2][0], 4), round(site[2][1], 4)))
+
+    named_sites = {}
+    for kind, atoms, position in sites:
+        name = f"{kind}-{'_'.join(str(atom + 1) for atom in atoms)}"
+        if name in named_sites:
+            suffix = 2
+            while f"{name}-{suffix}" in named_sites:
+                suffix += 1
+            name = f"{name}-{suffix}"
+        named_sites[name] = position
+
+    return named_sites
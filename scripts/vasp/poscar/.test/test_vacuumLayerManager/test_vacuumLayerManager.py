@@ -4,7 +4,7 @@
 import pytest
 from pathlib import Path
 from ase.lattice.hexagonal import Graphene
-from ase.build import graphene
+from ase.build import graphene, fcc111
 from ase.io import write
 import numpy as np
 import sys
@@ -14,7 +14,7 @@ script_dir = Path(__file__).resolve().parent
 sys_path_to_append = script_dir.parents[5] / "Developer/DFT_Utility_Scripts/scripts/vasp/poscar"
 sys.path.append(str(sys_path_to_append))
 
-from vacuumLayerManager import VacuumLayerManager
+from vacuumLayerManager import VacuumLayerManager, collect_structure_files, adjust_vacuum_files
 
 @pytest.fixture
 def sample_structure():
@@ -109,5 +109,45 @@ def test_adjust_vacuum_thickness_2D_structure_xyz():
         # Check the new vacuum thickness
         assert vacuum_setter.calculate_vacuum_thickness() == new_vacuum
 
+def test_adjust_vacuum_thickness_split_slab_outside_cell():
+    """
+    Test for adjusting the vacuum thickness of a slab split by the cell boundary, with an atom slightly outside the cell.
+    """
+    # 6-layer Pt(111) slab with 12 Å of vacuum, split between layers 3 and 4 across z = 0
+    atoms = fcc111("Pt", size=(2, 2, 6), vacuum=6.0)
+    atoms.pbc = True
+    layers = np.unique(atoms.positions[:, 2].round(6))
+    atoms.positions[:, 2] -= layers[3]
+    atoms.wrap()
+
+    # Move one atom of the bottom layer just below the cell, as in an unwrapped CONTCAR
+    atoms.positions[np.argmin(atoms.positions[:, 2]), 2] -= 0.1
+
+    vacuum_setter = VacuumLayerManager(input_structure=atoms, axis="z")
+    assert vacuum_setter.count_vacuum_layers() == 1
+    assert vacuum_setter.calculate_vacuum_thickness() == pytest.approx(12.0, abs=1e-6)
+
+    vacuum_setter.adjust_vacuum_thickness(new_vacuum=10.0)
+    assert vacuum_setter.count_vacuum_layers() == 1
+    assert vacuum_setter.calculate_vacuum_thickness() == pytest.approx(10.0)
+
+def test_collect_structure_files_skips_adjusted_outputs(tmp_path):
+    """
+    Test that rerunning on a glob pattern does not collect the adjusted structures of an earlier run.
+    """
+    atoms = fcc111("Pt", size=(2, 2, 3), vacuum=6.0)
+    for calculation in ("a", "b"):
+        (tmp_path / calculation).mkdir()
+        write(tmp_path / calculation / "CONTCAR", atoms, format="vasp")
+
+    pattern = str(tmp_path / "*" / "CONTCAR*")
+    results = adjust_vacuum_files(collect_structure_files([pattern]), new_vacuum=10.0)
+    assert all(result["error"] is None and Path(result["output"]).name == "CONTCAR_vacuum_adjusted" for result in results)
+
+    # The outputs of the first run are skipped, so the rerun adjusts the same files
+    paths = collect_structure_files([pattern])
+    assert paths == [tmp_path / "a" / "CONTCAR", tmp_path / "b" / "CONTCAR"]
+    assert collect_structure_files([pattern], suffix="_vac") == sorted((tmp_path / calculation / name) for calculation in ("a", "b") for name in ("CONTCAR", "CONTCAR_vacuum_adjusted"))
+
 if __name__ == "__main__":
     pytest.main()
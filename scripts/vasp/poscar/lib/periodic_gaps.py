@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Optional, Tuple
+import numpy as np
+
+def lattice_plane_geometry(cell: np.ndarray, axis_index: int) -> Tuple[int, np.ndarray, float]:
+    """
+    Find the lattice vector whose lattice planes are the most nearly normal to a Cartesian axis, with their normal and spacing.
+
+    Works for any cell (monoclinic, hexagonal, rotated...): the lattice planes spanned by the two other lattice vectors
+    have the reciprocal vector as normal, so heights along this normal divided by the plane spacing are the fractional
+    coordinates along the lattice vector. For a cell aligned with the Cartesian axes, the lattice vector is the one of
+    the axis, the normal is the axis and the spacing is the cell dimension, all exactly.
+
+    Args:
+        cell (np.ndarray): The (3, 3) cell matrix, one lattice vector per row.
+        axis_index (int): Index of the Cartesian axis (0, 1 or 2).
+
+    Returns:
+        Tuple[int, np.ndarray, float]: The lattice vector index, the (3, ) unit normal of its lattice planes,
+            and the plane spacing in Å (the cell height along the normal).
+    """
+    cell = np.asarray(cell, dtype=float)
+
+    # Rows of the inverse transpose are the reciprocal vectors (without 2 pi)
+    reciprocal = np.linalg.inv(cell).T
+    norms = np.linalg.norm(reciprocal, axis=1)
+    lattice_index = int(np.argmax(np.abs(reciprocal[:, axis_index]) / norms))
+
+    normal = reciprocal[lattice_index] / norms[lattice_index]
+    return lattice_index, normal, float(cell[lattice_index] @ normal)
+
+def sort_periodic(frac: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sort fractional coordinates wrapped into [0, 1) and compute the periodic gaps between neighbours.
+
+    Args:
+        frac (np.ndarray): (N, ) fractional coordinates along one lattice vector.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The (N, ) sorting indexes, the (N, ) sorted wrapped coordinates,
+            and the (N, ) fractional gaps, gap i lying above sorted coordinate i, the last one wrapping around to the first coordinate.
+
+    Raises:
+        ValueError: If there are no coordinates.
+    """
+    frac = np.asarray(frac, dtype=float)
+    if not len(frac):
+        raise ValueError("Cannot find gaps between the coordinates of an empty structure.")
+
+    wrapped = frac - np.floor(frac)
+    order = np.argsort(wrapped, kind="stable")
+    sorted_frac = wrapped[order]
+    gaps = np.append(np.diff(sorted_frac), 1 - sorted_frac[-1] + sorted_frac[0])
+    return order, sorted_frac, gaps
+
+def unwrap_lattice_shifts(frac: np.ndarray, order: np.ndarray, gap_index: int) -> np.ndarray:
+    """
+    Find the lattice shifts making atoms contiguous along a lattice vector, with the given periodic gap left outside.
+
+    Atoms are brought into one periodic image starting right above the gap, so a slab split by the cell boundary
+    becomes a single block with the gap as its vacuum.
+
+    Args:
+        frac (np.ndarray): (N, ) fractional coordinates along the lattice vector, not wrapped.
+        order (np.ndarray): (N, ) sorting indexes of the wrapped coordinates, from `sort_periodic`.
+        gap_index (int): Index of the gap to leave outside, as returned by `sort_periodic`.
+
+    Returns:
+        np.ndarray: (N, ) integer number of lattice vectors to add to each atom.
+    """
+    frac = np.asarray(frac, dtype=float)
+
+    # Atoms below the gap (in wrapped order) move one period up, above the atoms beyond the gap
+    target = np.zeros(len(frac), dtype=int)
+    if gap_index != len(frac) - 1:
+        target[order[:gap_index + 1]] = 1
+
+    return target - np.floor(frac).astype(int)
+
+def find_split_gap(gaps: np.ndarray, extent: float, length: float, threshold: float, tolerance: float = 1e-6) -> Optional[int]:
+    """
+    Find the vacuum gap of a structure split by the cell boundary along a lattice vector.
+
+    A structure is split if the largest periodic gap (between the wrapped coordinates) is a vacuum layer
+    (above `threshold`) that is larger than the gap left by the atoms as they are (cell length minus their extent).
+    Atoms outside the cell are wrapped as the others: a contiguous structure sticking out of the cell
+    (e.g. an adsorbate above the cell top) leaves the same gap as they are and is not split,
+    while a split slab with atoms slightly outside the cell (e.g. an unwrapped CONTCAR) is.
+
+    Args:
+        gaps (np.ndarray): (N, ) periodic fractional gaps, from `sort_periodic`.
+        extent (float): Extent in Å of the atoms along the axis, as they are.
+        length (float): Length in Å of the cell along the axis.
+        threshold (float): Smallest gap in Å considered a vacuum layer.
+        tolerance (float, optional): Tolerance in Å on gap lengths. Defaults to 1e-6.
+
+    Returns:
+        Optional[int]: Index of the vacuum gap (see `sort_periodic`), None if the structure is not split.
+    """
+    gap_index = int(np.argmax(gaps))
+    largest = gaps[gap_index] * length
+    if largest > threshold and largest > length - extent + tolerance:
+        return gap_index
+    return None
@@ -3,17 +3,16 @@
 
 
 # DEBUG: this script cannot be called on it own
-# TODO: add vacuum layer detection (fix circular import with VacuumLayerManager)
-# TODO: generate warning for cells with basis vectors not perpendicular to each other
 
 import numpy as np
 import argparse
 from ase import Atoms
 from ase.io import write, read
 from pathlib import Path
-import warnings
+from typing import Optional
 
 from .lib.find_or_request_poscar import find_or_request_poscar
+from .lib.periodic_gaps import lattice_plane_geometry, sort_periodic, unwrap_lattice_shifts, find_split_gap
 
 
 class StructureRepositioner:
@@ -21,8 +20,10 @@ class StructureRepositioner:
     A utility class for manipulating the positions of atoms in an ASE Atoms object.
 
     The class allows for repositioning of atoms along a specified axis ('x', 'y', 'z') and offers various modes for repositioning.
-    Before proceeding with the repositioning, it checks the alignment of the cell vector corresponding to the moving direction with
-    the given axis and raises a warning if it's not aligned.
+    Atoms are moved along the lattice vector whose lattice planes are the most nearly normal to the axis (see `lattice_plane_geometry`),
+    and bounds are measured along the normal of these planes, so cells not aligned with the axes (monoclinic, hexagonal, rotated) are handled.
+
+    Atoms split by the cell boundary (a slab wrapping across the cell along the axis) are first made contiguous.
 
     Modes:
         - 'max_bound': Moves atoms towards the maximum boundary of the cell along the specified axis.
@@ -33,22 +34,27 @@ class StructureRepositioner:
         structure (Atoms): The Atoms object representing the structure to be modified.
         axis (str): The axis ('x', 'y', 'z') along which atoms will be repositioned.
         axis_index (int): The index representing the axis (0 for 'x', 1 for 'y', 2 for 'z').
+        vacuum_threshold (float): The smallest gap along the axis considered a vacuum layer (in Å).
+        lattice_index (int): The index of the lattice vector along which atoms are moved.
+        normal (np.ndarray): The unit normal of the lattice planes of this lattice vector.
+        spacing (float): The spacing of these lattice planes, i.e. the cell height along the normal (in Å).
 
     Methods:
-        __init__(self, structure: Atoms, axis: str): Initializes the StructureRepositioner and checks cell vector alignment.
-        _check_cell(self): Checks the alignment of the cell vector with the given direction and raises a warning if misaligned.
+        __init__(self, structure: Atoms, axis: str): Initializes the StructureRepositioner and finds the lattice planes normal to the axis.
         _move_continuous_atoms(self, mode: str): Moves atoms continuously along the axis.
-        # TODO: _move_split_atoms(self, mode: str): Repositions atoms that are split by a vacuum layer.
+        _find_split_gap(self): Finds the vacuum gap of atoms split by the cell boundary.
+        _move_split_atoms(self, mode: str): Repositions atoms that are split by the cell boundary.
         reposition_along_axis(self, mode: str): Main method to perform atom repositioning.
     """
 
-    def __init__(self, structure: Atoms, axis: str = "z") -> None:
+    def __init__(self, structure: Atoms, axis: str = "z", vacuum_threshold: float = 5.0) -> None:
         """
         Initialize the class with the structure and axis.
 
         Parameters:
             structure (Atoms): The Atoms object to be modified.
             axis (str): The axis along which to reposition atoms ('x', 'y', 'z').
+            vacuum_threshold (float): The smallest gap along the axis considered a vacuum layer (in Å).
         """
         if axis.lower() not in {"x", "y", "z"}:
             raise ValueError("Invalid axis. Must be 'x', 'y', or 'z'.")
@@ -57,23 +63,10 @@ class StructureRepositioner:
         self.cell = self.structure.get_cell()
         self.axis = axis.lower()
         self.axis_index = {"x": 0, "y": 1, "z": 2}[self.axis]
+        self.vacuum_threshold = vacuum_threshold
 
-        # Check cell vector
-        self._check_cell()
-
-    def _check_cell(self) -> None:
-        """Check the alignment of the cell vectors with the given direction.
-
-        Raises:
-            Warning: If the cell vector corresponding to the moving direction is not parallel to that direction.
-        """
-        cell_vector = self.cell[self.axis_index]
-
-        # Check if only one component exists in the vector, meaning it is parallel to the axis.
-        non_zero_count = np.count_nonzero(cell_vector)
-
-        if non_zero_count != 1:
-            warnings.warn(f"The cell vector along the {self.axis} axis is not parallel to the {self.axis}-axis. Proceed with caution.")
+        # Lattice planes most nearly normal to the axis
+        self.lattice_index, self.normal, self.spacing = lattice_plane_geometry(self.cell.array, self.axis_index)
 
     def _move_continuous_atoms(self, mode: str) -> None:
         """
@@ -88,24 +81,42 @@ class StructureRepositioner:
         Raises:
             ValueError: If an unsupported mode is provided.
         """
-        coords = self.structure.positions[:, self.axis_index]
-        cell_size = self.structure.get_cell()[self.axis_index, self.axis_index]
-        centroid = np.mean(coords)
+        heights = self.structure.positions @ self.normal
+        centroid = np.mean(heights)
 
         if mode == "max_bound":
-            shift_value = cell_size - max(coords)
+            shift_value = self.spacing - max(heights)
         elif mode == "min_bound":
-            shift_value = -min(coords)
+            shift_value = -min(heights)
         elif mode in {"center", "centre"}:
-            shift_value = cell_size / 2 - centroid
+            shift_value = self.spacing / 2 - centroid
         else:
             raise ValueError(f"Unsupported mode: {mode}")
 
-        self.structure.positions[:, self.axis_index] += shift_value
+        # Lattice vector scaled to a unit height along the normal, so that the in-plane coordinates are kept
+        self.structure.positions += shift_value * (self.cell.array[self.lattice_index] / self.spacing)
+
+    def _find_split_gap(self) -> Optional[tuple]:
+        """
+        Find the vacuum gap of atoms split by the cell boundary along the axis (see `find_split_gap`).
+
+        Returns:
+            Optional[tuple]: (frac, order, gap_index), the fractional coordinates along the lattice vector,
+                their periodic sorting indexes and the index of the vacuum gap, None if the atoms are contiguous.
+        """
+        heights = self.structure.positions @ self.normal
+        frac = heights / self.spacing
+        order, _, gaps = sort_periodic(frac)
+
+        gap_index = find_split_gap(gaps, heights.max() - heights.min(), self.spacing, self.vacuum_threshold)
+        return None if gap_index is None else (frac, order, gap_index)
 
     def _move_split_atoms(self, mode: str) -> None:
         """
-        Move atoms that are split by a vacuum layer along the axis.
+        Move atoms that are split by the cell boundary along the axis.
+
+        Atoms below the vacuum gap are moved up by one lattice vector at once, so that the atoms are contiguous,
+        then moved as continuous atoms.
 
         Parameters:
             mode (str): Where to move the atoms. Accepts one of the following values:
@@ -116,22 +127,12 @@ class StructureRepositioner:
         Raises:
             ValueError: If an unsupported mode is provided.
         """
-        coords = self.structure.positions[:, self.axis_index]
-        cell_size = self.structure.get_cell()[self.axis_index, self.axis_index]
-        median_coord = np.median(coords)
-        max_indices = np.where(coords > median_coord)[0]
-
-        self.structure.positions[max_indices, self.axis_index] -= cell_size
-
-        if mode == "max_bound":
-            shift_value = cell_size - min(coords)
-        elif mode == "min_bound":
-            shift_value = max(coords)
-        else:
-            centroid = np.mean(coords)
-            shift_value = cell_size / 2 - centroid
+        split = self._find_split_gap()
+        if split is not None:
+            shifts = unwrap_lattice_shifts(*split)
+            self.structure.positions += shifts[:, None] * self.cell.array[self.lattice_index]
 
-        self.structure.positions[:, self.axis_index] += shift_value
+        self._move_continuous_atoms(mode)
 
     def reposition_along_axis(self, mode: str) -> Atoms:
         """
@@ -151,10 +152,11 @@ class StructureRepositioner:
         if mode not in {"max_bound", "min_bound", "center", "centre"}:
             raise ValueError(f"Unsupported work mode {mode}.")
 
-        # Move atoms
-        # Issue a warning that the method only supports cases where atoms are continuous
-        warnings.warn("This method currently only supports cases where atoms are continuous. It is not fully implemented yet.")
-        self._move_continuous_atoms(mode)
+        # Move atoms, making atoms split by the cell boundary contiguous first
+        if self._find_split_gap() is not None:
+            self._move_split_atoms(mode)
+        else:
+            self._move_continuous_atoms(mode)
 
         return self.structure
 
@@ -2,19 +2,20 @@
 # -*- coding: utf-8 -*-
 
 # DEBUG: this script cannot be called on it own
-# TODO: test transformation along x/y axis
-# TODO: test non-parallel x/y cell vector warnings
 
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
 from pathlib import Path
 import numpy as np
+import os
+import sys
 import warnings
-from typing import Union
+from typing import List, Optional, Tuple, Union
 from ase import Atoms
 from ase.io import read, write
 from argparse import ArgumentParser
 
-from .structureRepositioner import StructureRepositioner
-from .lib import find_or_request_poscar
+from .lib.periodic_gaps import lattice_plane_geometry, sort_periodic, unwrap_lattice_shifts, find_split_gap
 
 class VacuumLayerManager:
     """
@@ -28,8 +29,23 @@ class VacuumLayerManager:
         axis (str): The axis along which the vacuum layer is managed ('x', 'y', or 'z').
         init_vacuum_layer (float): Initial vacuum layer thickness along the axis.
 
+    The vacuum is managed along the lattice vector whose lattice planes are the most nearly normal to the axis
+    (see `lattice_plane_geometry`), and thicknesses are measured along the normal of these planes, so monoclinic,
+    hexagonal or rotated cells are handled. Rescaling the cell only changes the length of this lattice vector,
+    the two other (in-plane) lattice vectors are kept.
+
+    Notes:
+        - The sorted coordinates along the axis, their gaps and bounds are computed in a single pass and cached.
+          The cache is checked against the current coordinates and cell (O(N)) before each use, and is only
+          recomputed (O(N log N)) when the structure changed. Shifts and unwrapping applied by this class update
+          the cached profile (O(N)) instead of recomputing it.
+        - Gaps are periodic: coordinates are wrapped into the cell and the gap across the cell boundary is included,
+          so slabs split by the cell boundary are detected and made contiguous before adjusting the vacuum.
+
     Methods:
-        _find_largest_gap(): Finds the largest gap in z-coordinates among atoms.
+        _axis_profile(): Returns the cached lattice plane geometry, sorted coordinates, gaps and bounds along the axis.
+        _unwrap(): Makes atoms split by the cell boundary contiguous.
+        _find_largest_gap(): Finds the largest periodic gap in heights along the axis among atoms.
         locate_vacuum_layer(): Locates the position of the vacuum layer in the structure.
         count_vacuum_layers(): Counts the vacuum layers.
         calculate_vacuum_thickness(): Calculates the thickness of the vacuum layer.
@@ -74,41 +90,177 @@ class VacuumLayerManager:
         self.axis = axis.lower()
         self.axis_index = {"x": 0, "y": 1, "z": 2}[self.axis]
 
+        # Sorted coordinates along the axis, computed on first use
+        self._profile = None
+
         # Calculate vacuum layer count
         self.vacuum_layer_count = self.count_vacuum_layers()
 
         # Calculate vacuum layer thickness
         self.init_vacuum_layer = self.calculate_vacuum_thickness()
 
+    def _build_profile(self) -> dict:
+        """
+        Build the coordinate profile along the axis.
+
+        Returns:
+            dict: The profile, see `_axis_profile`.
+        """
+        positions = self.structure.positions
+        cell = self.structure.get_cell().array
+        lattice_index, normal, spacing = lattice_plane_geometry(cell, self.axis_index)
+
+        heights = positions @ normal
+        frac = heights / spacing
+        order, sorted_frac, gaps = sort_periodic(frac)
+
+        return {
+            "positions": positions.copy(),
+            "cell": cell.copy(),
+            "lattice_index": lattice_index,
+            "normal": normal,
+            "spacing": spacing,
+            "direction": cell[lattice_index] / spacing,
+            "heights": heights,
+            "frac": frac,
+            "order": order,
+            "sorted_frac": sorted_frac,
+            "gaps": gaps,
+            "largest_gap_index": int(np.argmax(gaps)),
+            "min": heights.min(),
+            "max": heights.max(),
+        }
+
+    def _axis_profile(self) -> dict:
+        """
+        Get the lattice plane geometry, sorted coordinates along the axis, their gaps and bounds, recomputed only if the structure changed.
+
+        Returns:
+            dict: "positions" and "cell" (copies the profile was computed from), "lattice_index" (lattice vector managed),
+                "normal" (unit normal of its lattice planes), "spacing" (plane spacing, the cell height along the normal),
+                "direction" (lattice vector scaled to a unit height along the normal), "heights" (atom heights along the normal),
+                "frac" (fractional coordinates along the lattice vector), "order" (indexes sorting the wrapped fractional coordinates),
+                "sorted_frac" (sorted wrapped coordinates), "gaps" (periodic fractional gaps, the last one wrapping around, see `sort_periodic`),
+                "largest_gap_index", "min" and "max" (bounds of the atom heights).
+        """
+        profile = self._profile
+        if (profile is None
+                or not np.array_equal(profile["positions"], self.structure.positions)
+                or not np.array_equal(profile["cell"], self.structure.cell.array)):
+            self._profile = self._build_profile()
+
+        return self._profile
+
+    def _shift_along_axis(self, shift: float) -> dict:
+        """
+        Move all atoms along the managed lattice vector, in place, updating the cached profile instead of rebuilding it.
+
+        A uniform shift moves the heights and bounds by the shift, and only rotates the cyclic sequence
+        of the wrapped coordinates and of their gaps, to start at its new wrap-around point.
+
+        Args:
+            shift (float): The shift in Å, measured along the normal of the lattice planes.
+
+        Returns:
+            dict: The updated profile, see `_axis_profile`.
+        """
+        profile = self._axis_profile()
+        self.structure.positions += shift * profile["direction"]
+
+        frac = profile["frac"] + shift / profile["spacing"]
+        wrapped = frac - np.floor(frac)
+        order = profile["order"]
+
+        # Start the cyclic sequence at its largest drop, the new wrap-around point
+        gaps = profile["gaps"]
+        steps = np.diff(wrapped[order])
+        rotation = int(np.argmin(steps)) + 1 if len(steps) and steps.min() < 0 else 0
+        if rotation:
+            order = np.roll(order, -rotation)
+            gaps = np.roll(gaps, -rotation)
+
+        self._profile = dict(
+            profile,
+            positions=self.structure.positions.copy(),
+            heights=profile["heights"] + shift,
+            frac=frac,
+            order=order,
+            sorted_frac=wrapped[order],
+            gaps=gaps,
+            largest_gap_index=(profile["largest_gap_index"] - rotation) % len(order),
+            min=profile["min"] + shift,
+            max=profile["max"] + shift,
+        )
+        return self._profile
+
+    def _find_split_gap(self) -> Optional[int]:
+        """
+        Find the vacuum gap of a structure split by the cell boundary (see `find_split_gap`).
+
+        Returns:
+            Optional[int]: Index of the vacuum gap in the cached profile, None if the atoms are contiguous.
+        """
+        profile = self._axis_profile()
+        return find_split_gap(profile["gaps"], profile["max"] - profile["min"], profile["spacing"], self.threshold)
+
+    def _unwrap(self) -> dict:
+        """
+        Make a structure split by the cell boundary contiguous, in place, by moving atoms below the vacuum gap up by one lattice vector.
+
+        The wrapped fractional coordinates are unchanged, so the cached order, sorted coordinates and gaps stay valid,
+        only the heights and their bounds are updated.
+
+        Returns:
+            dict: The updated profile, see `_axis_profile`.
+        """
+        # The profile was just checked against the structure by _find_split_gap
+        gap_index = self._find_split_gap()
+        profile = self._profile
+        if gap_index is None:
+            return profile
+
+        shifts = unwrap_lattice_shifts(profile["frac"], profile["order"], gap_index)
+        self.structure.positions += shifts[:, None] * profile["cell"][profile["lattice_index"]]
+
+        heights = profile["heights"] + shifts * profile["spacing"]
+        self._profile = dict(
+            profile,
+            positions=self.structure.positions.copy(),
+            heights=heights,
+            frac=profile["frac"] + shifts,
+            min=heights.min(),
+            max=heights.max(),
+        )
+        return self._profile
+
     def _find_largest_gap(self) -> tuple:
         """
-        Find the largest gap along selected axis among atoms.
+        Find the largest periodic gap along selected axis among atoms, the gap across the cell boundary included.
 
         Returns:
-            tuple: (min_bound, max_bound), the lower and upper bounds of the largest gap.
+            tuple: (min_bound, max_bound), the lower and upper bounds of the largest gap, in Å from the cell origin along the normal.
+                For the gap across the cell boundary, max_bound lies beyond the plane spacing.
         """
-        coords = np.sort(self.structure.positions[:, self.axis_index])
-        gaps = np.diff(coords)
-        max_gap_index = np.argmax(gaps)
-        min_bound = coords[max_gap_index]
-        max_bound = coords[max_gap_index] + gaps[max_gap_index]
+        profile = self._axis_profile()
+        max_gap_index = profile["largest_gap_index"]
+        min_bound = profile["sorted_frac"][max_gap_index] * profile["spacing"]
+        max_bound = min_bound + profile["gaps"][max_gap_index] * profile["spacing"]
         return min_bound, max_bound
 
-    def locate_vacuum_layer(self, lower_threshold: float = 0.25, upper_threshold: float = 0.75, split_threshold: float = 1.0) -> str:
+    def locate_vacuum_layer(self, split_threshold: float = 1.0) -> str:
         """
         Locates the position of the single vacuum layer in the structure.
 
         Args:
-            lower_threshold (float, optional): Lower threshold as a fraction of cell height to define the bottom region. Default is 0.25.
-            upper_threshold (float, optional): Upper threshold as a fraction of cell height to define the top region. Default is 0.75.
-            split_threshold (float, optional): Gap size in Å to consider as part of a split vacuum layer. Default is 2.0 Å.
+            split_threshold (float, optional): Vacuum thickness in Å on both sides of the atoms to consider the vacuum layer split. Default is 1.0 Å.
 
         Notes:
             This method assumes that there is exactly one vacuum layer. In the case of z-axis, the vacuum can:
                 1. Be entirely at the top (max_bound).
                 2. Be entirely at the bottom (min_bound).
-                3. Be positioned in the middle.
+                3. Be positioned in the middle, the atoms being split by the cell boundary.
                 4. Be split between the top(max_bound) and bottom(min_bound).
+            Positions are taken wrapped into the cell.
 
         Returns:
             str: Position of the vacuum layer defined along the z-axis ('max_bound', 'min_bound', 'middle', 'split').
@@ -120,71 +272,55 @@ class VacuumLayerManager:
         if self.vacuum_layer_count != 1:
             raise RuntimeError("Locate vacuum layer method only works when there is exactly one vacuum layer.")
 
-        # Sort the coordinates
-        coords = np.sort(self.structure.positions[:, self.axis_index])
-
-        # Calculate the gaps between adjacent atoms along the selected axis
-        gaps = np.diff(coords)
-
-        # Calculate the max_bound and min_bound positions of the gap
-        min_bound, max_bound = self._find_largest_gap()
-
-        # Get the cell dimension along the selected axis
-        cell_dim = self.structure.get_cell().diagonal()[self.axis_index]
+        # A largest gap between two atoms (rather than across the cell boundary) puts the vacuum inside the cell
+        profile = self._axis_profile()
+        if profile["largest_gap_index"] != len(profile["gaps"]) - 1:
+            return 'middle'
 
         # Identify gap at max_bound and min_bound ends
-        max_gap = cell_dim - max_bound
-        min_gap = min_bound
+        max_gap = (1 - profile["sorted_frac"][-1]) * profile["spacing"]
+        min_gap = profile["sorted_frac"][0] * profile["spacing"]
 
-        if max_bound >= upper_threshold * cell_dim:
-            return 'max_bound'
-        elif min_bound <= lower_threshold * cell_dim:
-            return 'min_bound'
-        elif max_gap >= split_threshold and min_gap >= split_threshold:
+        if max_gap >= split_threshold and min_gap >= split_threshold:
             warnings.warn(f"Vacuum layer is split between the max_bound and min_bound. Max gap: {max_gap} Å, Min gap: {min_gap} Å.")
             return 'split'
+        elif max_gap >= min_gap:
+            return 'max_bound'
         else:
-            return 'middle'
+            return 'min_bound'
 
     def count_vacuum_layers(self) -> int:
         """
         Count vacuum layer numbers along selected axis.
 
+        Gaps are measured between periodic neighbours, the gap across the cell boundary included,
+        so a structure split by the cell boundary is counted the same as a contiguous one.
+
         Returns:
             int: total number of vacuum layers
         """
-        # Extract coordinates and sort them
-        coords = np.sort(self.structure.positions[:, self.axis_index])
-
-        # Compute the gaps between adjacent coordinates
-        gaps = np.diff(coords)
-
-        # Identify the gaps that are larger than the threshold
-        large_gaps = gaps > self.threshold
-
-        # Check the special case for periodic boundary conditions at the "max_bound" and "min_bound"
-        cell_dim = self.structure.get_cell().diagonal()[self.axis_index]
-        if (coords[-1] - coords[0] + (cell_dim - coords[-1] + coords[0])) > self.threshold:
-            large_gaps = np.append(large_gaps, True)
-
-        # Count the number of large gaps (i.e., the number of vacuum layers)
-        return np.sum(large_gaps)
+        profile = self._axis_profile()
+        return int(np.sum(profile["gaps"] * profile["spacing"] > self.threshold))
 
     def calculate_vacuum_thickness(self, warn_lower_threshold: float = 2.0, warn_upper_ratio_threshold: float = 0.9) -> float:
         """
-        Calculate the vacuum thickness along the selected axis in the unit cell.
+        Calculate the vacuum thickness along the selected axis in the unit cell, measured along the normal of the lattice planes.
+
+        For a structure split by the cell boundary, the thickness is the largest periodic gap,
+        otherwise the plane spacing minus the extent of the atoms.
 
         Returns:
             float: Thickness of the vacuum layer.
         """
-        # Calculate vacuum layer thickness along the selected axis
-        cell_dim = self.structure.get_cell().diagonal()[self.axis_index]
+        profile = self._axis_profile()
+        spacing = profile["spacing"]
 
-        # Determine max_bound and min_bound of the positions
-        min_position = self.structure.positions[:, self.axis_index].min()
-        max_position = self.structure.positions[:, self.axis_index].max()
+        split_gap_index = self._find_split_gap()
+        if split_gap_index is not None:
+            vacuum_layer_thickness = profile["gaps"][split_gap_index] * spacing
+        else:
+            vacuum_layer_thickness = spacing - (profile["max"] - profile["min"])
 
-        vacuum_layer_thickness = cell_dim - (max_position - min_position)
         if vacuum_layer_thickness < 0:
             warnings.warn("Negative vacuum layer thickness found (there might be atoms outside the cell). Proceed with caution")
             return 0  # return 0 so that following adjustment could proceed (otherwise would stop running)
@@ -192,7 +328,7 @@ class VacuumLayerManager:
         # Warn if vacuum layer thickness is suspicious
         if vacuum_layer_thickness <= warn_lower_threshold:
             warnings.warn(f"The vacuum layer thickness along the selected axis is only {vacuum_layer_thickness} Å.")
-        if vacuum_layer_thickness >= (cell_dim * warn_upper_ratio_threshold):
+        if vacuum_layer_thickness >= (spacing * warn_upper_ratio_threshold):
             warnings.warn("The vacuum layer thickness along the selected axis is very close to the cell dimension. Please double-check your structure.")
 
         return vacuum_layer_thickness
@@ -203,9 +339,13 @@ class VacuumLayerManager:
 
         This method performs the following steps to adjust the vacuum thickness:
         1. Validates the new vacuum thickness.
-        2. Repositions atoms to the "min_bound" of the unit cell.
-        3. Modifies the cell dimension to create the new vacuum thickness at the "max_bound" of the unit cell.
-        4. Repositions atoms back to the center of the unit cell.
+        2. Makes atoms split by the cell boundary contiguous.
+        3. Repositions atoms to the "min_bound" of the unit cell.
+        4. Rescales the managed lattice vector to create the new vacuum thickness at the "max_bound" of the unit cell,
+           keeping its direction and the two other lattice vectors.
+        5. Repositions atoms back to the center of the unit cell.
+
+        The coordinates are sorted once (cached profile), unwrapping and shifts keep the cached order.
 
         Args:
             new_vacuum (float): The desired thickness for the vacuum layer in Angstroms (Å).
@@ -230,75 +370,189 @@ class VacuumLayerManager:
         elif new_vacuum <= vacuum_warning_threshold:
             warnings.warn(f"Small vacuum thickness of {new_vacuum} Å requested.")
 
+        # Make split atoms contiguous
+        profile = self._unwrap()
+
         # Put atoms to the min_bound
-        atom_repositioner = StructureRepositioner(structure=self.structure, axis=self.axis)
-        self.structure = atom_repositioner.reposition_along_axis(mode="min_bound")
+        profile = self._shift_along_axis(-profile["min"])
 
         # Apply new vacuum layer thickness to the max_bound
         cell = self.structure.get_cell()
-        max_position = self.structure.positions[:, self.axis_index].max()
-        cell[self.axis_index, self.axis_index] = max_position + new_vacuum
+        cell[profile["lattice_index"]] = profile["direction"] * (profile["max"] + new_vacuum)
         self.structure.set_cell(cell)
 
         # Move atoms back to the center
-        atom_repositioner = StructureRepositioner(structure=self.structure, axis=self.axis)
-        self.structure = atom_repositioner.reposition_along_axis(mode="center")
+        profile = self._axis_profile()
+        self._shift_along_axis(profile["spacing"] / 2 - np.mean(profile["heights"]))
         warnings.warn(f"Vacuum layer would be adjusted. Atoms would be centered along {self.axis}-axis.")
 
-def main(args):
+def collect_structure_files(inputs: List[Union[Path, str]], names: Tuple[str, ...] = ("POSCAR", "CONTCAR"), recursive: bool = False, suffix: str = "_vacuum_adjusted") -> List[Path]:
     """
-    The main function to execute the vacuum adjustment workflow.
-
-    This function performs the following steps:
-    1. Reads in the structure (e.g., POSCAR) or Atoms object.
-    2. Validates the axis choice specified via command-line arguments.
-    3. Initializes a VacuumLayerManager object based on the structure and axis.
-    4. Checks the number of vacuum layers in the structure.
-    5. Calculates the current vacuum layer thickness.
-    6. Adjusts the vacuum layer thickness based on the command-line argument.
-    7. Writes the adjusted structure to a new POSCAR file.
+    Collect the structure files to process from files, directories and glob patterns.
 
     Args:
-        args (Namespace): A namespace containing the parsed command-line arguments.
-            - axis (str): The axis ('x', 'y', 'z') along which to adjust the vacuum layer.
-            - new_vacuum (float): The new vacuum thickness along the specified axis.
+        inputs (List[pathlib.Path or str]): Structure files, directories searched for files named as in `names`, or glob patterns ("**" matches any directories).
+        names (Tuple[str, ...], optional): Filenames looked for in directories. Defaults to ("POSCAR", "CONTCAR").
+        recursive (bool, optional): Search directories recursively. Defaults to False.
+        suffix (str, optional): Suffix of the adjusted structures, whose files are not collected from glob patterns so that a rerun does not adjust the outputs of an earlier one. Defaults to "_vacuum_adjusted".
+
+    Returns:
+        List[pathlib.Path]: The structure files, sorted and without duplicates.
 
     Raises:
-        ValueError: If the axis choice is invalid or if there are issues with the vacuum layers in the structure.
+        FileNotFoundError: If an input matches no structure file.
+    """
+    files = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            matches = [match for name in names for match in (path.rglob(name) if recursive else path.glob(name))]
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = [Path(match) for match in glob(str(item), recursive=True)]
+            if suffix:
+                matches = [match for match in matches if not match.name.endswith(suffix)]
 
-    Examples:
-        This function is typically run via the command line as follows:
-        python your_script.py -a x -n 10.0
+        matches = [match for match in matches if match.is_file()]
+        if not matches:
+            raise FileNotFoundError(f"No structure file found for {item}.")
+        files.update(matches)
+
+    return sorted(files)
+
+def adjust_vacuum_file(path: Path, new_vacuum: float, axis: str = "z", threshold: float = 5.0, suffix: str = "_vacuum_adjusted") -> dict:
     """
-    input_poscar = find_or_request_poscar()  # Or provide an Atoms object
+    Adjust the vacuum layer of one structure file, and write the adjusted structure next to it.
 
-    axis_choice = args.axis
-    if axis_choice not in ["x", "y", "z"]:
-        raise ValueError("Invalid axis choice. Must be 'x', 'y', or 'z'.")
+    Errors are caught and reported rather than raised, so that one bad file does not stop a batch.
 
-    vacuum_setter = VacuumLayerManager(input_poscar, axis=axis_choice)
+    Args:
+        path (pathlib.Path): The POSCAR/CONTCAR file.
+        new_vacuum (float): The new vacuum thickness in Å.
+        axis (str, optional): The axis along which to adjust the vacuum layer. Defaults to "z".
+        threshold (float, optional): The threshold to consider a gap as a vacuum layer (in Å). Defaults to 5.0.
+        suffix (str, optional): Suffix appended to the filename of the adjusted structure. Defaults to "_vacuum_adjusted".
+
+    Returns:
+        dict: "path" and "output" (str), "before" and "after" (vacuum thickness in Å, None on error),
+            "warnings" (list of warning messages) and "error" (str, None on success).
+    """
+    result = {"path": str(path), "output": None, "before": None, "after": None, "warnings": [], "error": None}
 
-    # Check vacuum layer
-    vacuum_layer_count = vacuum_setter.count_vacuum_layers()
-    if vacuum_layer_count >= 2:
-        raise ValueError("The structure contains more than one vacuum layer, which is not allowed.")
-    elif vacuum_layer_count == 0:
-        raise ValueError("No vacuum layer found. Please check your structure.")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        try:
+            vacuum_setter = VacuumLayerManager(path, threshold=threshold, axis=axis)
 
-    # Calculate vacuum layer thickness
-    vacuum_layer_thickness = vacuum_setter.calculate_vacuum_thickness()
-    print(f"Current vacuum thickness along the {axis_choice}-axis is {vacuum_layer_thickness}.")
+            # Check vacuum layer
+            if vacuum_setter.vacuum_layer_count >= 2:
+                raise ValueError("The structure contains more than one vacuum layer, which is not allowed.")
+            elif vacuum_setter.vacuum_layer_count == 0:
+                raise ValueError("No vacuum layer found. Please check your structure.")
 
-    # Adjust vacuum layer thickness
-    new_vacuum = args.new_vacuum
-    vacuum_setter.adjust_vacuum_thickness(new_vacuum)
+            result["before"] = vacuum_setter.init_vacuum_layer
+            vacuum_setter.adjust_vacuum_thickness(new_vacuum)
+            result["after"] = vacuum_setter.calculate_vacuum_thickness()
 
-    # Write adjusted POSCAR
-    write("POSCAR_vacuum_adjusted", vacuum_setter.structure)
+            output = path.with_name(f"{path.name}{suffix}")
+            write(output, vacuum_setter.structure, format="vasp")
+            result["output"] = str(output)
 
-if __name__ == "__main__":
-    parser = ArgumentParser(description="A program to adjust the vacuum layer of a structure.")
+        except Exception as exc:
+            result["error"] = str(exc)
+
+    # Thickness checks run before and after the adjustment, and the adjustment notice is issued for every structure
+    messages = dict.fromkeys(str(warning.message) for warning in caught)
+    result["warnings"] = [message for message in messages if not message.startswith("Vacuum layer would be adjusted")]
+    return result
+
+def _adjust_vacuum_task(task: Tuple[Path, dict]) -> dict:
+    """
+    Run `adjust_vacuum_file` on one (structure file, options) task, in a worker process.
+
+    Args:
+        task (Tuple[pathlib.Path, dict]): The structure file and the keyword arguments of `adjust_vacuum_file`.
+
+    Returns:
+        dict: The result of the file.
+    """
+    path, options = task
+    return adjust_vacuum_file(path, **options)
+
+def adjust_vacuum_files(paths: List[Path], new_vacuum: float, axis: str = "z", threshold: float = 5.0, suffix: str = "_vacuum_adjusted", workers: int = 1) -> List[dict]:
+    """
+    Adjust the vacuum layer of many structure files in parallel, writing each adjusted structure next to its input.
+
+    Args:
+        paths (List[pathlib.Path]): The POSCAR/CONTCAR files.
+        new_vacuum (float): The new vacuum thickness in Å.
+        axis (str, optional): The axis along which to adjust the vacuum layer. Defaults to "z".
+        threshold (float, optional): The threshold to consider a gap as a vacuum layer (in Å). Defaults to 5.0.
+        suffix (str, optional): Suffix appended to the filenames of the adjusted structures. Defaults to "_vacuum_adjusted".
+        workers (int, optional): Number of worker processes. Defaults to 1 (serial).
+
+    Returns:
+        List[dict]: The results (see `adjust_vacuum_file`), in the order of `paths`.
+
+    Raises:
+        ValueError: If the new vacuum thickness is negative or the worker count is not positive.
+    """
+    if new_vacuum < 0:
+        raise ValueError("Vacuum layer thickness cannot be negative.")
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"Expected a positive number of workers, but got {workers}.")
+
+    options = {"new_vacuum": new_vacuum, "axis": axis, "threshold": threshold, "suffix": suffix}
+    tasks = [(Path(path), options) for path in paths]
+
+    if workers == 1 or len(tasks) < 2:
+        return [_adjust_vacuum_task(task) for task in tasks]
+
+    # Several files per submission, so that inter-process overhead stays small for thousands of files
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return list(executor.map(_adjust_vacuum_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+def main():
+    """
+    Adjust the vacuum layer of every POSCAR/CONTCAR given as files, directories or glob patterns, in parallel.
+
+    Each adjusted structure is written next to its input (e.g. "POSCAR_vacuum_adjusted"),
+    and the vacuum thickness before and after is reported for each file.
+
+    Examples:
+        This function is typically run via the command line as follows (from the "scripts" directory):
+        python -m vasp.poscar.vacuumLayerManager -a z -n 15.0 calculations/*/CONTCAR
+        python -m vasp.poscar.vacuumLayerManager -a z -n 15.0 --recursive calculations
+
+    Raises:
+        SystemExit: With status 1 if any file could not be adjusted.
+    """
+    parser = ArgumentParser(description="Adjust the vacuum layer of POSCAR/CONTCAR files in batch.")
+    parser.add_argument("inputs", nargs="*", default=["."], help="Structure files, directories (searched for POSCAR/CONTCAR) or glob patterns. Defaults to the working directory.")
     parser.add_argument("-a", "--axis", choices=["x", "y", "z"], required=True, help="The axis ('x', 'y', 'z') along which to adjust the vacuum layer.")
     parser.add_argument("-n", "--new_vacuum", type=float, required=True, help="The new vacuum thickness along the specified axis.")
+    parser.add_argument("-t", "--threshold", type=float, default=5.0, help="The threshold to consider a gap as a vacuum layer (in Å). Defaults to 5.0.")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively.")
+    parser.add_argument("-s", "--suffix", default="_vacuum_adjusted", help="Suffix appended to the filenames of the adjusted structures. Defaults to '_vacuum_adjusted'.")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes. Defaults to the CPU count.")
     args = parser.parse_args()
-    main(args)
+
+    paths = collect_structure_files(args.inputs, recursive=args.recursive, suffix=args.suffix)
+    results = adjust_vacuum_files(paths, args.new_vacuum, axis=args.axis, threshold=args.threshold, suffix=args.suffix, workers=args.workers)
+
+    for result in results:
+        if result["error"] is None:
+            print(f"{result['path']}: {result['before']:.4f} Å -> {result['after']:.4f} Å, written to {result['output']}")
+        else:
+            print(f"{result['path']}: FAILED, {result['error']}")
+        for message in result["warnings"]:
+            print(f"    Warning: {message}")
+
+    failed = sum(result["error"] is not None for result in results)
+    print(f"{len(results) - failed} of {len(results)} structures adjusted along the {args.axis}-axis.")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()